@@ -1,15 +1,14 @@
 """
 To run this program you need to install the PyQt6 library:
 
-    pip install PyQt6 sympy
+    pip install PyQt6 numpy
 """
 
+import sqlite3
 import sys
-import math
-from sympy import sympify, SympifyError
 
 try:
-    from PyQt6.QtCore import Qt
+    from PyQt6.QtCore import QObject, QRunnable, Qt, QThreadPool, QTimer, pyqtSignal
     from PyQt6.QtWidgets import (
         QApplication,
         QComboBox,
@@ -19,6 +18,7 @@ try:
         QLabel,
         QLineEdit,
         QPushButton,
+        QTabWidget,
         QVBoxLayout,
         QWidget,
         QMessageBox,
@@ -29,237 +29,102 @@ except ImportError as e:
         "Install it with `pip install PyQt6`."
     ) from e
 
+from wetted_sa import all_shapes, get_shape, instrument
+from wetted_sa.cache import open_default
+from wetted_sa.tolerance import is_toleranced, parse_spec, simulate
+from wetted_sa.units import AREA_UNITS, LENGTH_UNITS, VOLUME_UNITS, parse_length
 
-class Shape:
 
-    def __init__(self, name, dimensions):
-        self.name = name
-        self.dimensions = dimensions
+INVALID_STYLE = "QLineEdit { border: 1px solid #c0392b; }"
+# Draws per live Monte Carlo update when a field holds a tolerance; fixed seed
+# so the displayed numbers do not jitter between identical inputs.
+TOLERANCE_DRAWS = 200_000
+TOLERANCE_SEED = 0
+DEGREES = "°"
 
-    def surface_area(self, *args):  # pragma: no cover
-        raise NotImplementedError
 
-    def volume(self, *args):  # pragma: no cover
-        raise NotImplementedError
+class _ComputeSignals(QObject):
+    finished = pyqtSignal(int, float, float, object, object)
+    failed = pyqtSignal(int, str)
 
 
-class ConicalFrustrum(Shape):
-    def __init__(self):
-        super().__init__("Conical Frustrum", ["Small Diameter", "Large Diameter", "Length"])
-
-    def surface_area(self, sdiameter, ldiameter, length):
-        r1 = sdiameter / 2
-        r2 = ldiameter / 2
-        sa = math.pi * ((r1 + r2) * (((r1 - r2) ** 2 + length**2) ** 0.5))
-        return sa
-
-    def volume(self, sdiameter, ldiameter, length):
-        r1 = sdiameter / 2
-        r2 = ldiameter / 2
-        vol = ((r1**2 + r2**2 + (r1 * r2)) * math.pi * length) / 3
-        return vol
-
-
-class Tube(Shape):
-    def __init__(self):
-        super().__init__("Tube", ["Diameter", "Length"])
-
-    def surface_area(self, diameter, length):
-        return math.pi * diameter * length
-
-    def volume(self, diameter, length):
-        return math.pi * (diameter / 2) ** 2 * length
-
-
-class TwoDBag(Shape):
-    def __init__(self):
-        super().__init__("2D Bag", ["Length", "Height"])
-
-    def surface_area(self, length, width):
-        return 2 * length * width
-
-    def volume(self, length, width):
-        return math.pi * (width / 2) ** 2 * length
-
-
-class ThreeDBiocontainer(Shape):
-    def __init__(self):
-        super().__init__("3D Rectangular Biocontainer", ["Length", "Width", "Height"])
-
-    def surface_area(self, length, width, height):
-        return 2 * (length * width + width * height + length * height)
-
-    def volume(self, length, width, height):
-        return length * width * height
-
-
-class Tee(Shape):
-    def __init__(self):
-        super().__init__("Tee", ["Horizontal ID", "Vertical ID", "Length", "Height", "Flange OD"])
-
-    def surface_area(self, id_1, id_2, length, height, flange):
-        trunk_height = height - ((flange - id_1) / 2) - id_1
-        area_tube_1 = math.pi * id_1 * length
-        area_tube_2 = math.pi * id_2 * trunk_height
-        return area_tube_1 + area_tube_2
-
-    def volume(self, id_1, id_2, length, height, flange):
-        r1 = id_1 / 2
-        r2 = id_2 / 2
-        trunk_height = height - ((flange - id_1) / 2) - id_1
-        vol = (math.pi * length * r1**2) + (math.pi * trunk_height * r2**2)
-        return vol
-
-
-class Elbow(Shape):
-    def __init__(self):
-        super().__init__("Elbow", ["Horizontal ID", "Vertical ID", "Length", "Height"])
-
-    def surface_area(self, id_1, id_2, length, height):
-        arc_length = math.radians(90)
-        area_tube_1 = math.pi * id_1 * length
-        area_tube_2 = math.pi * id_2 * height
-        area_curve = math.pi * id_2 * arc_length
-        return area_tube_1 + area_tube_2 + area_curve
-
-    def volume(self, id_1, id_2, length, height):
-        r1 = id_1 / 2
-        r2 = id_2 / 2
-        arc_length = math.radians(90)
-        vol = (math.pi * length * r1**2) + (math.pi * height * r2**2) + (math.pi * arc_length * r2**2)
-        return vol
-
-
-class Cross(Shape):
-    def __init__(self):
-        super().__init__("Cross", ["Horizontal ID", "Vertical ID", "Length", "Height"])
-
-    def surface_area(self, id_1, id_2, length, height):
-        area_tube_1 = math.pi * id_1 * length
-        area_tube_2 = math.pi * id_2 * height
-        intersection_area = math.pi * (id_2 / 2) ** 2
-        return area_tube_1 + area_tube_2 - intersection_area
-
-    def volume(self, id_1, id_2, length, height):
-        r1 = id_1 / 2
-        r2 = id_2 / 2
-        return (math.pi * length * r1**2) + (math.pi * height * r2**2) - (math.pi * r2**2)
-
-
-class Wye(Shape):
-    def __init__(self):
-        super().__init__("Wye", ["Tusk ID", "Trunk ID", "Length", "Height"])
-
-    def surface_area(self, id_1, id_2, length, height):
-        tusk_height = (height - (2 * math.cos(math.radians(30)) * (id_1 / 2))) / 2
-        tusk_length = tusk_height / math.sin(math.radians(30))
-        tusk_area = 2 * math.pi * id_1 * tusk_length
-        trunk_length = (length - (math.cos(math.radians(30)) * tusk_length)) - ((id_1 / 2) * math.sin(math.radians(30)))
-        trunk_area = math.pi * id_2 * trunk_length
-        sa_curve = math.radians(30) * id_2
-        intersection_area = math.pi * (id_2 / 2) ** 2
-        return tusk_area + trunk_area + sa_curve - intersection_area
-
-    def volume(self, id_1, id_2, length, height):
-        tusk_height = (height - (2 * math.cos(math.radians(30)) * (id_1 / 2))) / 2
-        tusk_length = tusk_height / math.sin(math.radians(30))
-        trunk_length = (length - (math.cos(math.radians(30)) * tusk_length)) - ((id_1 / 2) * math.sin(math.radians(30)))
-        vol_tusk = 2 * (math.pi * tusk_length * (id_1 / 2) ** 2)
-        vol_trunk = (math.pi * trunk_length * (id_2 / 2) ** 2)
-        arc_length = math.radians(30) * id_2
-        vol_curve = (arc_length * (id_2 / 2) ** 2 * math.pi) / 3
-        return vol_tusk + vol_trunk + vol_curve
-
-
-class ThreeDRdBottle(Shape):
-    def __init__(self):
-        super().__init__("3D Round Bottle", ["ID", "Height"])
-
-    def surface_area(self, id_1, height):
-        return (math.pi * ((id_1 / 2) ** 2)) + (math.pi * id_1 * height)
-
-    def volume(self, id_1, height):
-        return math.pi * height * (id_1 / 2) ** 2
-
-
-class ThreeDRdBiocontainer(Shape):
-    def __init__(self):
-        super().__init__("3D Round Biocontainer", ["Fold Length", "Width", "Height"])
-
-    def surface_area(self, flength, width, height):
-        flatgap = width - (2 * flength)
-        id_1 = ((flength + (flatgap / 2)) / math.cos(math.radians(45))) * 2
-        return (2 * math.pi * ((id_1 / 2) ** 2)) + (math.pi * id_1 * height)
-
-    def volume(self, flength, width, height):
-        flatgap = width - (2 * flength)
-        id_1 = ((flength + (flatgap / 2)) / math.cos(math.radians(45))) * 2
-        return math.pi * height * (id_1 / 2) ** 2
-
-
-class Cap(Shape):
-    def __init__(self):
-        super().__init__("Cap", ["ID"])
-
-    def surface_area(self, id_1):
-        return math.pi * ((id_1 / 2) ** 2)
-
-    def volume(self, id_1):
-        return 0.0
-
-
-class Flask(Shape):
-    def __init__(self):
-        super().__init__("Flask", ["Small Diameter", "Large Diameter", "Height"])
-
-    def surface_area(self, sdiameter, ldiameter, height):
-        r1 = sdiameter / 2
-        r2 = ldiameter / 2
-        return math.pi * ((r1 + r2) * (((r1 - r2) ** 2 + height**2) ** 0.5)) + (r2**2)
-
-    def volume(self, sdiameter, ldiameter, height):
-        r1 = sdiameter / 2
-        r2 = ldiameter / 2
-        return ((r1**2 + r2**2 + (r1 * r2)) * math.pi * height) / 3
+class _ComputeJob(QRunnable):
+    """Evaluate one shape on the thread pool and report back by generation."""
 
+    def __init__(self, generation: int, shape, values: tuple, signals: _ComputeSignals, cache=None):
+        super().__init__()
+        self.generation = generation
+        self.shape = shape
+        self.values = values
+        self.signals = signals
+        self.cache = cache
 
-class Plug(Shape):
-    def __init__(self):
-        super().__init__("Plug", ["Diameter", "Length"])
+    def run(self) -> None:
+        try:
+            if all(isinstance(v, float) for v in self.values):
+                with instrument.timed("compute", self.shape.name):
+                    if self.cache is not None:
+                        sa, vol = self.cache.compute(self.shape, self.values)
+                    else:
+                        sa = self.shape.surface_area(*self.values)
+                        vol = self.shape.volume(*self.values)
+                sa_spread = vol_spread = None
+            else:
+                result = simulate(self.shape, self.values, draws=TOLERANCE_DRAWS, seed=TOLERANCE_SEED)
+                sa, sa_spread = result.area.mean, result.area
+                vol, vol_spread = result.volume.mean, result.volume
+        except (ValueError, ArithmeticError) as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        except sqlite3.Error as e:
+            self.signals.failed.emit(self.generation, f"result cache error: {e}")
+            return
+        self.signals.finished.emit(self.generation, float(sa), float(vol), sa_spread, vol_spread)
 
-    def surface_area(self, diameter, length):
-        return (math.pi * (diameter / 2) ** 2) + (math.pi * diameter * length)
 
-    def volume(self, diameter, length):
-        return 0.0
+def _spread(summary, factor: float) -> str:
+    if summary is None:
+        return ""
+    p = summary.percentiles
+    return (
+        f" (P5–P95 {p[5] * factor:,.2f}–{p[95] * factor:,.2f},"
+        f" worst {summary.worst_min * factor:,.2f}–{summary.worst_max * factor:,.2f})"
+    )
 
 
-# List of available shape instances
-SHAPES = [
-    Tube(),
-    TwoDBag(),
-    ThreeDBiocontainer(),
-    ThreeDRdBiocontainer(),
-    ThreeDRdBottle(),
-    Flask(),
-    ConicalFrustrum(),
-    Tee(),
-    Elbow(),
-    Cross(),
-    Wye(),
-    Cap(),
-    Plug(),
-]
+class MainWindow(QWidget):
+    """Main application window for the Qt shape calculator.
 
+    The Calculator tab evaluates one shape; the Components tab
+    (``component_table``, built on first use) holds a whole BOM.
 
-class MainWindow(QWidget):
-    """Main application window for the Qt shape calculator."""
+    Results update as fields are edited: each field keeps its last parsed
+    value, only the edited field is re-parsed, and the formulas run on the
+    global thread pool. Results from superseded edits are dropped by
+    comparing generation numbers. A field holding a tolerance such as
+    ``1in ± 0.01in`` switches the display to a Monte Carlo mean and spread.
+    Each dimension has a unit selector for bare numbers, and results are
+    shown in the selected area and volume units (computation stays in cm).
+    """
 
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Shape Calculator")
-        self.shape_classes = {shape.name: type(shape) for shape in SHAPES}
         self.entry_widgets: list[QLineEdit] = []
+        self.unit_widgets: list[QComboBox] = []
+        self._result = None
+        self.field_values: list = []
+        self.current_shape = None
+        self._generation = 0
+        self._last_inputs = None
+        self.result_cache = open_default()
+        self._signals = _ComputeSignals(self)
+        self._signals.finished.connect(self._on_computed)
+        self._signals.failed.connect(self._on_compute_failed)
+        self._recompute_timer = QTimer(self)
+        self._recompute_timer.setSingleShot(True)
+        self._recompute_timer.setInterval(30)
+        self._recompute_timer.timeout.connect(self._start_compute)
         self.setup_ui()
 
     def setup_ui(self) -> None:
@@ -268,7 +133,7 @@ class MainWindow(QWidget):
         top_layout.addWidget(QLabel("Choose a shape:"))
         self.shape_combo = QComboBox()
         self.shape_combo.addItem("Select a shape…")
-        self.shape_combo.addItems([shape.name for shape in SHAPES])
+        self.shape_combo.addItems([shape.name for shape in all_shapes()])
         self.shape_combo.currentTextChanged.connect(self.on_shape_change)
         top_layout.addWidget(self.shape_combo)
 
@@ -279,6 +144,17 @@ class MainWindow(QWidget):
         self.volume_label = QLabel("")
         self.volume_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
+        units_layout = QHBoxLayout()
+        units_layout.addWidget(QLabel("Results in:"))
+        self.area_unit_combo = QComboBox()
+        self.area_unit_combo.addItems(AREA_UNITS)
+        self.area_unit_combo.currentTextChanged.connect(self._show_result)
+        self.volume_unit_combo = QComboBox()
+        self.volume_unit_combo.addItems(VOLUME_UNITS)
+        self.volume_unit_combo.currentTextChanged.connect(self._show_result)
+        units_layout.addWidget(self.area_unit_combo)
+        units_layout.addWidget(self.volume_unit_combo)
+
         button_layout = QHBoxLayout()
         self.compute_btn = QPushButton("Compute")
         self.compute_btn.clicked.connect(self.compute_values)
@@ -290,56 +166,155 @@ class MainWindow(QWidget):
         main_layout = QVBoxLayout()
         main_layout.addLayout(top_layout)
         main_layout.addLayout(self.form_layout)
+        main_layout.addLayout(units_layout)
         main_layout.addWidget(self.sa_label)
         main_layout.addWidget(self.volume_label)
         main_layout.addLayout(button_layout)
 
-        self.setLayout(main_layout)
+        calculator = QWidget()
+        calculator.setLayout(main_layout)
+        # Filled on first use so NumPy and the table stay off the startup path.
+        self.components_page = QWidget()
+        self.components_page.setLayout(QVBoxLayout())
+        self.components_tab = None
+        self.tabs = QTabWidget()
+        self.tabs.addTab(calculator, "Calculator")
+        self.tabs.addTab(self.components_page, "Components")
+        self.tabs.currentChanged.connect(self.on_tab_change)
+
+        window_layout = QVBoxLayout()
+        window_layout.addWidget(self.tabs)
+        self.setLayout(window_layout)
 
         self.on_shape_change("")
 
+    def on_tab_change(self, index: int) -> None:
+        if self.tabs.widget(index) is self.components_page and self.components_tab is None:
+            from component_table import ComponentTableTab
+
+            self.components_tab = ComponentTableTab()
+            self.components_page.layout().addWidget(self.components_tab)
+            self.resize(max(self.width(), 900), max(self.height(), 600))
+
     def on_shape_change(self, shape_name: str) -> None:
         while self.form_layout.rowCount():
             self.form_layout.removeRow(0)
         self.entry_widgets.clear()
+        self.unit_widgets.clear()
+        self.field_values.clear()
+        self._last_inputs = None
+        self._result = None
+        self._generation += 1
         self.sa_label.clear()
         self.volume_label.clear()
         if not shape_name or shape_name == "Select a shape…":
+            self.current_shape = None
             self.adjustSize()
             return
-        shape_instance = self.shape_classes[shape_name]()
-        for dim in shape_instance.dimensions:
+        self.current_shape = get_shape(shape_name)
+        for index, dim in enumerate(self.current_shape.dimensions):
             label = QLabel(f"{dim}:")
             entry = QLineEdit()
-            entry.setPlaceholderText("Enter value or expression")
-            self.form_layout.addRow(label, entry)
+            entry.setPlaceholderText("Enter value, expression or value ± tolerance")
+            entry.textChanged.connect(lambda text, index=index: self.on_field_edited(index, text))
+            unit = QComboBox()
+            if dim in self.current_shape.angles:
+                unit.addItem(DEGREES)
+            else:
+                unit.addItems(LENGTH_UNITS)
+                unit.setCurrentText("cm")
+            unit.currentTextChanged.connect(lambda _, index=index: self.on_field_edited(index, self.entry_widgets[index].text()))
+            row = QHBoxLayout()
+            row.addWidget(entry)
+            row.addWidget(unit)
+            self.form_layout.addRow(label, row)
             self.entry_widgets.append(entry)
+            self.unit_widgets.append(unit)
+            self.field_values.append(0.0)
         self.adjustSize()
 
+    def on_field_edited(self, index: int, text: str) -> None:
+        """Re-parse the edited field only and schedule a recompute."""
+        entry = self.entry_widgets[index]
+        unit = self.unit_widgets[index].currentText()
+        if unit == DEGREES:
+            unit = "cm"  # angles are read as plain numbers
+        text = text.strip()
+        try:
+            if is_toleranced(text):
+                self.field_values[index] = parse_spec(text, unit=unit)
+            else:
+                self.field_values[index] = parse_length(text, unit) if text else 0.0
+        except ValueError as e:
+            self.field_values[index] = None
+            entry.setStyleSheet(INVALID_STYLE)
+            entry.setToolTip(str(e))
+            # The last result no longer matches the fields; drop it and any job in flight.
+            self._generation += 1
+            self._last_inputs = None
+            self._result = None
+            self.sa_label.clear()
+            self.volume_label.clear()
+            return
+        entry.setStyleSheet("")
+        entry.setToolTip("")
+        self._recompute_timer.start()
+
+    def _start_compute(self) -> None:
+        if self.current_shape is None or None in self.field_values:
+            return
+        inputs = (self.current_shape.name, tuple(self.field_values))
+        if inputs == self._last_inputs:
+            return
+        self._last_inputs = inputs
+        self._generation += 1
+        job = _ComputeJob(self._generation, self.current_shape, inputs[1], self._signals, self.result_cache)
+        QThreadPool.globalInstance().start(job)
+
+    def _on_computed(self, generation: int, sa: float, vol: float, sa_spread, vol_spread) -> None:
+        if generation != self._generation:
+            return
+        self._result = (sa, vol, sa_spread, vol_spread)
+        self._show_result()
+
+    def _show_result(self) -> None:
+        """Render the last result (kept in cm² and cm³) in the selected units."""
+        if self._result is None:
+            return
+        sa, vol, sa_spread, vol_spread = self._result
+        area_unit, volume_unit = self.area_unit_combo.currentText(), self.volume_unit_combo.currentText()
+        area_factor, volume_factor = 1 / AREA_UNITS[area_unit], 1 / VOLUME_UNITS[volume_unit]
+        with instrument.timed("gui.redraw"):
+            self.sa_label.setText(f"Surface Area: {sa * area_factor:,.2f} {area_unit}{_spread(sa_spread, area_factor)}")
+            self.volume_label.setText(
+                f"Volume: {vol * volume_factor:,.2f} {volume_unit}{_spread(vol_spread, volume_factor)}"
+            )
+
+    def _on_compute_failed(self, generation: int, message: str) -> None:
+        if generation != self._generation:
+            return
+        self._last_inputs = None
+        self._result = None
+        self.sa_label.setText(f"Cannot compute: {message}")
+        self.volume_label.clear()
+
     def compute_values(self) -> None:
-        shape_name = self.shape_combo.currentText()
-        if not shape_name or shape_name == "Select a shape…":
+        if self.current_shape is None:
             QMessageBox.information(self, "Select a Shape", "Please choose a shape before computing.")
             return
-        shape_class = self.shape_classes[shape_name]
-        shape_instance = shape_class()
-        try:
-            values: list[float] = []
-            for entry in self.entry_widgets:
-                text = entry.text().strip()
-                if not text:
-                    values.append(0.0)
-                else:
-                    values.append(float(sympify(text)))
-            sa = shape_instance.surface_area(*values)
-            vol = shape_instance.volume(*values)
-            self.sa_label.setText(f"Surface Area: {sa:,.2f} cm\u00B2")
-            self.volume_label.setText(f"Volume: {vol:,.2f} cm\u00B3")
-        except (ValueError, SympifyError):
+        if None in self.field_values:
             QMessageBox.critical(self, "Invalid Input", "Please enter valid numbers or expressions for dimensions.")
+            return
+        self._recompute_timer.stop()
+        self._last_inputs = None
+        self._start_compute()
 
 
 def main() -> None:
+    if "--profile-startup" in sys.argv:
+        from wetted_sa.startup import report
+
+        sys.exit(report("SA_qt"))
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,198 @@
+"""Micro-benchmarks for the shape formulas, expression parsing and batch runs.
+
+Run from the repository root::
+
+    python -m benchmarks.bench                 # print timings
+    python -m benchmarks.bench --save          # store them as this machine's baseline
+    python -m benchmarks.bench --check         # exit 1 if anything is >25% slower than the baseline
+    python -m benchmarks.bench --full -k bom   # include the 1M-row end-to-end run
+
+Every benchmark reports seconds per unit of work (one call, one row or one
+parse), so results at different batch sizes are directly comparable.
+Baselines are machine specific and are not committed.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from wetted_sa import all_shapes, bom
+from wetted_sa.expr import evaluate
+
+BASELINE = Path(__file__).with_name("baseline.json")
+BATCH_ROWS = 100_000
+BOM_ROWS = (1_000, 100_000)
+FULL_BOM_ROWS = BOM_ROWS + (1_000_000,)
+# Plain arithmetic only, so SymPy parses the same texts for comparison.
+EXPRESSIONS = ["0.25*2.54", "1/4*2.54", "(3/8)*2.54 + 0.1", "12*0.1"]
+
+
+def _sample_dims(shape, n: int, rng) -> np.ndarray:
+    # Lengths well above diameters keep the fitting formulas positive.
+    dims = rng.uniform(0.5, 2.0, size=(n, len(shape.dimensions)))
+    dims[:, 2:] *= 10
+    # Angles as a catalog mixes them: whole degrees from a few stock fittings.
+    for j, name in enumerate(shape.dimensions):
+        if name in shape.angles:
+            dims[:, j] = rng.choice([30.0, 45.0, 60.0], size=n)
+    return dims
+
+
+def scalar_benchmarks():
+    for shape in all_shapes():
+        args = tuple(float(v) for v in _sample_dims(shape, 1, np.random.default_rng(0))[0])
+
+        def run(shape=shape, args=args):
+            shape.surface_area(*args)
+            shape.volume(*args)
+
+        yield f"scalar/{shape.name}", 1, run
+
+
+def batch_benchmarks():
+    rng = np.random.default_rng(0)
+    for shape in all_shapes():
+        dims = _sample_dims(shape, BATCH_ROWS, rng)
+        columns = tuple(dims.T)
+        yield f"batch/{shape.name}", BATCH_ROWS, lambda shape=shape, columns=columns: shape.evaluate_batch(*columns)
+
+
+def formula_benchmarks():
+    """The two element-wise batch formulas, for comparison with the fused ``batch`` runs."""
+    rng = np.random.default_rng(0)
+    for shape in all_shapes():
+        columns = tuple(_sample_dims(shape, BATCH_ROWS, rng).T)
+
+        def run(shape=shape, columns=columns):
+            shape.surface_area_batch(*columns)
+            shape.volume_batch(*columns)
+
+        yield f"formulas/{shape.name}", BATCH_ROWS, run
+
+
+def parse_benchmarks():
+    uncached = evaluate.__wrapped__
+    n = len(EXPRESSIONS)
+    yield "parse/evaluate-uncached", n, lambda: [uncached(text) for text in EXPRESSIONS]
+    yield "parse/evaluate-cached", n, lambda: [evaluate(text) for text in EXPRESSIONS]
+    try:
+        from sympy import sympify
+    except ImportError:
+        return
+    yield "parse/sympify", n, lambda: [float(sympify(text)) for text in EXPRESSIONS]
+
+
+def _write_bom(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(rows)
+    shapes = all_shapes()
+    width = max(len(shape.dimensions) for shape in shapes)
+    picks = rng.integers(len(shapes), size=rows)
+    dims = rng.uniform(0.5, 2.0, size=(rows, width))
+    dims[:, 2:] *= 10
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["assembly", "shape", *(f"dim{i + 1}" for i in range(width)), "quantity"])
+        for i in range(rows):
+            shape = shapes[picks[i]]
+            k = len(shape.dimensions)
+            values = [f"{v:.4f}" for v in dims[i, :k]] + [""] * (width - k)
+            writer.writerow([f"A{i % 50}", shape.name, *values, 1 + i % 4])
+
+
+def bom_benchmarks(sizes, workdir: Path):
+    for rows in sizes:
+        source = workdir / f"bom_{rows}.csv"
+        output = workdir / f"out_{rows}.csv"
+
+        def run(rows=rows, source=source, output=output):
+            # Written on first call, so benchmarks filtered out by -k never
+            # pay for the fixture; that call is timeit's calibration run.
+            if not source.exists():
+                _write_bom(source, rows)
+            bom.run_batch(source, output)
+
+        yield f"bom/{rows}", rows, run
+
+
+def measure(fn, min_time: float = 0.2, repeat: int = 5) -> float:
+    """Return the best seconds-per-call of ``fn`` over ``repeat`` runs."""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number
+
+
+def _format(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def run(pattern: str | None, full: bool, repeat: int) -> dict[str, float]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        suites = [
+            scalar_benchmarks(),
+            batch_benchmarks(),
+            formula_benchmarks(),
+            parse_benchmarks(),
+            bom_benchmarks(FULL_BOM_ROWS if full else BOM_ROWS, Path(tmp)),
+        ]
+        for suite in suites:
+            for name, units, fn in suite:
+                if pattern and pattern not in name:
+                    continue
+                per_call = measure(fn, repeat=1 if name.startswith("bom/") else repeat)
+                results[name] = per_call / units
+                print(f"{name:<48} {_format(results[name])} per unit", flush=True)
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Return a message per benchmark slower than ``baseline`` by more than ``tolerance``."""
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference and seconds > reference * (1 + tolerance):
+            regressions.append(f"{name}: {_format(seconds)} vs baseline {_format(reference)} (+{seconds / reference - 1:.0%})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--full", action="store_true", help="include the 1M-row BOM run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per benchmark (best is kept)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="merge these results into the baseline")
+    parser.add_argument("--check", action="store_true", help="fail if slower than the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for --check (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.full, args.repeat)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.save:
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2, sort_keys=True))
+        print(f"Saved {len(results)} results to {args.baseline}")
+    if args.check:
+        if not baseline:
+            print(f"No baseline at {args.baseline}; run with --save first", file=sys.stderr)
+            return 1
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
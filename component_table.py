@@ -0,0 +1,409 @@
+"""Virtualized multi-component table for the Qt calculator.
+
+``ComponentTableModel`` is a ``QAbstractTableModel`` over a columnar
+``ComponentStore``. Each row is one component (shape, dimensions, quantity)
+with live area and volume columns. The view only paints visible cells, and
+rows reach it ``FETCH_BATCH`` at a time through ``canFetchMore``/
+``fetchMore``. Per row, the model keeps only numbers in NumPy arrays, no
+Python objects. A BOM is read and evaluated on the thread pool,
+``LOAD_CHUNK`` rows at a time, with the vectorized batch formulas. Each
+finished chunk is appended and added to the running total. Editing a shape,
+dimension or quantity recomputes that row at once. Values are stored in
+cm, cm² and cm³ and converted for display.
+
+Imported by ``SA_qt`` when its Components tab is first opened, so NumPy
+stays off the calculator's startup path.
+"""
+
+import math
+
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QObject, QRunnable, Qt, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QStyledItemDelegate,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from wetted_sa import all_shapes, get_shape, instrument
+from wetted_sa.bom import chunk_dimensions, quantities, read_located_chunks
+from wetted_sa.expr import evaluate
+from wetted_sa.store import ComponentStore
+from wetted_sa.units import AREA_UNITS, LENGTH_UNITS, VOLUME_UNITS, parse_length
+
+# Rows handed to the view per fetchMore call.
+FETCH_BATCH = 5000
+# Rows read and evaluated per background chunk.
+LOAD_CHUNK = 20_000
+DEGREES = "°"
+
+
+def _default_dims(shape) -> list[float]:
+    """1 cm for every length and 90° for every angle."""
+    return [90.0 if name in shape.angles else 1.0 for name in shape.dimensions]
+
+
+class ComponentTableModel(QAbstractTableModel):
+    """Editable table of components with computed area and volume columns."""
+
+    totals_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Dimension columns fit the widest registered shape.
+        self.slots = max(len(shape.dimensions) for shape in all_shapes())
+        self.length_unit = "cm"
+        self.area_unit = "cm²"
+        self.volume_unit = "cm³"
+        self._reset_data()
+
+    def _reset_data(self) -> None:
+        self.store = ComponentStore(capacity=LOAD_CHUNK)
+        self._quantity = np.zeros(LOAD_CHUNK)
+        self._area = np.zeros(LOAD_CHUNK)
+        self._volume = np.zeros(LOAD_CHUNK)
+        self._shown = 0
+        self.total_quantity = self.total_area = self.total_volume = 0.0
+
+    # Columns: shape, one per dimension slot, quantity, area, volume.
+    @property
+    def quantity_column(self) -> int:
+        return self.slots + 1
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._reset_data()
+        self.endResetModel()
+        self.totals_changed.emit()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._shown
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.slots + 4
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._shown < len(self.store)
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        count = min(FETCH_BATCH, len(self.store) - self._shown)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._shown, self._shown + count - 1)
+        self._shown += count
+        self.endInsertRows()
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal or role != Qt.ItemDataRole.DisplayRole:
+            return super().headerData(section, orientation, role)
+        if section == 0:
+            return "Shape"
+        if section <= self.slots:
+            return f"Dim {section} ({self.length_unit})"
+        return ("Quantity", f"Area ({self.area_unit})", f"Volume ({self.volume_unit})")[section - self.slots - 1]
+
+    def flags(self, index):
+        flags = super().flags(index)
+        column = index.column()
+        if column == 0 or column == self.quantity_column:
+            return flags | Qt.ItemFlag.ItemIsEditable
+        if 1 <= column <= self.slots and column <= len(self.store.shape_of(index.row()).dimensions):
+            return flags | Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if column:
+                return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            return None
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        shape = self.store.shape_of(row)
+        if column == 0:
+            return shape.name
+        if column <= self.slots:
+            j = column - 1
+            if j >= len(shape.dimensions):
+                return None
+            name = shape.dimensions[j]
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return name
+            value = float(self.store.column(j)[row])
+            if name in shape.angles:
+                return f"{value:g}{DEGREES}" if role == Qt.ItemDataRole.DisplayRole else f"{value:g}"
+            return f"{value / LENGTH_UNITS[self.length_unit]:.6g}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return None
+        if column == self.quantity_column:
+            return f"{self._quantity[row]:g}"
+        if column == self.slots + 2:
+            value = self._area[row] / AREA_UNITS[self.area_unit]
+        else:
+            value = self._volume[row] / VOLUME_UNITS[self.volume_unit]
+        return f"{value:,.2f}" if math.isfinite(value) else "—"
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        row, column = index.row(), index.column()
+        shape = self.store.shape_of(row)
+        dims = [float(self.store.column(j)[row]) for j in range(self.store.width)]
+        text = str(value).strip()
+        try:
+            if column == 0:
+                # Carry over dimensions both shapes name alike; default the rest.
+                kept = dict(zip(shape.dimensions, dims))
+                shape = get_shape(text)
+                dims = [kept.get(name, default) for name, default in zip(shape.dimensions, _default_dims(shape))]
+                self.store.replace(row, shape.name, dims)
+            elif column == self.quantity_column:
+                quantity = evaluate(text)
+                self._add_totals(row, -1)
+                self._quantity[row] = quantity
+                self._add_totals(row, 1)
+            else:
+                j = column - 1
+                angle = shape.dimensions[j] in shape.angles
+                dims[j] = parse_length(text.rstrip(DEGREES), "cm" if angle else self.length_unit)
+                self.store.replace(row, shape.name, dims)
+        except ValueError:
+            return False
+        if column != self.quantity_column:
+            self._recompute(row)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+        self.totals_changed.emit()
+        return True
+
+    def _add_totals(self, row: int, sign: int) -> None:
+        quantity = self._quantity[row]
+        area, volume = self._area[row] * quantity, self._volume[row] * quantity
+        self.total_quantity += sign * quantity
+        if math.isfinite(area):
+            self.total_area += sign * area
+        if math.isfinite(volume):
+            self.total_volume += sign * volume
+
+    def _recompute(self, row: int) -> None:
+        self._add_totals(row, -1)
+        item = self.store[row]
+        try:
+            with instrument.timed("compute", item.shape.name):
+                self._area[row], self._volume[row] = item.surface_area(), item.volume()
+        except (ValueError, ArithmeticError):
+            self._area[row] = self._volume[row] = math.nan
+        self._add_totals(row, 1)
+
+    def _grow(self, n: int) -> None:
+        if n <= len(self._quantity):
+            return
+        capacity = max(n, 2 * len(self._quantity))
+        for name in ("_quantity", "_area", "_volume"):
+            grown = np.zeros(capacity)
+            grown[: len(self.store)] = getattr(self, name)[: len(self.store)]
+            setattr(self, name, grown)
+
+    def append(self, names, dims, quantity, area, volume) -> None:
+        """Add evaluated rows (cm² and cm³) and fold them into the totals."""
+        start = len(self.store)
+        self._grow(start + len(names))
+        rows = self.store.extend(names, dims)
+        self._quantity[rows.start:rows.stop] = quantity
+        self._area[rows.start:rows.stop] = area
+        self._volume[rows.start:rows.stop] = volume
+        self.total_quantity += float(np.sum(quantity))
+        self.total_area += float(np.nansum(area * quantity))
+        self.total_volume += float(np.nansum(volume * quantity))
+        if self._shown < FETCH_BATCH:
+            self.fetchMore()
+        self.totals_changed.emit()
+
+    def add_component(self, shape_name: str) -> int:
+        """Append one component with unit dimensions and return its row."""
+        shape = get_shape(shape_name)
+        dims = _default_dims(shape)
+        dims += [0.0] * (self.store.width - len(dims))
+        self.append([shape.name], np.array([dims]), np.ones(1), np.zeros(1), np.zeros(1))
+        row = len(self.store) - 1
+        self._recompute(row)
+        while self._shown <= row:
+            self.fetchMore()
+        self.totals_changed.emit()
+        return row
+
+    def set_units(self, length_unit: str, area_unit: str, volume_unit: str) -> None:
+        self.length_unit, self.area_unit, self.volume_unit = length_unit, area_unit, volume_unit
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.columnCount() - 1)
+        if self._shown:
+            self.dataChanged.emit(self.index(0, 1), self.index(self._shown - 1, self.columnCount() - 1))
+        self.totals_changed.emit()
+
+
+class _LoadSignals(QObject):
+    chunk = pyqtSignal(int, object)
+    finished = pyqtSignal(int, str)
+
+
+class _LoadJob(QRunnable):
+    """Read and evaluate a BOM chunk by chunk on the thread pool."""
+
+    def __init__(self, generation: int, path: str, unit: str, signals: _LoadSignals):
+        super().__init__()
+        self.generation = generation
+        self.path = path
+        self.unit = unit
+        self.signals = signals
+        self.cancelled = False
+
+    def run(self) -> None:
+        error = ""
+        try:
+            for location, columns in read_located_chunks(self.path, LOAD_CHUNK):
+                if self.cancelled:
+                    return
+                with instrument.timed("bom.evaluate"):
+                    try:
+                        names, dims = chunk_dimensions(columns, self.unit)
+                    except ValueError as e:
+                        raise ValueError(f"{location}: {e}") from e
+                    chunk = ComponentStore(capacity=len(names))
+                    chunk.extend(names, dims)
+                    area, volume = chunk.evaluate()
+                self.signals.chunk.emit(self.generation, (names, dims, quantities(columns, len(names)), area, volume))
+        except (OSError, ValueError, ImportError) as e:
+            error = str(e)
+        self.signals.finished.emit(self.generation, error)
+
+
+class _ShapeDelegate(QStyledItemDelegate):
+    """Edit the shape column with a drop-down of registered shapes."""
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems([shape.name for shape in all_shapes()])
+        return editor
+
+    def setEditorData(self, editor, index) -> None:
+        editor.setCurrentText(index.data())
+
+    def setModelData(self, editor, model, index) -> None:
+        model.setData(index, editor.currentText())
+
+
+class ComponentTableTab(QWidget):
+    """Components tab: open a BOM or add rows, edit in place, see running totals."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = ComponentTableModel(self)
+        self.model.totals_changed.connect(self._show_totals)
+        self._generation = 0
+        self._job = None
+        self._loading = False
+        self._signals = _LoadSignals(self)
+        self._signals.chunk.connect(self._on_chunk)
+        self._signals.finished.connect(self._on_finished)
+
+        controls = QHBoxLayout()
+        open_btn = QPushButton("Open BOM…")
+        open_btn.clicked.connect(self.open_bom)
+        self.shape_combo = QComboBox()
+        self.shape_combo.addItems([shape.name for shape in all_shapes()])
+        add_btn = QPushButton("Add component")
+        add_btn.clicked.connect(lambda: self._add_component(self.shape_combo.currentText()))
+        self.length_combo = QComboBox()
+        self.length_combo.addItems(LENGTH_UNITS)
+        self.length_combo.setCurrentText("cm")
+        self.area_combo = QComboBox()
+        self.area_combo.addItems(AREA_UNITS)
+        self.volume_combo = QComboBox()
+        self.volume_combo.addItems(VOLUME_UNITS)
+        for combo in (self.length_combo, self.area_combo, self.volume_combo):
+            combo.currentTextChanged.connect(self._on_units_changed)
+        controls.addWidget(open_btn)
+        controls.addWidget(self.shape_combo)
+        controls.addWidget(add_btn)
+        controls.addStretch()
+        controls.addWidget(QLabel("Units:"))
+        controls.addWidget(self.length_combo)
+        controls.addWidget(self.area_combo)
+        controls.addWidget(self.volume_combo)
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegateForColumn(0, _ShapeDelegate(self.view))
+        self.view.setWordWrap(False)
+        self.view.setAlternatingRowColors(True)
+        # Fixed row heights let the view map scroll positions to rows without measuring.
+        rows = self.view.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+        self.view.horizontalHeader().setStretchLastSection(True)
+
+        self.total_label = QLabel("")
+
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.view)
+        layout.addWidget(self.total_label)
+        self.setLayout(layout)
+        self._show_totals()
+
+    def open_bom(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(self, "Open BOM", "", "BOM (*.csv *.parquet *.pq);;All files (*)")
+        if path:
+            self.load(path)
+
+    def load(self, path: str) -> None:
+        """Replace the table with the rows of a CSV/Parquet BOM, loaded in the background."""
+        if self._job is not None:
+            self._job.cancelled = True
+        self._generation += 1
+        self.model.clear()
+        self._loading = True
+        self._job = _LoadJob(self._generation, path, self.length_combo.currentText(), self._signals)
+        QThreadPool.globalInstance().start(self._job)
+        self._show_totals()
+
+    def _on_chunk(self, generation: int, chunk) -> None:
+        if generation == self._generation:
+            self.model.append(*chunk)
+
+    def _on_finished(self, generation: int, error: str) -> None:
+        if generation != self._generation:
+            return
+        self._job = None
+        self._loading = False
+        self._show_totals(error)
+
+    def _add_component(self, shape_name: str) -> None:
+        row = self.model.add_component(shape_name)
+        self.view.scrollTo(self.model.index(row, 0))
+
+    def _on_units_changed(self) -> None:
+        self.model.set_units(self.length_combo.currentText(), self.area_combo.currentText(), self.volume_combo.currentText())
+
+    def _show_totals(self, error: str = "") -> None:
+        model = self.model
+        area_unit, volume_unit = model.area_unit, model.volume_unit
+        with instrument.timed("gui.redraw"):
+            text = (
+                f"{len(model):,} components, {model.total_quantity:g} parts: "
+                f"{model.total_area / AREA_UNITS[area_unit]:,.2f} {area_unit}, "
+                f"{model.total_volume / VOLUME_UNITS[volume_unit]:,.2f} {volume_unit}"
+            )
+            if self._loading:
+                text += " (loading…)"
+            if error:
+                text += f" (stopped: {error})"
+            self.total_label.setText(text)
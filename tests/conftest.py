@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _private_cache(tmp_path_factory):
+    # Kernels and cached results go under WETTED_SA_CACHE; keep them out of ~/.cache.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("WETTED_SA_CACHE", str(tmp_path_factory.mktemp("cache") / "results.sqlite3"))
+        yield
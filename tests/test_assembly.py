@@ -0,0 +1,60 @@
+import pytest
+
+from wetted_sa import Shape
+from wetted_sa.assembly import Assembly, Component
+
+
+class _Counting(Shape):
+    """A cube that records which edge lengths it was evaluated for."""
+
+    def __init__(self):
+        super().__init__("Counting cube", ["Edge"])
+        self.calls = []
+
+    def surface_area(self, edge):
+        self.calls.append(edge)
+        return 6 * edge**2
+
+    def volume(self, edge):
+        return edge**3
+
+
+def test_edit_recomputes_only_that_component():
+    cube = _Counting()
+    edited = Component(cube, [2.0])
+    top = Assembly("top", [Assembly("left", [Component(cube, [1.0]), edited], quantity=2), Component(cube, [3.0])])
+    assert top.totals() == (2 * (6 + 24) + 54, 2 * (1 + 8) + 27)
+    assert sorted(cube.calls) == [1.0, 2.0, 3.0]
+
+    cube.calls.clear()
+    assert top.totals() == (114, 45)
+    assert cube.calls == []
+
+    edited.set_dimension("Edge", 4.0)
+    assert top.totals() == (2 * (6 + 96) + 54, 2 * (1 + 64) + 27)
+    assert cube.calls == [4.0]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [],
+        {"components": {"shape": "Tube"}},
+        {"components": ["Tube"]},
+        {"components": [{"shape": "Tube"}]},
+        {"components": [{"dims": [1, 2]}]},
+        {"components": [{"shape": "Tube", "dims": 3}]},
+        {"components": [{"components": [{"quantity": 2}]}]},
+    ],
+)
+def test_from_dict_rejects_malformed_input(data):
+    with pytest.raises(ValueError):
+        Assembly.from_dict(data)
+
+
+def test_from_dict_reads_nested_assemblies():
+    data = {"name": "A", "components": [{"shape": "Tube", "dims": [1, 2]}, {"name": "B", "components": []}]}
+    assert Assembly.from_dict(data).to_dict() == {
+        "name": "A",
+        "components": [{"shape": "Tube", "dims": [1.0, 2.0]}, {"name": "B", "components": []}],
+    }
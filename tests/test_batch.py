@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from wetted_sa import all_shapes
+
+# Documented in the README: |batch - scalar| <= TOLERANCE * L**2 (areas) or L**3
+# (volumes), L being the row's largest length dimension.
+TOLERANCE = 1e-12
+
+
+@pytest.mark.parametrize("shape", all_shapes(), ids=lambda shape: shape.name)
+def test_batch_matches_scalar_within_tolerance(shape):
+    rng = np.random.default_rng(0)
+    lengths = np.array(shape.length_mask())
+    dims = rng.uniform(0.1, 100, (2000, len(lengths)))
+    dims[:, ~lengths] = rng.uniform(1, 179, (len(dims), (~lengths).sum()))
+    scale = dims[:, lengths].max(axis=1)
+    areas, volumes = shape.evaluate_batch(dims)
+    for batch, formula, power in (
+        (areas, shape.surface_area, 2),
+        (volumes, shape.volume, 3),
+        (shape.surface_area_batch(dims), shape.surface_area, 2),
+        (shape.volume_batch(dims), shape.volume, 3),
+    ):
+        scalar = np.array([formula(*row) for row in dims.tolist()])
+        assert np.all(np.abs(batch - scalar) <= TOLERANCE * scale**power)
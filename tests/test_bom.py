@@ -0,0 +1,35 @@
+import pytest
+
+from wetted_sa.bom import read_chunks, run_batch
+from wetted_sa.cli import build_parser
+
+
+def test_read_chunks_skips_blank_lines_and_bom(tmp_path):
+    path = tmp_path / "bom.csv"
+    lines = ["shape,dim1,dim2", "Tube,1,1", "", "", "", "Tube,2,2", "", "Tube,3,3"]
+    path.write_bytes(("\ufeff" + "\r\n".join(lines) + "\r\n").encode())
+    chunks = list(read_chunks(path, chunk_size=2))
+    assert list(chunks[0]) == ["shape", "dim1", "dim2"]
+    assert [v for chunk in chunks for v in chunk["dim1"]] == ["1", "2", "3"]
+
+
+def test_read_chunks_pads_short_rows(tmp_path):
+    path = tmp_path / "bom.csv"
+    path.write_text("shape,dim1,dim2,quantity\nTube,1,1\nTube,2\n")
+    (chunk,) = read_chunks(path)
+    assert chunk == {"shape": ["Tube", "Tube"], "dim1": ["1", "2"], "dim2": ["1", ""], "quantity": ["", ""]}
+
+
+def test_errors_name_file_lines(tmp_path):
+    path = tmp_path / "bom.csv"
+    path.write_text("shape,dim1,dim2\n\nTube,1,1\n\n\nTube,1,1\nTube,1,oops\n")
+    with pytest.raises(ValueError, match=r"^lines 3-7: "):
+        run_batch(path, tmp_path / "out.csv", chunk_size=3)
+    with pytest.raises(ValueError, match=r"^line 7: "):
+        run_batch(path, tmp_path / "out.csv", chunk_size=2)
+
+
+@pytest.mark.parametrize("command", ["batch", "report"])
+def test_chunk_size_must_be_positive(command):
+    with pytest.raises(SystemExit):
+        build_parser().parse_args([command, "bom.csv", "-o", "out.csv", "--chunk-size", "0"])
@@ -0,0 +1,30 @@
+import numpy as np
+
+from wetted_sa.catalog import CatalogIndex
+from wetted_sa.store import ComponentStore
+
+
+def _save(store, path):
+    store.save(path)
+    return ComponentStore.load(path)
+
+
+def test_index_follows_appends_and_in_place_edits(tmp_path):
+    store_path, index_path = tmp_path / "lib.wss", tmp_path / "lib.wsi"
+    store = ComponentStore()
+    store.extend("Tube", np.random.default_rng(0).uniform(1, 10, (500, 2)))
+    store = _save(store, store_path)
+    index = CatalogIndex.open(index_path, store, store_path)
+    assert len(index) == 500
+
+    store = ComponentStore.load(store_path, mode="c")
+    store.append("Cap", [3.0])
+    store = _save(store, store_path)
+    index = CatalogIndex.open(index_path, store, store_path)
+    assert len(index) == 501 and index.range(area=(7.06, 7.07)).tolist() == [500]
+
+    store = ComponentStore.load(store_path, mode="c")
+    store.replace(0, "Tube", [100.0, 100.0])
+    store = _save(store, store_path)
+    index = CatalogIndex.open(index_path, store, store_path)
+    assert 0 in index.range(area=(31415, 31416)).tolist()
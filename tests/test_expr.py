@@ -0,0 +1,39 @@
+import pytest
+
+from wetted_sa.expr import evaluate
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "exec(chr(112)+chr(114)+chr(105)+chr(110)+chr(116)+chr(40)+chr(52)+chr(50)+chr(41))",
+        "eval('1+1')",
+        "getattr(1, 'real')",
+        "__import__('os').getcwd()",
+        "(1).real",
+        "open('x')",
+        "Rational(1, 3)",
+    ],
+)
+def test_rejects_code(text, capsys):
+    with pytest.raises(ValueError):
+        evaluate(text)
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [("0.25*2.54", 0.635), ("1/4 in", 0.635), ("2^3", 8.0), ("sqrt(16)mm", 0.4), ("log(exp(2))", 2.0)],
+)
+def test_arithmetic(text, expected):
+    assert evaluate(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["+" * 5000 + "1", "-" * 100000 + "1", "-" * 900 + "1"])
+def test_rejects_oversized_input(text):
+    with pytest.raises(ValueError):
+        evaluate(text)
+
+
+def test_long_sums_still_evaluate():
+    assert evaluate("+".join(["1"] * 150)) == 150.0
@@ -0,0 +1,77 @@
+import json
+import threading
+from collections import deque
+
+import pytest
+
+from wetted_sa import instrument
+
+
+@pytest.fixture
+def recording(monkeypatch):
+    monkeypatch.setattr(instrument, "REGISTRY", instrument.Registry())
+    instrument.REGISTRY.trace = deque(maxlen=10)
+    instrument.enable()
+    yield instrument.REGISTRY
+    instrument.disable()
+
+
+def test_hooks_do_nothing_while_disabled(monkeypatch):
+    monkeypatch.setattr(instrument, "REGISTRY", instrument.Registry())
+    assert not instrument.enabled()
+    with instrument.timed("evaluate", "Tube"):
+        instrument.count("rows", 5, "Tube")
+    assert instrument.REGISTRY.snapshot() == {"counters": [], "stages": []}
+
+
+def test_timed_and_count(recording):
+    with instrument.timed("evaluate", "Tube"):
+        instrument.count("rows", 5, "Tube")
+    instrument.count("rows", 2, "Tube")
+    instrument.count("requests")
+
+    def work():
+        with instrument.timed("evaluate", "Tube"):
+            pass
+
+    worker = threading.Thread(target=work)
+    worker.start()
+    worker.join()
+    snapshot = recording.snapshot()
+    assert snapshot["counters"] == [
+        {"name": "requests", "shape": "", "value": 1},
+        {"name": "rows", "shape": "Tube", "value": 7},
+    ]
+    [stage] = snapshot["stages"]
+    assert (stage["stage"], stage["shape"], stage["count"]) == ("evaluate", "Tube", 2)
+    assert 0 <= stage["p50"] <= stage["max"] <= stage["sum"]
+    assert sum(stage["buckets"].values()) == 2
+    assert len({event["tid"] for event in recording.trace_events()["traceEvents"]}) == 2
+
+
+def test_histogram_quantiles():
+    histogram = instrument.Histogram()
+    for seconds in [0.0002] * 99 + [3.0]:
+        histogram.observe(seconds)
+    assert histogram.quantile(0.5) == pytest.approx(2.5e-4)
+    assert histogram.quantile(1.0) == 3.0
+    histogram.observe(60.0)
+    assert histogram.buckets[-1] == 1 and histogram.quantile(1.0) == 60.0
+
+
+def test_export_formats(recording, tmp_path):
+    with instrument.timed("parse"):
+        pass
+    instrument.count("bom rows", 3)
+    instrument.export(tmp_path / "metrics.json")
+    instrument.export(tmp_path / "metrics.prom")
+    instrument.export_trace(tmp_path / "trace.json")
+
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+    assert metrics["counters"] == [{"name": "bom rows", "shape": "", "value": 3}]
+    prometheus = (tmp_path / "metrics.prom").read_text().splitlines()
+    assert "wetted_sa_bom_rows_total 3" in prometheus
+    assert 'wetted_sa_stage_seconds_bucket{stage="parse",le="+Inf"} 1' in prometheus
+    assert 'wetted_sa_stage_seconds_count{stage="parse"} 1' in prometheus
+    [event] = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert event["name"] == "parse" and event["ph"] == "X" and event["dur"] >= 0
@@ -0,0 +1,59 @@
+import pytest
+
+from wetted_sa import get_shape, kernels
+from wetted_sa.cache import formula_version
+
+pytest.importorskip("sympy")
+
+
+@pytest.fixture(autouse=True)
+def kernel_cache(tmp_path, monkeypatch):
+    # Generated kernels go under the result cache directory; keep them out of ~/.cache.
+    monkeypatch.setenv("WETTED_SA_CACHE", str(tmp_path / "results.sqlite3"))
+    monkeypatch.setattr(kernels, "_kernels", {})
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "    return __import__('os').system('echo pwned'), 0",
+        "    return open('x'), 0",
+        "    return d0.__class__, 0",
+        "    t0 = [d0]\n    return t0, 0",
+        "    return eval('1'), 0",
+    ],
+)
+def test_check_source_rejects_code(body):
+    with pytest.raises(ValueError):
+        kernels.check_source(f"def kernel(d0, d1):\n{body}\n")
+
+
+def test_generated_source_passes_the_check():
+    for name in ("Tube", "Wye", "Flask"):
+        kernels.check_source(kernels.generate_source(get_shape(name)))
+
+
+def test_tampered_cache_file_is_regenerated(capfd):
+    tube = get_shape("Tube")
+    path = kernels.kernel_dir() / f"Tube-{formula_version(tube)}-{kernels.KERNEL_FORMAT}.py"
+    path.parent.mkdir(parents=True)
+    path.write_text("import os\nos.system('echo pwned')\ndef kernel(d0, d1):\n    return d0, d1\n")
+    fused = kernels.kernel(tube)
+    assert "pwned" not in capfd.readouterr().out
+    assert fused(2.0, 3.0) == pytest.approx((tube.surface_area(2.0, 3.0), tube.volume(2.0, 3.0)))
+    assert "import" not in path.read_text()
+
+
+def test_fused_batch_matches_the_formulas():
+    import numpy as np
+
+    from wetted_sa import all_shapes
+    from wetted_sa.tessellate import DEFAULT_DIMS
+
+    for shape in all_shapes():
+        columns = [np.full(5, value) for value in DEFAULT_DIMS[shape.name]]
+        area, volume = shape.evaluate_batch(*columns)
+        for result, formula in ((area, shape.surface_area_batch), (volume, shape.volume_batch)):
+            assert result.shape == (5,) and result.dtype == np.float64 and result.flags.writeable
+            assert not any(np.shares_memory(result, column) for column in columns)
+            np.testing.assert_allclose(result, formula(*columns))
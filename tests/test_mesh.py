@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+import pytest
+
+from wetted_sa import get_shape, mesh
+
+# A unit cube as 12 outward-facing triangles.
+_CORNERS = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=float)
+_CUBE_FACES = [
+    (0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5),  # x = 0, x = 1
+    (0, 4, 5), (0, 5, 1), (2, 3, 7), (2, 7, 6),  # y = 0, y = 1
+    (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3),  # z = 0, z = 1
+]
+CUBE = _CORNERS[_CUBE_FACES]
+
+
+def _write_ascii_stl(path, triangles):
+    lines = ["solid test"]
+    for triangle in triangles:
+        lines += ["facet normal 0 0 0", "outer loop"]
+        lines += [f"vertex {x:.17g} {y:.17g} {z:.17g}" for x, y, z in triangle]
+        lines += ["endloop", "endfacet"]
+    path.write_text("\n".join(lines + ["endsolid test\n"]))
+
+
+def _write(path, triangles, kind):
+    if kind == "ascii":
+        _write_ascii_stl(path, triangles)
+    else:
+        mesh.save_stl(path, triangles)
+
+
+@pytest.mark.parametrize("kind", ["ascii", "binary"])
+def test_cube_stl(tmp_path, kind):
+    path = tmp_path / "cube.stl"
+    _write(path, CUBE * 2, kind)
+    loaded = mesh.load(path, units="mm")
+    assert len(loaded) == 12
+    area, volume = loaded.area_and_volume()
+    assert area == pytest.approx(24 * 0.1**2)
+    assert volume == pytest.approx(8 * 0.1**3)
+
+
+@pytest.mark.parametrize("kind", ["ascii", "binary"])
+def test_tube_stl_matches_the_polygonal_prism(tmp_path, kind):
+    n, radius, length = 64, 0.5, 10.0
+    triangles = get_shape("Tube").tessellate(2 * radius, length, resolution=n).triangles
+    path = tmp_path / "tube.stl"
+    _write(path, triangles, kind)
+    area, volume = mesh.load(path).area_and_volume()
+    end = n / 2 * radius**2 * math.sin(2 * math.pi / n)
+    side = n * 2 * radius * math.sin(math.pi / n) * length
+    assert area == pytest.approx(side + 2 * end, rel=1e-6)
+    assert volume == pytest.approx(end * length, rel=1e-6)
+
+
+def test_zero_facet_binary_stl(tmp_path):
+    path = tmp_path / "empty.stl"
+    mesh.save_stl(path, np.zeros((0, 3, 3)))
+    assert path.stat().st_size == 84
+    loaded = mesh.load(path)
+    assert len(loaded) == 0
+    assert loaded.area_and_volume() == (0.0, 0.0)
+
+
+def test_obj_cube(tmp_path):
+    path = tmp_path / "cube.obj"
+    path.write_text(
+        "".join(f"v {x} {y} {z}\n" for x, y, z in _CORNERS)
+        + "".join(f"f {a + 1} {b + 1} {c + 1}\n" for a, b, c in _CUBE_FACES)
+    )
+    assert mesh.load(path, scale=2).area_and_volume() == pytest.approx((24, 8))
+
+
+def test_units_and_scale_are_exclusive(tmp_path):
+    path = tmp_path / "cube.stl"
+    mesh.save_stl(path, CUBE)
+    with pytest.raises(ValueError, match="not both"):
+        mesh.load(path, scale=2, units="mm")
+    with pytest.raises(ValueError, match="Unknown unit"):
+        mesh.load(path, units="furlong")
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_invalid_field_clears_the_shown_result(app):
+    import SA_qt
+
+    window = SA_qt.MainWindow()
+    window.shape_combo.setCurrentText("Tube")
+    for entry, text in zip(window.entry_widgets, ["1", "2"]):
+        entry.setText(text)
+    window._on_computed(window._generation, 6.28, 1.57, None, None)
+    assert "Surface Area" in window.sa_label.text()
+
+    window.entry_widgets[1].setText("2 +")
+    assert window._result is None
+    assert window.sa_label.text() == "" and window.volume_label.text() == ""
@@ -0,0 +1,65 @@
+import importlib.metadata
+import sys
+
+import pytest
+
+from wetted_sa import Shape, all_shapes, get_shape, registry
+
+
+@pytest.fixture
+def clean_registry(monkeypatch):
+    monkeypatch.setattr(registry, "SHAPE_CLASSES", dict(registry.SHAPE_CLASSES))
+    monkeypatch.setattr(registry, "_INSTANCES", dict(registry._INSTANCES))
+    monkeypatch.setattr(registry, "_plugins_loaded", False)
+
+
+def test_register_adds_a_shared_instance(clean_registry):
+    @registry.register
+    class Disc(Shape):
+        def __init__(self):
+            super().__init__("Disc", ["Diameter"])
+
+    assert isinstance(get_shape("Disc"), Disc)
+    assert get_shape("Disc") is get_shape("Disc")
+    assert all_shapes()[-1] is get_shape("Disc")
+
+
+def test_register_rejects_a_duplicate_name(clean_registry):
+    class OtherTube(Shape):
+        def __init__(self):
+            super().__init__("Tube", ["Diameter", "Length"])
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(OtherTube)
+
+
+def test_get_shape_rejects_unknown_names(clean_registry):
+    with pytest.raises(ValueError, match="Unknown shape 'Torus'"):
+        get_shape("Torus")
+
+
+def test_entry_point_plugins_are_loaded_once(clean_registry, monkeypatch, tmp_path):
+    (tmp_path / "bellows_plugin.py").write_text(
+        "from wetted_sa import Shape\n"
+        "class Bellows(Shape):\n"
+        "    def __init__(self):\n"
+        "        super().__init__('Bellows', ['Diameter'])\n"
+        "    def surface_area(self, diameter):\n"
+        "        return 2 * diameter\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "bellows_plugin", raising=False)
+    calls = []
+
+    def entry_points(group):
+        calls.append(group)
+        return [
+            importlib.metadata.EntryPoint("bellows", "bellows_plugin:Bellows", group),
+            importlib.metadata.EntryPoint("broken", "no_such_module:Shape", group),
+        ]
+
+    monkeypatch.setattr(importlib.metadata, "entry_points", entry_points)
+    with pytest.warns(RuntimeWarning, match="broken"):
+        assert get_shape("Bellows").surface_area(3) == 6
+    assert "Bellows" in [shape.name for shape in all_shapes()]
+    assert calls == [registry.ENTRY_POINT_GROUP]
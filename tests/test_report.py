@@ -0,0 +1,40 @@
+import csv
+
+import pytest
+
+from wetted_sa.report import companion_paths, generate
+from wetted_sa.units import parse_volume
+
+BOM = "part,assembly,shape,dim1,dim2,quantity,fill_volume\nA,S1,Tube,1,10,2,250 mL\nB,S1,Tube,2,10,1,0.1 L\nC,S2,Tube,1,5,1,\n"
+
+
+@pytest.fixture
+def bom(tmp_path):
+    path = tmp_path / "bom.csv"
+    path.write_text(BOM)
+    return path
+
+
+def test_fill_volume_cells_are_volumes(bom, tmp_path):
+    data = generate(bom, tmp_path / "out.pdf", volume_unit="L")
+    quantity, area, volume, fill = data.totals["S1"].tolist()
+    assert fill == pytest.approx(2 * 0.25 + 0.1)
+    with pytest.raises(ValueError, match="not a volume"):
+        parse_volume("3 in")
+
+
+def test_zero_top_ranks_nothing(bom, tmp_path):
+    assert generate(bom, tmp_path / "out.pdf", top=0).worst() == []
+
+
+def test_csv_outputs_are_single_tables(bom, tmp_path):
+    out = tmp_path / "out.csv"
+    generate(bom, out, top=2)
+    summary_path, top_path = companion_paths(out)
+    tables = {path.name: list(csv.reader(path.open(encoding="utf-8"))) for path in (out, summary_path, top_path)}
+    assert sorted(tables) == ["out.csv", "out.summary.csv", "out.top.csv"]
+    for rows in tables.values():
+        assert len({len(row) for row in rows}) == 1
+    assert tables["out.csv"][0][0] == "line" and len(tables["out.csv"]) == 4
+    assert [row[0] for row in tables["out.summary.csv"]] == ["Assembly", "S1", "S2", "Total"]
+    assert sorted(row[1] for row in tables["out.top.csv"][1:]) == ["A", "B"]
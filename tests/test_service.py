@@ -0,0 +1,80 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from wetted_sa.service import Coalescer, Service, start_server
+
+
+def _handle(method, path, payload):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    return asyncio.run(Service().handle(method, path, body))
+
+
+def test_bad_item_does_not_fail_its_group():
+    status, results = _handle(
+        "POST",
+        "/batch",
+        [
+            {"shape": "Tube", "dims": [1, "1/0"], "part": "bad"},
+            *({"shape": "Tube", "dims": [1, n]} for n in range(1, 40)),
+        ],
+    )
+    assert status == 200
+    assert results[0]["part"] == "bad" and "error" in results[0]
+    assert all("error" not in r for r in results[1:])
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"shape": "Tube", "dims": [1, ' + b"9" * 400 + b"]}",
+        b'{"shape": "Tube", "dims": [NaN, 1]}',
+        b'{"shape": "Tube", "dims": [1, Infinity]}',
+        b'{"shape": "Tube", "dims": [1, "1e400"]}',
+    ],
+)
+def test_rejects_unrepresentable_dimensions(body):
+    status, payload = _handle("POST", "/compute", body)
+    assert status == 400
+    json.dumps(payload, allow_nan=False)
+
+
+def test_storage_error_answers_every_request():
+    class BrokenCache:
+        def compute_many(self, shape, rows):
+            raise sqlite3.OperationalError("database is locked")
+
+    async def run():
+        service = Service(Coalescer(persistent=BrokenCache()))
+        body = json.dumps({"shape": "Tube", "dims": [1, 2]}).encode()
+        return await asyncio.wait_for(asyncio.gather(*(service.handle("POST", "/compute", body) for _ in range(3))), 5)
+
+    for status, payload in asyncio.run(run()):
+        assert status == 500 and "database is locked" in payload["error"]
+
+
+@pytest.mark.parametrize(
+    ("request_head", "status"),
+    [
+        (b"GET /" + b"x" * 70_000 + b" HTTP/1.1\r\n\r\n", 400),
+        (b"GET /shapes HTTP/1.1\r\nX-Big: " + b"x" * 70_000 + b"\r\n\r\n", 431),
+        (b"GET /shapes HTTP/1.1\r\n" + b"X-Many: 1\r\n" * 200 + b"\r\n", 431),
+        (b"POST /compute HTTP/1.1\r\nContent-Length: -1\r\n\r\n", 400),
+    ],
+    ids=["long request line", "long header", "many headers", "negative length"],
+)
+def test_oversized_or_malformed_head_gets_an_answer(request_head, status):
+    async def run():
+        server = await start_server(port=0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(request_head)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+
+    response = asyncio.run(run())
+    assert response.startswith(f"HTTP/1.1 {status} ".encode()) and b"Connection: close" in response
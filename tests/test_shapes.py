@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from wetted_sa import cache, get_shape, shapes
+
+
+@pytest.mark.parametrize("angle", [0, 180, -30, float("nan")])
+def test_angled_wye_rejects_degenerate_angles(angle):
+    wye = get_shape("Angled Wye")
+    with pytest.raises(ValueError, match="angle"):
+        wye.surface_area(1, 2, 3, 4, angle)
+    rows = np.array([[1, 2, 3, 4, 30.0]] * 20 + [[1, 2, 3, 4, angle]])
+    with pytest.raises(ValueError, match="angle"):
+        wye.evaluate_batch(rows)
+
+
+def test_bend_rejects_zero_angle():
+    with pytest.raises(ValueError, match="angle"):
+        get_shape("Bend").volume(1, 2, 3, 4, 0, 1)
+
+
+def test_formula_version_covers_module_constants(monkeypatch):
+    wye = get_shape("Wye")
+    before = cache.formula_version(wye)
+    monkeypatch.setattr(cache, "_versions", {})
+    monkeypatch.setattr(shapes, "_WYE_SIN", 0.6)
+    assert cache.formula_version(wye) != before
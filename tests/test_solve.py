@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from wetted_sa import get_shape
+from wetted_sa.cli import build_parser
+from wetted_sa.solve import solve, solve_one
+
+
+def _quantities(shape, dims):
+    area, volume = shape.surface_area(*dims), shape.volume(*dims)
+    return {"area": area, "volume": volume, "ratio": area / volume}
+
+
+@pytest.mark.parametrize(
+    "name, dims, vary",
+    [
+        ("Tube", (1.0, 10.0), "Length"),
+        ("Tube", (1.0, 10.0), "Diameter"),
+        ("Conical Frustrum", (1.0, 2.0, 3.0), "Length"),
+        ("Bend", (1.0, 1.0, 4.0, 4.0, 45.0, 3.0), "Bend Radius"),
+        ("Bend", (1.0, 1.0, 4.0, 4.0, 45.0, 3.0), "Bend Angle"),
+        ("Angled Wye", (1.0, 1.0, 8.0, 6.0, 45.0), "Branch Angle"),
+    ],
+)
+@pytest.mark.parametrize("target", ["area", "volume"])
+def test_round_trip(name, dims, vary, target):
+    shape = get_shape(name)
+    value = _quantities(shape, dims)[target]
+    known = dict(zip(shape.dimensions, dims))
+    known[vary] = 1.0
+    solved = solve_one(shape, target, value, known, vary)
+    assert solved[vary] == pytest.approx(dims[shape.dimensions.index(vary)], rel=1e-9)
+
+
+def test_round_trip_ratio_for_an_angle():
+    wye = get_shape("Angled Wye")
+    dims = (1.0, 1.0, 8.0, 6.0, 60.0)
+    solved = solve_one(wye, "ratio", _quantities(wye, dims)["ratio"], dict(zip(wye.dimensions, dims)), "Branch Angle")
+    assert solved["Branch Angle"] == pytest.approx(60.0, rel=1e-9)
+
+
+def test_angle_with_two_solutions_gives_the_smaller():
+    wye = get_shape("Angled Wye")
+    dims = dict(zip(wye.dimensions, (1.0, 1.0, 8.0, 6.0, 150.0)))
+    area = wye.surface_area(*dims.values())
+    angle = solve_one(wye, "area", area, dims, "Branch Angle")["Branch Angle"]
+    assert angle < 45
+    assert wye.surface_area(1.0, 1.0, 8.0, 6.0, angle) == pytest.approx(area, rel=1e-9)
+
+
+def test_unreachable_angle_is_nan():
+    wye = get_shape("Angled Wye")
+    dims = dict(zip(wye.dimensions, (1.0, 1.0, 8.0, 6.0, 45.0)))
+    rows = solve(wye, "area", [1.0, wye.surface_area(*dims.values())], dims, "Branch Angle")
+    assert np.isnan(rows[0, 4])
+    assert rows[1, 4] == pytest.approx(45.0)
+
+
+def test_angle_is_not_scaled_with_lengths():
+    bend = get_shape("Bend")
+    dims = dict(zip(bend.dimensions, (1.0, 1.0, 4.0, 4.0, 45.0, 3.0)))
+    with pytest.raises(ValueError, match="on its own"):
+        solve(bend, "area", 100.0, dims, ["Bend Angle", "Bend Radius"])
+
+
+def test_cli_solves_for_an_angle(capsys):
+    bend = get_shape("Bend")
+    area = bend.surface_area(1, 1, 4, 4, 60, 3) / 2.54**2
+    argv = ["solve", "Bend", "--area", repr(area), "--vary", "Bend Angle", "--units", "in", "--area-unit", "in2"]
+    for name, value in zip(bend.dimensions, (1 / 2.54, 1 / 2.54, 4 / 2.54, 4 / 2.54, None, 3 / 2.54)):
+        if value is not None:
+            argv += ["-d", f"{name}={value!r}"]
+    args = build_parser().parse_args(argv)
+    assert args.func(args) == 0
+    row = capsys.readouterr().out.splitlines()[1].split(", ")
+    assert float(row[4]) == pytest.approx(60.0, rel=1e-5)
@@ -0,0 +1,14 @@
+import pytest
+
+from wetted_sa.store import ComponentStore
+
+
+def test_read_only_store_refuses_replace(tmp_path):
+    store = ComponentStore()
+    store.append("Tube", [1.0, 2.0])
+    store.save(tmp_path / "lib.wss")
+    with pytest.raises(ValueError, match="read-only"):
+        ComponentStore.load(tmp_path / "lib.wss").replace(0, "Tube", [3.0, 4.0])
+    store = ComponentStore.load(tmp_path / "lib.wss", mode="c")
+    store.replace(0, "Tube", [3.0, 4.0])
+    assert store[0].dims == (3.0, 4.0)
@@ -0,0 +1,14 @@
+import pytest
+
+from wetted_sa.cli import build_parser
+from wetted_sa.sweep import sweep
+
+
+@pytest.mark.parametrize("chunk_size", [0, -5])
+def test_rejects_non_positive_chunk_size(chunk_size, tmp_path):
+    with pytest.raises(ValueError, match="chunk_size"):
+        sweep("Tube", {"Diameter": [1, 2], "Length": [3, 4]}, tmp_path / "out.npy", chunk_size=chunk_size, workers=1)
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(
+            ["sweep", "Tube", "-a", "Diameter=1", "-a", "Length=1", "-o", "out.npy", "--chunk-size", str(chunk_size)]
+        )
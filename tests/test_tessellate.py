@@ -0,0 +1,61 @@
+import pytest
+
+from wetted_sa import get_shape, tessellate
+
+# Shapes whose tessellation is the exact geometry of the formula, so the
+# error falls by about 4x with each doubling of the resolution.
+SMOOTH = [
+    ("Tube", True),
+    ("3D Round Biocontainer", True),
+    ("3D Round Bottle", True),
+    ("Conical Frustrum", True),
+    ("Elbow", True),
+    ("Bend", True),
+    ("Cap", False),
+    ("Plug", False),
+]
+
+
+@pytest.mark.parametrize("name, holds_volume", SMOOTH)
+def test_smooth_shapes_converge_at_second_order(name, holds_volume):
+    rows = tessellate.verify(get_shape(name), resolutions=(32, 64, 128))
+    keys = ["area_error", "volume_error"] if holds_volume else ["area_error"]
+    for key in keys:
+        errors = [abs(row[key]) for row in rows]
+        assert 3.5 < errors[0] / errors[1] < 4.5
+        assert 3.5 < errors[1] / errors[2] < 4.5
+        assert errors[2] < 1e-3
+
+
+def test_box_is_exact():
+    row = tessellate.verify(get_shape("3D Rectangular Biocontainer"), resolutions=(8,))[0]
+    assert row["mesh_area"] == pytest.approx(row["formula_area"])
+    assert row["mesh_volume"] == pytest.approx(row["formula_volume"])
+
+
+@pytest.mark.parametrize("name", ["Tee", "Cross", "Wye", "Angled Wye"])
+def test_junction_area_settles(name):
+    rows = tessellate.verify(get_shape(name), resolutions=(64, 128))
+    assert abs(rows[1]["area_error"] - rows[0]["area_error"]) < 5e-3
+
+
+@pytest.mark.parametrize("name", ["Bend", "Angled Wye"])
+def test_survey_scales_only_lengths(monkeypatch, name):
+    shape = get_shape(name)
+    base = tessellate.DEFAULT_DIMS[name]
+    seen = []
+
+    def record(shape, dims, resolutions):
+        seen.append(list(dims))
+        return [{"area_error": 0.0, "volume_error": 0.0}]
+
+    monkeypatch.setattr(tessellate, "verify", record)
+    result = tessellate.survey(shape, samples=20, seed=1)
+    assert result["samples"] == 20
+    for dims in seen:
+        for value, default, is_length in zip(dims, base, shape.length_mask()):
+            if is_length:
+                assert 0.5 * default <= value <= 1.5 * default
+            else:
+                assert value == default
+    assert any(dims[0] != base[0] for dims in seen)
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from wetted_sa import get_shape
+from wetted_sa.tolerance import Normal, parse_spec, simulate
+
+
+def test_normal_draws_are_truncated_at_zero():
+    dist = Normal(0.5, 1.0)
+    assert dist.low == 0
+    assert dist.sample(np.random.default_rng(0), 100_000).min() >= 0
+
+
+def test_bands_below_zero_are_rejected():
+    for text in ("uniform(-1, 2)", "triangular(-1, 0, 2)", "normal(-1, 0.1)"):
+        with pytest.raises(ValueError):
+            parse_spec(text)
+    with pytest.raises(ValueError):
+        parse_spec("0.1 ± 0.5", kind="uniform")
+
+
+def test_simulate_never_sees_negative_dimensions():
+    result = simulate(get_shape("Tube"), ["0.1 ± 0.6", "10"], draws=50_000, seed=1)
+    assert result.area.worst_min >= 0 and result.volume.worst_min >= 0
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from wetted_sa import bom, get_shape, units
+
+
+@pytest.mark.parametrize(
+    "text, unit, expected",
+    [
+        ("2", "cm", 2.0),
+        ("2", "in", 5.08),
+        ("2", "mm", 0.2),
+        ("25mm", "in", 2.5),
+        ("1/4in", "mm", 0.635),
+        ("1in + 2mm", "m", 2.74),
+        ("2*ft", "cm", 60.96),
+        ("1 + 1", "ft", 60.96),
+    ],
+)
+def test_parse_length(text, unit, expected):
+    assert units.parse_length(text, unit) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["1in + 2", "2 - 1mm", "2in * 3in"])
+@pytest.mark.parametrize("unit", ["cm", "in"])
+def test_mixed_expressions_are_rejected(text, unit):
+    with pytest.raises(ValueError, match="mixes numbers"):
+        units.parse_length(text, unit)
+
+
+def test_mixed_expressions_are_rejected_in_boms():
+    columns = {"shape": ["Tube", "Tube"], "dim1": ["1", "1in + 2"], "dim2": ["10", "10"]}
+    with pytest.raises(ValueError, match="mixes numbers"):
+        bom.chunk_dimensions(columns, "mm")
+
+
+@pytest.mark.parametrize(
+    "normalize, aliases",
+    [
+        (units.length_unit, {None: "cm", "": "cm", "inch": "in", " mm ": "mm"}),
+        (units.area_unit, {None: "cm²", "in2": "in²", "M2": "m²"}),
+        (units.volume_unit, {None: "cm³", "ml": "mL", "cc": "cm³", "l": "L", "in3": "in³"}),
+    ],
+)
+def test_unit_names(normalize, aliases):
+    for alias, name in aliases.items():
+        assert normalize(alias) == name
+    with pytest.raises(ValueError, match="Unknown"):
+        normalize("furlong")
+
+
+def test_unit_tables():
+    assert units.LENGTH_UNITS["in"] ** 2 == pytest.approx(units.AREA_UNITS["in²"])
+    assert units.LENGTH_UNITS["ft"] ** 2 == pytest.approx(units.AREA_UNITS["ft²"])
+    assert units.LENGTH_UNITS["m"] ** 2 == pytest.approx(units.AREA_UNITS["m²"])
+    assert units.LENGTH_UNITS["mm"] ** 2 == pytest.approx(units.AREA_UNITS["mm²"])
+    assert units.LENGTH_UNITS["in"] ** 3 == pytest.approx(units.VOLUME_UNITS["in³"])
+    assert units.LENGTH_UNITS["m"] ** 3 == pytest.approx(units.VOLUME_UNITS["m³"])
+    assert units.VOLUME_UNITS["L"] == 1000 * units.VOLUME_UNITS["mL"]
+
+
+@pytest.mark.parametrize("text, unit, expected", [("250 mL", "L", 250), ("1.5L", "cm³", 1500), ("2", "L", 2000)])
+def test_parse_volume(text, unit, expected):
+    assert units.parse_volume(text, unit) == pytest.approx(expected)
+
+
+def test_parse_volume_rejects_lengths():
+    with pytest.raises(ValueError, match="not a volume"):
+        units.parse_volume("5 in")
+
+
+def test_compiled_evaluator_leaves_angles_in_degrees():
+    bend = get_shape("Bend")
+    evaluator = units.compiled(bend, "in", "in²", "in³")
+    assert evaluator is units.compiled(bend, "in", "in2", "in3")
+    dims = (1, 1, 4, 4, 45, 3)
+    in_cm = tuple(d * 2.54 if length else d for d, length in zip(dims, bend.length_mask()))
+    area, volume = evaluator(*dims)
+    assert area == pytest.approx(bend.surface_area(*in_cm) / 2.54**2)
+    assert volume == pytest.approx(bend.volume(*in_cm) / 2.54**3)
+    areas, volumes = evaluator.batch(np.array([dims, dims]))
+    assert areas == pytest.approx([area, area])
+    assert volumes == pytest.approx([volume, volume])
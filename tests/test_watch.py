@@ -0,0 +1,18 @@
+from wetted_sa.watch import watch
+
+
+def test_outputs_in_the_watched_directory_are_not_read_back(tmp_path):
+    (tmp_path / "line.csv").write_bytes("\ufeffassembly,shape,dim1,dim2\nA,Tube,1,10\n".encode())
+    seen = []
+    for _ in range(2):
+        watch(
+            tmp_path,
+            output_dir=tmp_path,
+            once=True,
+            results=True,
+            on_update=lambda path, *_: seen.append(path.name),
+            on_error=lambda path, error: seen.append((path.name, str(error))),
+        )
+    assert seen == ["line.csv", "line.csv"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["line.csv", "line.results.csv", "line.totals.csv"]
+    assert (tmp_path / "line.totals.csv").read_text().splitlines()[1].startswith("A,1.0,")
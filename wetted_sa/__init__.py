@@ -0,0 +1,48 @@
+"""GUI-free geometry core for the wetted surface area calculators."""
+
+from .registry import SHAPE_CLASSES, all_shapes, get_shape, load_plugins, register, shape_class
+from .shapes import (
+    SHAPES,
+    AngledWye,
+    Bend,
+    Cap,
+    ConicalFrustrum,
+    Cross,
+    Elbow,
+    Flask,
+    Plug,
+    Shape,
+    Tee,
+    ThreeDBiocontainer,
+    ThreeDRdBiocontainer,
+    ThreeDRdBottle,
+    Tube,
+    TwoDBag,
+    Wye,
+)
+
+__all__ = [
+    "SHAPES",
+    "SHAPE_CLASSES",
+    "AngledWye",
+    "Bend",
+    "Cap",
+    "ConicalFrustrum",
+    "Cross",
+    "Elbow",
+    "Flask",
+    "Plug",
+    "Shape",
+    "Tee",
+    "ThreeDBiocontainer",
+    "ThreeDRdBiocontainer",
+    "ThreeDRdBottle",
+    "Tube",
+    "TwoDBag",
+    "Wye",
+    "all_shapes",
+    "get_shape",
+    "load_plugins",
+    "register",
+    "shape_class",
+]
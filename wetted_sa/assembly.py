@@ -0,0 +1,265 @@
+"""Assemblies: trees of components whose wetted area and volume add up.
+
+An ``Assembly`` holds ``Component`` leaves (a shape, its dimensions and a
+quantity) and nested sub-assemblies. Each node caches its per-unit totals;
+changing a component clears the cache on that component and its ancestors
+only, so the next ``totals()`` call re-evaluates one formula and re-sums the
+cached values along the affected path.
+
+Assemblies load from JSON or YAML documents of the form::
+
+    name: Manifold A
+    quantity: 1
+    components:
+      - {shape: Tube, dims: [0.635, 30], quantity: 4, name: feed line}
+      - {shape: Tee, dims: {Horizontal ID: 1, Vertical ID: 1, Length: 5, Height: 5, Flange OD: 2}}
+      - name: Filter train          # anything with "components" is a sub-assembly
+        components: [...]
+      - {mesh: scans/manifold.stl, units: mm}   # measured geometry, see wetted_sa.mesh
+
+Dimension values may be numbers or expressions understood by
+``wetted_sa.expr`` (``"1/4in"``).
+"""
+
+import json
+from pathlib import Path
+
+from .expr import evaluate
+from .registry import get_shape
+
+# Below this many stale components a scalar loop beats building NumPy arrays.
+BATCH_THRESHOLD = 64
+
+
+class _Node:
+    def __init__(self, name, quantity):
+        self.name = name
+        self._quantity = float(quantity)
+        self.parent = None
+        self._unit_totals = None
+
+    @property
+    def quantity(self) -> float:
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, value) -> None:
+        self._quantity = float(value)
+        if self.parent is not None:
+            self.parent._invalidate()
+
+    def _invalidate(self) -> None:
+        node = self
+        while node is not None and node._unit_totals is not None:
+            node._unit_totals = None
+            node = node.parent
+
+    def totals(self) -> tuple[float, float]:
+        """Return ``(surface_area, volume)`` including this node's quantity."""
+        area, volume = self.unit_totals()
+        return area * self._quantity, volume * self._quantity
+
+
+class Component(_Node):
+    """A single shape with concrete dimensions."""
+
+    def __init__(self, shape, dims, quantity=1, name=None):
+        self.shape = get_shape(shape) if isinstance(shape, str) else shape
+        super().__init__(name or self.shape.name, quantity)
+        self._dims = self._coerce(dims)
+
+    def _coerce(self, dims) -> tuple[float, ...]:
+        if isinstance(dims, dict):
+            missing = [d for d in self.shape.dimensions if d not in dims]
+            if missing:
+                raise ValueError(f"{self.shape.name} is missing dimensions {missing}")
+            dims = [dims[d] for d in self.shape.dimensions]
+        if not isinstance(dims, (list, tuple)):
+            raise ValueError(f"{self.shape.name} dims must be a list or a mapping, got {type(dims).__name__}")
+        values = tuple(v if isinstance(v, float) else evaluate(str(v)) for v in dims)
+        if len(values) != len(self.shape.dimensions):
+            raise ValueError(f"{self.shape.name} expects {len(self.shape.dimensions)} dimensions, got {len(values)}")
+        return values
+
+    @property
+    def dims(self) -> tuple[float, ...]:
+        return self._dims
+
+    @dims.setter
+    def dims(self, dims) -> None:
+        self._dims = self._coerce(dims)
+        self._invalidate()
+
+    def set_dimension(self, key, value) -> None:
+        """Change one dimension, by index or by name from ``shape.dimensions``."""
+        index = self.shape.dimensions.index(key) if isinstance(key, str) else key
+        dims = list(self._dims)
+        dims[index] = value
+        self.dims = dims
+
+    def unit_totals(self) -> tuple[float, float]:
+        if self._unit_totals is None:
+            self._unit_totals = (self.shape.surface_area(*self._dims), self.shape.volume(*self._dims))
+        return self._unit_totals
+
+    def to_dict(self) -> dict:
+        data = {"shape": self.shape.name, "dims": list(self._dims)}
+        if self._quantity != 1:
+            data["quantity"] = self._quantity
+        if self.name != self.shape.name:
+            data["name"] = self.name
+        return data
+
+
+class MeshComponent(_Node):
+    """A component measured from an STL/OBJ mesh of its fluid path."""
+
+    def __init__(self, path, quantity=1, name=None, units=None, scale=None):
+        super().__init__(name or Path(path).stem, quantity)
+        self.path = str(path)
+        self.units = units
+        self.scale = scale
+
+    def unit_totals(self) -> tuple[float, float]:
+        if self._unit_totals is None:
+            from .mesh import load
+
+            self._unit_totals = load(self.path, self.scale, self.units).area_and_volume()
+        return self._unit_totals
+
+    def to_dict(self) -> dict:
+        data = {"mesh": self.path}
+        for key, value in (("units", self.units), ("scale", self.scale), ("name", self.name)):
+            if value is not None and not (key == "name" and value == Path(self.path).stem):
+                data[key] = value
+        if self._quantity != 1:
+            data["quantity"] = self._quantity
+        return data
+
+
+class Assembly(_Node):
+    """A named group of components and sub-assemblies."""
+
+    def __init__(self, name="Assembly", children=(), quantity=1):
+        super().__init__(name, quantity)
+        self.children = []
+        for child in children:
+            self.add(child)
+
+    def add(self, child):
+        """Attach ``child`` (a ``Component`` or ``Assembly``) and return it."""
+        if child.parent is not None:
+            child.parent.remove(child)
+        child.parent = self
+        self.children.append(child)
+        self._invalidate()
+        return child
+
+    def remove(self, child) -> None:
+        self.children.remove(child)
+        child.parent = None
+        self._invalidate()
+
+    def components(self):
+        """Yield every leaf (``Component`` or ``MeshComponent``), depth first."""
+        for child in self.children:
+            if isinstance(child, Assembly):
+                yield from child.components()
+            else:
+                yield child
+
+    def unit_totals(self) -> tuple[float, float]:
+        if self._unit_totals is None:
+            _prime(self._stale_components())
+            area = volume = 0.0
+            for child in self.children:
+                child_area, child_volume = child.totals()
+                area += child_area
+                volume += child_volume
+            self._unit_totals = (area, volume)
+        return self._unit_totals
+
+    def _stale_components(self) -> list:
+        stale = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                if child._unit_totals is not None:
+                    continue
+                if isinstance(child, Assembly):
+                    stack.append(child)
+                elif isinstance(child, Component):
+                    stale.append(child)
+        return stale
+
+    def to_dict(self) -> dict:
+        data = {"name": self.name, "components": [child.to_dict() for child in self.children]}
+        if self._quantity != 1:
+            data["quantity"] = self._quantity
+        return data
+
+    @classmethod
+    def from_dict(cls, data, base=None) -> "Assembly":
+        """Build an assembly from parsed JSON/YAML; malformed input raises ``ValueError``."""
+        if not isinstance(data, dict):
+            raise ValueError(f"an assembly must be a mapping, got {type(data).__name__}")
+        name = data.get("name", "Assembly")
+        items = data.get("components", [])
+        if not isinstance(items, list):
+            raise ValueError(f"{name}: 'components' must be a list")
+        children = []
+        for number, item in enumerate(items, 1):
+            if not isinstance(item, dict):
+                raise ValueError(f"{name} component {number}: expected a mapping, got {type(item).__name__}")
+            if "components" in item:
+                children.append(cls.from_dict(item, base))
+            elif "mesh" in item:
+                path = Path(base or ".") / item["mesh"]
+                children.append(
+                    MeshComponent(path, item.get("quantity", 1), item.get("name"), item.get("units"), item.get("scale"))
+                )
+            elif "shape" in item and "dims" in item:
+                children.append(Component(item["shape"], item["dims"], item.get("quantity", 1), item.get("name")))
+            else:
+                raise ValueError(f"{name} component {number}: needs 'shape' and 'dims', 'mesh' or 'components'")
+        return cls(name, children, data.get("quantity", 1))
+
+
+def _prime(components) -> None:
+    """Fill the caches of many stale components with one batch call per shape."""
+    if len(components) < BATCH_THRESHOLD:
+        return
+    import numpy as np
+
+    by_shape: dict[str, list] = {}
+    for component in components:
+        by_shape.setdefault(component.shape.name, []).append(component)
+    for group in by_shape.values():
+        dims = np.array([c._dims for c in group], dtype=float)
+        areas, volumes = group[0].shape.evaluate_batch(dims)
+        for component, area, volume in zip(group, areas.tolist(), volumes.tolist()):
+            component._unit_totals = (area, volume)
+
+
+def load(path) -> Assembly:
+    """Read an assembly from a ``.json``, ``.yaml`` or ``.yml`` file."""
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix.lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError(
+                    "PyYAML is required to read YAML assemblies. Install it with `pip install pyyaml`."
+                ) from e
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return Assembly.from_dict(data, base=path.parent)
+
+
+def save(assembly: Assembly, path) -> None:
+    """Write ``assembly`` as JSON."""
+    with open(path, "w") as f:
+        json.dump(assembly.to_dict(), f, indent=2)
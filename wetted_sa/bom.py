@@ -0,0 +1,310 @@
+"""Streaming bill-of-materials (BOM) evaluation.
+
+A BOM is a CSV or Parquet table with a ``shape`` column holding a registered
+shape name, positional dimension columns ``dim1`` … ``dimN`` in the
+order of ``Shape.dimensions``, an optional ``quantity`` column (default 1) and
+an optional ``assembly`` column used to group totals (and an optional
+``part`` column recorded in the result cache). An optional ``unit`` column
+gives the length unit of each row's bare dimension values; cells with their
+own unit (``"25mm"``) keep it. Conversions are applied as one multiplication
+per column, and results are written in the requested area and volume units.
+Rows are read, evaluated and written ``chunk_size`` at a time, so memory use
+does not grow with the length of the file.
+"""
+
+import csv
+import itertools
+import re
+from pathlib import Path
+
+import numpy as np
+
+from . import instrument
+from .expr import evaluate, has_unit
+from .registry import get_shape
+from .units import DEFAULT_AREA, DEFAULT_LENGTH, DEFAULT_VOLUME, LENGTH_UNITS, compiled, evaluate_length, length_unit
+
+DEFAULT_CHUNK_SIZE = 65536
+RESULT_COLUMNS = ["surface_area", "volume", "total_surface_area", "total_volume"]
+TOTAL_COLUMNS = ["assembly", "quantity", "surface_area", "volume"]
+
+_DIM_COLUMN = re.compile(r"dim(\d+)$")
+
+
+def _is_parquet(path) -> bool:
+    return Path(path).suffix.lower() in (".parquet", ".pq")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required to read or write Parquet files. "
+            "Install it with `pip install pyarrow`."
+        ) from e
+    return pyarrow
+
+
+def read_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yield ``{column: values}`` dicts of at most ``chunk_size`` BOM rows."""
+    for _, columns in read_located_chunks(path, chunk_size):
+        yield columns
+
+
+def read_located_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Like ``read_chunks``, but yield ``(location, columns)`` pairs.
+
+    ``location`` names the chunk's span for error messages: file lines
+    (``"lines 2-9"``) for CSV, data rows (``"rows 1-8"``) for Parquet.
+    """
+    if _is_parquet(path):
+        pa = _require_pyarrow()
+        start = 0
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield _span("row", start + 1, start + batch.num_rows), batch.to_pydict()
+            start += batch.num_rows
+        return
+    # utf-8-sig drops the byte-order mark Excel writes, which would otherwise
+    # stick to the first column name.
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        # Blank lines are skipped before chunking so they cannot end the read early.
+        rows = _numbered_rows(reader)
+        header = [name.strip() for name in next(rows, (0, []))[1]]
+        while True:
+            numbered = list(itertools.islice(rows, chunk_size))
+            if not numbered:
+                return
+            columns = itertools.zip_longest(*(row for _, row in numbered), fillvalue="")
+            # Rows shorter than the header leave its last columns blank.
+            blank = [""] * len(numbered)
+            yield _span("line", numbered[0][0], reader.line_num), {
+                name: list(values) for name, values in zip(header, itertools.chain(columns, itertools.repeat(blank)))
+            }
+
+
+def _span(noun: str, first: int, last: int) -> str:
+    return f"{noun} {first}" if first == last else f"{noun}s {first}-{last}"
+
+
+def _numbered_rows(reader):
+    """Yield ``(first line, row)`` for each non-blank CSV record."""
+    line = 1
+    for row in reader:
+        if row:
+            yield line, row
+        line = reader.line_num + 1
+
+
+def dimension_columns(columns) -> list[str]:
+    """Return the ``dimN`` column names present, ordered by ``N``."""
+    found = [(int(m.group(1)), name) for name in columns if (m := _DIM_COLUMN.match(name))]
+    return [name for _, name in sorted(found)]
+
+
+def _to_float(values, default: float, parse=evaluate) -> np.ndarray:
+    return np.array(
+        [default if v is None or v == "" else v if isinstance(v, float) else parse(str(v)) for v in values],
+        dtype=float,
+    )
+
+
+def quantities(columns, n: int) -> np.ndarray:
+    """The ``quantity`` column as floats (1 where absent or blank)."""
+    if "quantity" not in columns:
+        return np.ones(n)
+    return _to_float(columns["quantity"], 1.0)
+
+
+def _row_scales(columns, n: int, unit: str) -> np.ndarray:
+    """Per-row factor from the ``unit`` column (or ``unit``) to centimetres."""
+    default = LENGTH_UNITS[length_unit(unit)]
+    if "unit" not in columns:
+        return np.full(n, default)
+    names, inverse = np.unique(
+        np.array(["" if u is None else str(u).strip() for u in columns["unit"]]), return_inverse=True
+    )
+    factors = np.array([LENGTH_UNITS[length_unit(name)] if name else default for name in names.tolist()])
+    return factors[inverse]
+
+
+def _unit_free(values) -> np.ndarray:
+    """Mask of cells that carry no unit of their own."""
+    return np.array([not (isinstance(v, str) and has_unit(v)) for v in values], dtype=bool)
+
+
+def chunk_dimensions(columns, unit: str = DEFAULT_LENGTH) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(shape names, dims)`` for one chunk, lengths in cm.
+
+    Bare values are read in the row's ``unit`` column, falling back to
+    ``unit``; dimensions a shape lists in ``angles`` stay in degrees.
+    """
+    if "shape" not in columns:
+        raise ValueError("BOM has no 'shape' column")
+    names = np.array([str(name).strip() for name in columns["shape"]])
+    n = len(names)
+    dim_keys = dimension_columns(columns)
+    dims = np.zeros((n, len(dim_keys)))
+    for j, key in enumerate(dim_keys):
+        dims[:, j] = _to_float(columns[key], 0.0, evaluate_length)
+    scales = _row_scales(columns, n, unit)
+    if (scales != 1.0).any():
+        unique, inverse = np.unique(names, return_inverse=True)
+        lengths = np.ones((len(unique), len(dim_keys)), dtype=bool)
+        for code, name in enumerate(unique.tolist()):
+            mask = get_shape(name).length_mask()[: len(dim_keys)]
+            lengths[code, : len(mask)] = mask
+        for j, key in enumerate(dim_keys):
+            dims[:, j] *= np.where(_unit_free(columns[key]) & lengths[inverse, j], scales, 1.0)
+    return names, dims
+
+
+def evaluate_chunk(
+    columns, cache=None, unit: str = DEFAULT_LENGTH, area_unit: str = DEFAULT_AREA, volume_unit: str = DEFAULT_VOLUME
+) -> dict[str, np.ndarray]:
+    """Evaluate one chunk of BOM columns, grouping rows by shape.
+
+    Bare dimension values are read in the row's ``unit`` column, falling back
+    to ``unit``; results are in ``area_unit`` and ``volume_unit``. With a
+    ``ResultCache``, rows seen before are read from it and new rows are
+    stored in it (always in cm² and cm³).
+    """
+    names, dims = chunk_dimensions(columns, unit)
+    n = len(names)
+    quantity = quantities(columns, n)
+
+    area = np.empty(n)
+    volume = np.empty(n)
+    unique, inverse = np.unique(names, return_inverse=True)
+    for code, name in enumerate(unique.tolist()):
+        shape = get_shape(name)
+        k = len(shape.dimensions)
+        if k > dims.shape[1]:
+            raise ValueError(f"{name} needs {k} dimension columns (dim1 … dim{k})")
+        rows = np.flatnonzero(inverse == code)
+        evaluator = compiled(shape, DEFAULT_LENGTH, area_unit, volume_unit)
+        if cache is not None:
+            parts = [columns["part"][i] for i in rows] if "part" in columns else None
+            results = cache.compute_many(shape, dims[rows, :k].tolist(), parts)
+            area[rows], volume[rows] = evaluator.convert_results(*np.array(results).reshape(-1, 2).T)
+        else:
+            area[rows], volume[rows] = evaluator.batch(dims[rows, :k])
+    return {
+        "surface_area": area,
+        "volume": volume,
+        "total_surface_area": area * quantity,
+        "total_volume": volume * quantity,
+    }
+
+
+class _CSVWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._header = None
+
+    def write(self, columns) -> None:
+        if self._header is None:
+            self._header = list(columns)
+            self._writer.writerow(self._header)
+        values = [_as_list(columns[name]) for name in self._header]
+        self._writer.writerows(zip(*values))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path):
+        self._pa = _require_pyarrow()
+        self._path = path
+        self._writer = None
+
+    def write(self, columns) -> None:
+        table = self._pa.Table.from_pydict(dict(columns))
+        if self._writer is None:
+            self._writer = self._pa.parquet.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _as_list(values):
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
+
+def open_writer(path):
+    """Return a chunk writer for ``path``, Parquet or CSV by extension."""
+    return _ParquetWriter(path) if _is_parquet(path) else _CSVWriter(path)
+
+
+def accumulate_totals(totals: dict, columns, results) -> None:
+    """Add one evaluated chunk to ``totals``, keyed by assembly name."""
+    n = len(results["surface_area"])
+    assemblies = columns.get("assembly") or [""] * n
+    keys, inverse = np.unique(
+        np.array(["" if a is None else str(a).strip() for a in assemblies]), return_inverse=True
+    )
+    sums = np.stack(
+        [
+            np.bincount(inverse, weights=quantities(columns, n), minlength=len(keys)),
+            np.bincount(inverse, weights=results["total_surface_area"], minlength=len(keys)),
+            np.bincount(inverse, weights=results["total_volume"], minlength=len(keys)),
+        ],
+        axis=1,
+    )
+    for key, row in zip(keys.tolist(), sums):
+        if key in totals:
+            totals[key] += row
+        else:
+            totals[key] = row.copy()
+
+
+def run_batch(
+    source,
+    destination,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache=None,
+    unit: str = DEFAULT_LENGTH,
+    area_unit: str = DEFAULT_AREA,
+    volume_unit: str = DEFAULT_VOLUME,
+) -> dict:
+    """Stream ``source`` into ``destination`` and return per-assembly totals.
+
+    Totals map each assembly name (``""`` when there is no ``assembly``
+    column) to ``[quantity, surface_area, volume]`` in the requested units.
+    """
+    totals: dict[str, np.ndarray] = {}
+    writer = open_writer(destination)
+    chunks = read_located_chunks(source, chunk_size)
+    try:
+        while True:
+            with instrument.timed("bom.read"):
+                location, columns = next(chunks, (None, None))
+            if columns is None:
+                break
+            try:
+                with instrument.timed("bom.evaluate"):
+                    results = evaluate_chunk(columns, cache, unit, area_unit, volume_unit)
+            except ValueError as e:
+                raise ValueError(f"{location}: {e}") from e
+            with instrument.timed("bom.write"):
+                writer.write({**columns, **results})
+            accumulate_totals(totals, columns, results)
+            instrument.count("bom_rows", len(results["surface_area"]))
+    finally:
+        writer.close()
+    return totals
+
+
+def write_totals(totals: dict, path) -> None:
+    """Write per-assembly totals as CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(TOTAL_COLUMNS)
+        for name in sorted(totals):
+            writer.writerow([name, *totals[name].tolist()])
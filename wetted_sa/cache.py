@@ -0,0 +1,270 @@
+"""Persistent SQLite cache of computed areas and volumes.
+
+Rows are keyed by shape name, a formula version and the canonicalized
+dimension values, and may carry a part number for lookups by part. The
+formula version is a hash of the bytecode and constants of the shape's
+``surface_area`` and ``volume``, of the module-level constants and helper
+functions they use, and of its dimension names, so editing a formula
+invalidates that shape's rows automatically (stale rows are deleted
+the first time the shape is used in a process). The least recently used
+rows are evicted once the cache holds more than ``max_entries``.
+
+The default file is ``$WETTED_SA_CACHE`` or
+``$XDG_CACHE_HOME/wetted_sa/results.sqlite3``.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from . import instrument
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+# Dimensions are rounded to this many significant digits so that 0.25*2.54
+# and 0.635 share an entry.
+SIGNIFICANT_DIGITS = 12
+# Look-ups per SELECT in compute_many; stays under SQLite's parameter limit.
+_LOOKUP_CHUNK = 500
+
+_versions: dict[type, str] = {}
+
+
+def default_path() -> Path:
+    if env := os.environ.get("WETTED_SA_CACHE"):
+        return Path(env)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "wetted_sa" / "results.sqlite3"
+
+
+_CONSTANT_TYPES = (int, float, complex, str, bytes, tuple, frozenset)
+
+
+def _code_fingerprint(code, digest, namespace, seen) -> None:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _code_fingerprint(const, digest, namespace, seen)
+        else:
+            digest.update(repr(const).encode())
+    # Module constants (``_WYE_SIN``) and helpers (``trig``) the formula
+    # reaches by name are part of it too.
+    for name in code.co_names:
+        value = namespace.get(name)
+        if isinstance(value, _CONSTANT_TYPES):
+            digest.update(f"{name}={value!r}".encode())
+            continue
+        function = getattr(value, "__wrapped__", value)
+        if (
+            hasattr(function, "__code__")
+            and getattr(function, "__module__", None) == namespace.get("__name__")
+            and function.__code__ not in seen
+        ):
+            seen.add(function.__code__)
+            _code_fingerprint(function.__code__, digest, function.__globals__, seen)
+
+
+def formula_version(shape) -> str:
+    """Return a short hash that changes whenever ``shape``'s formulas change."""
+    cls = type(shape)
+    version = _versions.get(cls)
+    if version is None:
+        digest = hashlib.sha1(repr(list(shape.dimensions)).encode())
+        digest.update(str(getattr(cls, "formula_version", "")).encode())
+        seen: set = set()
+        for method in (cls.surface_area, cls.volume):
+            _code_fingerprint(method.__code__, digest, method.__globals__, seen)
+        version = _versions[cls] = digest.hexdigest()[:16]
+    return version
+
+
+def canonical_dims(dims) -> str:
+    return ",".join(f"{float(v):.{SIGNIFICANT_DIGITS}g}" for v in dims)
+
+
+class ResultCache:
+    """SQLite-backed cache shared by the GUIs, the service and batch jobs."""
+
+    def __init__(self, path=None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path) if path is not None else default_path()
+        self.max_entries = max_entries
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._validated: set[str] = set()
+        self._clock = 0
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " shape TEXT NOT NULL, version TEXT NOT NULL, dims TEXT NOT NULL, part TEXT,"
+                " surface_area REAL NOT NULL, volume REAL NOT NULL, last_used INTEGER NOT NULL,"
+                " PRIMARY KEY (shape, version, dims))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_part ON results(part)")
+            self._clock = self._db.execute("SELECT COALESCE(MAX(last_used), 0) FROM results").fetchone()[0]
+            self._count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _version(self, shape) -> str:
+        version = formula_version(shape)
+        if shape.name not in self._validated:
+            cursor = self._db.execute(
+                "DELETE FROM results WHERE shape = ? AND version != ?", (shape.name, version)
+            )
+            self._count -= max(cursor.rowcount, 0)
+            self._validated.add(shape.name)
+        return version
+
+    def get(self, shape, dims) -> tuple[float, float] | None:
+        """Return cached ``(surface_area, volume)`` or ``None``."""
+        key = canonical_dims(dims)
+        with self._lock:
+            version = self._version(shape)
+            row = self._db.execute(
+                "SELECT surface_area, volume FROM results WHERE shape = ? AND version = ? AND dims = ?",
+                (shape.name, version, key),
+            ).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE results SET last_used = ? WHERE shape = ? AND version = ? AND dims = ?",
+                    (self._tick(), shape.name, version, key),
+                )
+        return row
+
+    def get_part(self, part: str):
+        """Return ``(shape_name, dims, surface_area, volume)`` last stored for ``part``."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT shape, version, dims, surface_area, volume FROM results"
+                " WHERE part = ? ORDER BY last_used DESC LIMIT 1",
+                (part,),
+            ).fetchone()
+        if row is None:
+            return None
+        from .registry import get_shape
+
+        shape_name, version, dims, area, volume = row
+        try:
+            if formula_version(get_shape(shape_name)) != version:
+                return None
+        except ValueError:
+            return None
+        return shape_name, tuple(float(v) for v in dims.split(",")), area, volume
+
+    def put(self, shape, dims, surface_area: float, volume: float, part: str | None = None) -> None:
+        self.put_many(shape, [dims], [surface_area], [volume], [part])
+
+    def put_many(self, shape, rows, areas, volumes, parts=None) -> None:
+        parts = parts if parts is not None else [None] * len(rows)
+        with self._lock:
+            version = self._version(shape)
+            records = [
+                (shape.name, version, canonical_dims(dims), part, float(area), float(volume), self._tick())
+                for dims, area, volume, part in zip(rows, areas, volumes, parts)
+            ]
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO results (shape, version, dims, part, surface_area, volume, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (shape, version, dims) DO UPDATE SET"
+                " part = COALESCE(excluded.part, part), last_used = excluded.last_used",
+                records,
+            )
+            self._db.execute("COMMIT")
+            # Upper bound: some records may have updated existing rows.
+            self._count += len(records)
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        self._count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if self._count <= self.max_entries:
+            return
+        # Trim to 90% so eviction is not triggered by every insert.
+        target = int(self.max_entries * 0.9)
+        self._db.execute(
+            "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY last_used LIMIT ?)",
+            (self._count - target,),
+        )
+        self._count = target
+
+    def compute(self, shape, dims, part: str | None = None) -> tuple[float, float]:
+        """Return cached results for ``dims``, computing and storing them on a miss."""
+        cached = self.get(shape, dims)
+        if cached is not None:
+            instrument.count("cache_hits", 1, shape.name)
+            return cached
+        instrument.count("cache_misses", 1, shape.name)
+        area, volume = float(shape.surface_area(*dims)), float(shape.volume(*dims))
+        self.put(shape, dims, area, volume, part)
+        return area, volume
+
+    def compute_many(self, shape, rows, parts=None) -> list[tuple[float, float]]:
+        """Batch form of ``compute``: one lookup per 500 rows, misses evaluated together."""
+        keys = [canonical_dims(dims) for dims in rows]
+        found: dict[str, tuple[float, float]] = {}
+        with self._lock:
+            version = self._version(shape)
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = sorted(set(keys[start:start + _LOOKUP_CHUNK]))
+                marks = ",".join("?" * len(chunk))
+                for key, area, volume in self._db.execute(
+                    f"SELECT dims, surface_area, volume FROM results"
+                    f" WHERE shape = ? AND version = ? AND dims IN ({marks})",
+                    (shape.name, version, *chunk),
+                ):
+                    found[key] = (area, volume)
+            if found:
+                tick = self._tick()
+                self._db.executemany(
+                    "UPDATE results SET last_used = ? WHERE shape = ? AND version = ? AND dims = ?",
+                    [(tick, shape.name, version, key) for key in found],
+                )
+        missing = [i for i, key in enumerate(keys) if key not in found]
+        instrument.count("cache_hits", len(keys) - len(missing), shape.name)
+        instrument.count("cache_misses", len(missing), shape.name)
+        if missing:
+            import numpy as np
+
+            miss_rows = [rows[i] for i in missing]
+            areas, volumes = shape.evaluate_batch(np.array(miss_rows, dtype=float).reshape(len(missing), -1))
+            miss_parts = [parts[i] for i in missing] if parts is not None else None
+            self.put_many(shape, miss_rows, areas.tolist(), volumes.tolist(), miss_parts)
+            for i, area, volume in zip(missing, areas.tolist(), volumes.tolist()):
+                found[keys[i]] = (area, volume)
+        return [found[key] for key in keys]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._count = 0
+
+
+def open_default(max_entries: int = DEFAULT_MAX_ENTRIES) -> ResultCache | None:
+    """Open the default cache, or return ``None`` if it cannot be created."""
+    try:
+        return ResultCache(max_entries=max_entries)
+    except (OSError, sqlite3.Error):
+        return None
@@ -0,0 +1,338 @@
+"""Reverse lookup: find catalog rows by wetted area, volume or SA/V.
+
+A ``CatalogIndex`` is built from a ``ComponentStore``. Each row's area
+(cm²), volume (cm³) and SA/V (cm²/cm³) are computed once. For each of the
+three keys the index keeps the values in sorted order, plus the permutation
+back to the entries. A fourth sorted key is a grid cell over (log area,
+log volume), ``GRID`` cells per doubling, for queries on both at once. A
+range query binary-searches every constrained key (and the grid rows
+crossing the box), takes the candidates from the narrowest span and filters
+them on the other keys, so the cost follows the number of near matches
+rather than the catalog size. Nearest-neighbour queries on area and volume
+search grid boxes of growing relative radius until ``k`` entries lie within
+the radius. Single-key queries scan outward from the target's position in
+that key's sorted order and stop once the remaining entries are further
+away than the k-th best.
+
+Rows added later go to a small unsorted delta that queries scan directly.
+Once it exceeds ``MERGE_FRACTION`` of the index, it is sorted and merged in
+with ``searchsorted``/``insert`` (linear in the index size, no full re-sort).
+``update(store)`` indexes rows appended to the store since the last call.
+``save``/``load`` use the store's memory-mapped column format. A saved index
+records the store file's size and mtime and a content hash of the rows it
+covers; ``open`` updates it while those rows are unchanged and rebuilds it
+when they were edited in place.
+"""
+
+import os
+
+import numpy as np
+
+from .store import read_columns, write_columns
+
+KEYS = ("area", "volume", "ratio")
+MAGIC = b"WSAINDEX"
+FORMAT_VERSION = 2
+GRID = 16  # grid cells per doubling of area or volume
+_LOG_LIMIT = 128  # log2 values are clipped to ±this for the grid
+_STRIDE = 2 * _LOG_LIMIT * GRID + 1
+_SORTED = KEYS + ("cell",)
+# The delta is merged once it holds this fraction of the sorted entries (or MIN_MERGE rows).
+MERGE_FRACTION = 1 / 16
+MIN_MERGE = 65536
+_BLOCK = 64
+
+
+def _ratio(area, volume):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return area / volume
+
+
+def _coord(x) -> np.ndarray:
+    """Monotone grid coordinate of ``x``: non-positive values first, NaN last."""
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.where(x > 0, np.log2(x), -_LOG_LIMIT)
+    logs = np.where(np.isnan(x), _LOG_LIMIT, np.clip(logs, -_LOG_LIMIT, _LOG_LIMIT))
+    return np.floor(logs * GRID).astype(np.int64) + _LOG_LIMIT * GRID
+
+
+def _cell(area, volume) -> np.ndarray:
+    return _coord(area) * _STRIDE + _coord(volume)
+
+
+def _gather(order: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Concatenate ``order[start:stop]`` for each span without a Python loop."""
+    lengths = stops - starts
+    total = int(lengths.sum())
+    if not total:
+        return order[:0]
+    shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return order[np.arange(total) + shift]
+
+
+def _bounds(value):
+    """``(low, high)`` from ``None``, a number (exact match) or a pair with ``None`` for open ends."""
+    if value is None:
+        return None
+    if np.ndim(value) == 0:
+        return float(value), float(value)
+    low, high = value
+    return -np.inf if low is None else float(low), np.inf if high is None else float(high)
+
+
+class CatalogIndex:
+    """Sorted-array index over area, volume and SA/V of store rows."""
+
+    def __init__(self):
+        self.covered = 0  # store rows indexed so far
+        # Store file (size, mtime_ns) and ``ComponentStore.fingerprint`` of the covered rows, when saved.
+        self.source: list[int] | None = None
+        self.fingerprint: str | None = None
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._values = {"area": np.zeros(0), "volume": np.zeros(0)}
+        self._sorted = {key: np.zeros(0) for key in KEYS}
+        self._sorted["cell"] = np.zeros(0, dtype=np.int64)
+        self._order = {key: np.zeros(0, dtype=np.int64) for key in _SORTED}
+        self._delta: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._delta_size = 0
+
+    def __len__(self) -> int:
+        return len(self._rows) + self._delta_size
+
+    @classmethod
+    def build(cls, store):
+        """Index every row of ``store``."""
+        index = cls()
+        index.update(store)
+        return index
+
+    def update(self, store) -> int:
+        """Index rows appended to ``store`` since the last update; return how many."""
+        start, stop = self.covered, len(store)
+        if stop < start:
+            raise ValueError(f"store has {stop} rows but {start} are indexed; rebuild the index")
+        if stop > start:
+            area, volume = store.evaluate(start=start, stop=stop)
+            self.add(np.arange(start, stop), area, volume)
+        self.covered = stop
+        return stop - start
+
+    def add(self, rows, area, volume) -> None:
+        """Add entries for store ``rows`` with the given areas (cm²) and volumes (cm³)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        self._delta.append((rows, np.asarray(area, dtype=float), np.asarray(volume, dtype=float)))
+        self._delta_size += len(rows)
+        if self._delta_size > max(MIN_MERGE, MERGE_FRACTION * len(self._rows)):
+            self.merge()
+
+    def merge(self) -> None:
+        """Fold the delta into the sorted arrays."""
+        if not self._delta:
+            return
+        rows, area, volume = (np.concatenate(parts) for parts in zip(*self._delta))
+        offset = len(self._rows)
+        delta_values = {"area": area, "volume": volume, "ratio": _ratio(area, volume), "cell": _cell(area, volume)}
+        for key in _SORTED:
+            order = np.argsort(delta_values[key], kind="stable")
+            values = delta_values[key][order]
+            at = np.searchsorted(self._sorted[key], values, side="right")
+            self._sorted[key] = np.insert(self._sorted[key], at, values)
+            self._order[key] = np.insert(self._order[key], at, order + offset)
+        self._rows = np.concatenate([self._rows, rows])
+        self._values = {key: np.concatenate([self._values[key], delta_values[key]]) for key in ("area", "volume")}
+        self._delta, self._delta_size = [], 0
+
+    def _value(self, key: str, entries) -> np.ndarray:
+        if key == "ratio":
+            return _ratio(self._values["area"][entries], self._values["volume"][entries])
+        return self._values[key][entries]
+
+    def _grid_spans(self, area: tuple, volume: tuple):
+        """Spans of the cell order covering the ``area`` × ``volume`` box."""
+        rows = np.arange(_coord(area[0]), _coord(area[1]) + 1) * _STRIDE
+        cells = self._sorted["cell"]
+        low, high = _coord(volume[0]), _coord(volume[1])
+        return np.searchsorted(cells, rows + low, side="left"), np.searchsorted(cells, rows + high, side="right")
+
+    def _delta_arrays(self):
+        if not self._delta:
+            return None
+        if len(self._delta) > 1:
+            self._delta = [tuple(np.concatenate(parts) for parts in zip(*self._delta))]
+        rows, area, volume = self._delta[0]
+        return rows, {"area": area, "volume": volume, "ratio": _ratio(area, volume)}
+
+    def range(self, area=None, volume=None, ratio=None) -> np.ndarray:
+        """Store rows whose values fall in every given ``(low, high)`` range (inclusive), ascending.
+
+        Units are cm², cm³ and cm²/cm³; ``None`` leaves a key or an end open.
+        """
+        limits = {key: b for key, b in zip(KEYS, map(_bounds, (area, volume, ratio))) if b is not None}
+        if not limits:
+            raise ValueError("give at least one of area, volume or ratio")
+        spans = {
+            key: (
+                np.searchsorted(self._sorted[key], low, side="left"),
+                np.searchsorted(self._sorted[key], high, side="right"),
+            )
+            for key, (low, high) in limits.items()
+        }
+        narrowest = min(spans, key=lambda key: spans[key][1] - spans[key][0])
+        start, stop = spans[narrowest]
+        entries = self._order[narrowest][start:stop]
+        if "area" in limits and "volume" in limits:
+            starts, stops = self._grid_spans(limits["area"], limits["volume"])
+            if (stops - starts).sum() < stop - start:
+                narrowest = None
+                entries = _gather(self._order["cell"], starts, stops)
+        for key, (low, high) in limits.items():
+            if key != narrowest and len(entries):
+                values = self._value(key, entries)
+                entries = entries[(values >= low) & (values <= high)]
+        found = self._rows[entries]
+        delta = self._delta_arrays()
+        if delta is not None:
+            rows, values = delta
+            keep = np.ones(len(rows), dtype=bool)
+            for key, (low, high) in limits.items():
+                keep &= (values[key] >= low) & (values[key] <= high)
+            found = np.concatenate([found, rows[keep]])
+        return np.sort(found)
+
+    def nearest(self, k: int = 1, area=None, volume=None, ratio=None) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(rows, distances)`` of the ``k`` entries closest to the given targets.
+
+        Distance is the Euclidean norm of the relative differences, e.g.
+        ``hypot((a - area) / area, (v - volume) / volume)``; a zero target
+        uses absolute differences. Results are nearest first.
+        """
+        targets = {key: float(t) for key, t in zip(KEYS, (area, volume, ratio)) if t is not None}
+        if not targets:
+            raise ValueError("give at least one of area, volume or ratio")
+        scales = {key: abs(t) if t else 1.0 for key, t in targets.items()}
+
+        def distance(values: dict) -> np.ndarray:
+            total = sum(((values[key] - t) / scales[key]) ** 2 for key, t in targets.items())
+            return np.where(np.isnan(total), np.inf, np.sqrt(total))
+
+        best_rows, best = np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        def keep(rows, dist):
+            nonlocal best_rows, best
+            rows, dist = np.concatenate([best_rows, rows]), np.concatenate([best, dist])
+            if len(dist) > k:
+                top = np.argpartition(dist, k - 1)[:k]
+                rows, dist = rows[top], dist[top]
+            best_rows, best = rows, dist
+
+        delta = self._delta_arrays()
+        if "area" in targets and "volume" in targets:
+            return self._nearest_grid(k, targets, scales, distance, delta)
+        if delta is not None:
+            keep(delta[0], distance(delta[1]))
+
+        key = next(iter(targets))
+        ordered, order = self._sorted[key], self._order[key]
+        target, scale = targets[key], scales[key]
+        finite = int(np.searchsorted(ordered, np.inf, side="right"))  # NaN sorts last
+        low = high = int(np.searchsorted(ordered, target))
+        block = _BLOCK
+        while low > 0 or high < finite:
+            bound = best.max() if len(best) == k else np.inf
+            left = low > 0 and abs(ordered[low - 1] - target) / scale <= bound
+            right = high < finite and abs(ordered[high] - target) / scale <= bound
+            if not (left or right):
+                break
+            pieces = []
+            if left:
+                pieces.append(order[max(0, low - block):low])
+                low = max(0, low - block)
+            if right:
+                pieces.append(order[high:min(finite, high + block)])
+                high = min(finite, high + block)
+            entries = np.concatenate(pieces)
+            keep(self._rows[entries], distance({key: self._value(key, entries) for key in targets}))
+            block *= 2
+        order = np.argsort(best, kind="stable")
+        return best_rows[order], best[order]
+
+    def _nearest_grid(self, k, targets, scales, distance, delta):
+        # Every entry within relative distance ``radius`` lies in the grid box
+        # of that radius. Grow the box until it holds k finite candidates; the
+        # k-th of those bounds the answer, so one box of that radius is exact.
+        extra = (delta[0], distance(delta[1])) if delta is not None else None
+
+        def candidates(radius):
+            box = {key: (targets[key] - radius * scales[key], targets[key] + radius * scales[key]) for key in ("area", "volume")}
+            entries = _gather(self._order["cell"], *self._grid_spans(box["area"], box["volume"]))
+            rows, dist = self._rows[entries], distance({key: self._value(key, entries) for key in targets})
+            if extra is not None:
+                rows, dist = np.concatenate([rows, extra[0]]), np.concatenate([dist, extra[1]])
+            return rows, dist, len(entries) == len(self._rows)
+
+        radius = 1 / GRID
+        for _ in range(200):
+            rows, dist, everything = candidates(radius)
+            finite = np.count_nonzero(np.isfinite(dist))
+            if everything or finite >= k:
+                break
+            radius *= 2
+        if finite >= k and not everything:
+            kth = np.partition(dist, k - 1)[k - 1]
+            if kth > radius:
+                rows, dist, _ = candidates(kth)
+        order = np.argsort(dist, kind="stable")[:k]
+        return rows[order], dist[order]
+
+    def save(self, path) -> None:
+        """Write the index (after merging the delta) for ``load``."""
+        self.merge()
+        columns = [("rows", self._rows), ("area", self._values["area"]), ("volume", self._values["volume"])]
+        for key in _SORTED:
+            columns += [(f"{key}_sorted", self._sorted[key]), (f"{key}_order", self._order[key])]
+        header = {"version": FORMAT_VERSION, "covered": self.covered}
+        write_columns(path, MAGIC, {**header, "source": self.source, "fingerprint": self.fingerprint}, columns)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a saved index; later ``add``/``update`` calls copy what they merge into."""
+        header, maps = read_columns(path, MAGIC, "catalog index")
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} has unsupported index format {header.get('version')!r}")
+        index = cls()
+        index.covered = header["covered"]
+        index.source, index.fingerprint = header["source"], header["fingerprint"]
+        index._rows = maps["rows"]
+        index._values = {"area": maps["area"], "volume": maps["volume"]}
+        index._sorted = {key: maps[f"{key}_sorted"] for key in _SORTED}
+        index._order = {key: maps[f"{key}_order"] for key in _SORTED}
+        return index
+
+    @classmethod
+    def open(cls, path, store, store_path, rebuild: bool = False):
+        """Return the index saved at ``path`` for ``store`` (saved at ``store_path``), brought up to date.
+
+        The saved index is reused when the store file is unchanged, or when
+        only rows were appended (its covered rows still hash the same); any
+        other change, a missing or older-format index or ``rebuild`` builds
+        a new one. An updated or rebuilt index is saved back to ``path``.
+        """
+        stat = os.stat(store_path)
+        source = [stat.st_size, stat.st_mtime_ns]
+        index = None
+        if not rebuild and os.path.exists(path):
+            try:
+                index = cls.load(path)
+            except ValueError:
+                index = None
+        if index is not None and index.source != source:
+            if index.covered > len(store) or store.fingerprint(index.covered) != index.fingerprint:
+                index = None
+        if index is None:
+            index = cls.build(store)
+        elif not index.update(store) and index.source == source:
+            return index
+        index.source, index.fingerprint = source, store.fingerprint(index.covered)
+        index.save(path)
+        return index
@@ -0,0 +1,496 @@
+"""Command-line entry point: ``python -m wetted_sa <command> ...``."""
+
+import argparse
+import sys
+
+# Subcommand modules are imported inside their handlers so that startup only
+# pays for what the chosen command uses.
+
+
+def _open_cache(path):
+    if path is None:
+        return None
+    from .cache import ResultCache
+
+    return ResultCache(None if path == "default" else path)
+
+
+def _int_at_least(minimum: int):
+    """argparse ``type`` for integers of at least ``minimum``."""
+
+    def parse(text: str) -> int:
+        value = int(text)
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {value}")
+        return value
+
+    parse.__name__ = "integer"
+    return parse
+
+
+def _add_unit_options(parser) -> None:
+    parser.add_argument("--units", default="cm", help="unit of bare dimension values: in, ft, mm, cm, m (default cm)")
+    parser.add_argument("--area-unit", default="cm²", help="cm², mm², in², ft² or m² (ASCII cm2 … m2 also work)")
+    parser.add_argument("--volume-unit", default="cm³", help="cm³, mL, L, in³ or m³ (cm3, ml, l … also work)")
+
+
+def _normalize_units(args) -> None:
+    from . import units
+
+    args.units = units.length_unit(args.units)
+    args.area_unit = units.area_unit(args.area_unit)
+    args.volume_unit = units.volume_unit(args.volume_unit)
+
+
+def _cmd_batch(args) -> int:
+    from . import bom
+
+    _normalize_units(args)
+    cache = _open_cache(args.cache)
+    totals = bom.run_batch(
+        args.source,
+        args.output,
+        chunk_size=args.chunk_size or bom.DEFAULT_CHUNK_SIZE,
+        cache=cache,
+        unit=args.units,
+        area_unit=args.area_unit,
+        volume_unit=args.volume_unit,
+    )
+    if args.totals:
+        bom.write_totals(totals, args.totals)
+    else:
+        for name in sorted(totals):
+            quantity, area, volume = totals[name]
+            print(f"{name or '(all)'}: {quantity:g} parts, {area:,.2f} {args.area_unit}, {volume:,.2f} {args.volume_unit}")
+    return 0
+
+
+def _cmd_watch(args) -> int:
+    from .watch import watch
+
+    _normalize_units(args)
+
+    def report(path, bom, recomputed, seconds) -> None:
+        print(f"{path.name}: {len(bom):,} rows, {recomputed:,} recomputed in {seconds:.3f} s", flush=True)
+        for name, (quantity, area, volume) in sorted(bom.totals.items()):
+            print(f"  {name or '(all)'}: {quantity:g} parts, {area:,.2f} {args.area_unit}, {volume:,.2f} {args.volume_unit}")
+
+    try:
+        watch(
+            args.directory,
+            args.output_dir,
+            pattern=args.pattern,
+            interval=args.interval,
+            once=args.once,
+            results=args.results,
+            on_update=report,
+            cache=_open_cache(args.cache),
+            unit=args.units,
+            area_unit=args.area_unit,
+            volume_unit=args.volume_unit,
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _print_tree(node, depth, max_depth) -> None:
+    from .assembly import Assembly
+
+    area, volume = node.totals()
+    print(f"{'  ' * depth}{node.name} x{node.quantity:g}: {area:,.2f} cm², {volume:,.2f} cm³")
+    if isinstance(node, Assembly) and depth < max_depth:
+        for child in node.children:
+            _print_tree(child, depth + 1, max_depth)
+
+
+def _cmd_assembly(args) -> int:
+    from .assembly import load
+
+    _print_tree(load(args.source), 0, args.depth)
+    return 0
+
+
+def _cmd_tolerance(args) -> int:
+    from .registry import get_shape
+    from .tolerance import format_result, simulate
+
+    _normalize_units(args)
+    result = simulate(
+        get_shape(args.shape), args.dims, draws=args.draws, seed=args.seed, kind=args.kind, unit=args.units
+    )
+    print(format_result(result, args.area_unit, args.volume_unit))
+    return 0
+
+
+def _cmd_sweep(args) -> int:
+    from .registry import get_shape
+    from .sweep import parse_axis, sweep
+
+    axes = {}
+    for item in args.axis:
+        name, sep, spec = item.partition("=")
+        if not sep:
+            raise ValueError(f"Axis {item!r} must look like 'Dimension=spec'")
+        axes[name.strip()] = parse_axis(spec)
+    total = sweep(get_shape(args.shape), axes, args.output, chunk_size=args.chunk_size, workers=args.workers)
+    print(f"Wrote {total:,} points to {args.output}")
+    return 0
+
+
+def _cmd_serve(args) -> int:
+    from .service import run
+
+    run(args.host, args.port, _open_cache(args.cache))
+    return 0
+
+
+def _cmd_cache(args) -> int:
+    cache = _open_cache(args.path)
+    if args.clear:
+        cache.clear()
+    if args.part:
+        found = cache.get_part(args.part)
+        if found is None:
+            print(f"{args.part}: not cached")
+            return 1
+        shape, dims, area, volume = found
+        print(f"{args.part}: {shape} {list(dims)} -> {area:,.2f} cm², {volume:,.2f} cm³")
+    print(f"{len(cache):,} cached results in {cache.path}")
+    return 0
+
+
+def _cmd_mesh(args) -> int:
+    from .mesh import load
+
+    for path in args.paths:
+        mesh = load(path, scale=args.scale, units=args.units)
+        area, volume = mesh.area_and_volume()
+        print(f"{path}: {len(mesh):,} triangles, {area:,.2f} cm², {volume:,.2f} cm³")
+    return 0
+
+
+def _cmd_verify(args) -> int:
+    from .expr import evaluate
+    from .registry import all_shapes, get_shape
+    from .tessellate import DEFAULT_DIMS, format_report, survey, verify
+
+    resolutions = [int(r) for r in args.resolutions.split(",")]
+    shapes = [get_shape(args.shape)] if args.shape else all_shapes()
+    if args.dims and not args.shape:
+        raise ValueError("give a shape name before its dimensions")
+    for shape in shapes:
+        dims = [evaluate(d) for d in args.dims] if args.dims else list(DEFAULT_DIMS.get(shape.name, ()))
+        if shape.name not in DEFAULT_DIMS and not args.dims:
+            print(f"{shape.name}: no default dimensions; skipped")
+            continue
+        print(format_report(shape, dims, verify(shape, dims, resolutions)))
+        if args.survey:
+            stats = survey(shape, args.survey, resolutions[-1], seed=args.seed)
+            print(
+                f"  survey of {stats['samples']} dimension sets at n={resolutions[-1]}:"
+                f" area error mean {stats['area_error_mean']:+.3%}, worst {stats['area_error_max']:+.3%};"
+                f" volume error mean {stats['volume_error_mean']:+.3%}, worst {stats['volume_error_max']:+.3%}"
+            )
+    if args.stl:
+        from .mesh import save_stl
+
+        if len(shapes) != 1:
+            raise ValueError("--stl needs a single shape")
+        save_stl(args.stl, shapes[0].tessellate(*dims, resolution=resolutions[-1]).triangles)
+        print(f"Wrote {args.stl}")
+    return 0
+
+
+def _cmd_solve(args) -> int:
+    import numpy as np
+
+    from . import units
+    from .registry import get_shape
+    from .solve import solve
+
+    _normalize_units(args)
+    shape = get_shape(args.shape)
+    dims = {}
+    for item in args.dims:
+        name, sep, text = item.partition("=")
+        if not sep:
+            raise ValueError(f"Dimension {item!r} must look like 'Name=value'")
+        name = name.strip()
+        dims[name] = units.parse_length(text, "cm" if name in shape.angles else args.units)
+    target, values = next((t, v) for t in ("area", "volume", "ratio") if (v := getattr(args, t)) is not None)
+    factor = {
+        "area": units.AREA_UNITS[args.area_unit],
+        "volume": units.VOLUME_UNITS[args.volume_unit],
+        "ratio": units.AREA_UNITS[args.area_unit] / units.VOLUME_UNITS[args.volume_unit],
+    }[target]
+    values = np.array([float(v) for v in values.split(",")]) * factor
+    if len(args.vary) == 1:
+        dims.setdefault(args.vary[0], 1.0)
+    missing = [d for d in shape.dimensions if d not in dims]
+    if missing:
+        raise ValueError(f"give values for {missing} with -d 'Name=value'")
+    lengths = np.array(shape.length_mask())
+    rows = solve(shape, target, values, dims, args.vary) / np.where(lengths, units.LENGTH_UNITS[args.units], 1.0)
+    print(", ".join(f"{name} [{args.units if is_length else '°'}]" for name, is_length in zip(shape.dimensions, lengths)))
+    for row in rows:
+        print(", ".join("no solution" if np.isnan(v) else f"{v:.6g}" for v in row))
+    return 0
+
+
+def _cmd_report(args) -> int:
+    from . import bom
+    from .report import generate
+
+    _normalize_units(args)
+    data = generate(
+        args.source,
+        args.output,
+        chunk_size=args.chunk_size or bom.DEFAULT_CHUNK_SIZE,
+        top=args.top,
+        fill_volume=args.fill_volume,
+        cache=_open_cache(args.cache),
+        unit=args.units,
+        area_unit=args.area_unit,
+        volume_unit=args.volume_unit,
+        title=args.title,
+    )
+    _, _, area, _, fill, ratio = data.summary_rows(args.fill_volume)[-1]
+    print(
+        f"{data.lines:,} lines: {area:,.2f} {args.area_unit} over {fill:,.2f} {args.volume_unit} fill, "
+        f"SA/V {ratio:.4g} {args.area_unit}/{args.volume_unit}"
+    )
+    return 0
+
+
+def _cmd_store(args) -> int:
+    import numpy as np
+
+    from .store import ComponentStore
+
+    if str(args.source).endswith(".wss"):
+        store = ComponentStore.load(args.source)
+    else:
+        store = ComponentStore.from_bom(args.source, unit=args.units, dtype="float32" if args.float32 else "float64")
+    if args.output:
+        store.save(args.output)
+    print(f"{len(store):,} rows, {len(store.shapes)} shapes, {store.nbytes / 1e6:,.1f} MB")
+    if args.evaluate:
+        areas, volumes = store.evaluate()
+        counts = np.bincount(store.shape_ids, minlength=len(store.shapes))
+        area_sums = np.bincount(store.shape_ids, weights=areas, minlength=len(store.shapes))
+        volume_sums = np.bincount(store.shape_ids, weights=volumes, minlength=len(store.shapes))
+        for name, n, area, volume in zip(store.shapes, counts, area_sums, volume_sums):
+            print(f"{name}: {n:,} rows, {area:,.2f} cm², {volume:,.2f} cm³")
+    return 0
+
+
+def _span(text: str, factor: float):
+    low, sep, high = text.partition(":")
+    if not sep:
+        raise ValueError(f"range {text!r} must look like LO:HI (either end may be empty)")
+    return tuple(float(v) * factor if v.strip() else None for v in (low, high))
+
+
+def _cmd_find(args) -> int:
+    import os
+
+    from . import units
+    from .catalog import KEYS, CatalogIndex
+    from .store import ComponentStore
+
+    _normalize_units(args)
+    store = ComponentStore.load(args.store)
+    path = args.index or os.path.splitext(args.store)[0] + ".wsi"
+    index = CatalogIndex.open(path, store, args.store, rebuild=args.rebuild)
+    factors = {
+        "area": units.AREA_UNITS[args.area_unit],
+        "volume": units.VOLUME_UNITS[args.volume_unit],
+        "ratio": units.AREA_UNITS[args.area_unit] / units.VOLUME_UNITS[args.volume_unit],
+    }
+    given = {key: getattr(args, key) for key in KEYS if getattr(args, key) is not None}
+    if not given:
+        raise ValueError("give at least one of --area, --volume or --ratio")
+    if args.near:
+        rows, distances = index.nearest(args.near, **{key: float(v) * factors[key] for key, v in given.items()})
+        print(f"{len(rows)} nearest of {len(index):,} entries")
+    else:
+        rows = index.range(**{key: _span(v, factors[key]) for key, v in given.items()})
+        distances = None
+        print(f"{len(rows):,} of {len(index):,} entries match" + (f"; first {args.limit}" if len(rows) > args.limit else ""))
+        rows = rows[: args.limit]
+    length = units.LENGTH_UNITS[args.units]
+    for i, row in enumerate(rows.tolist()):
+        item = store[row]
+        shape = item.shape
+        dims = ", ".join(
+            f"{name}={value / length:g} {args.units}" if is_length else f"{name}={value:g}°"
+            for name, value, is_length in zip(shape.dimensions, item.dims, shape.length_mask())
+        )
+        area, volume = item.surface_area() / factors["area"], item.volume() / factors["volume"]
+        note = f" (distance {distances[i]:.3g})" if distances is not None else ""
+        print(f"{row}: {shape.name}: {dims}: {area:,.4g} {args.area_unit}, {volume:,.4g} {args.volume_unit}{note}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="wetted_sa", description="Headless wetted surface area calculator.")
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="wetted_sa.cli",
+        metavar="MODULE",
+        help="report import-time breakdown for MODULE (default: this CLI) and exit",
+    )
+    parser.add_argument("--startup-budget", type=float, metavar="MS", help="fail --profile-startup above MS")
+    parser.add_argument("--metrics", metavar="PATH", help="write stage timings and counters (.json, or .prom text)")
+    parser.add_argument("--trace", metavar="PATH", help="write timed spans as a Chrome trace JSON file")
+    parser.add_argument("--profile", metavar="PATH", help="run under cProfile; pstats data, or a listing for .txt")
+    commands = parser.add_subparsers(dest="command")
+
+    batch = commands.add_parser("batch", help="evaluate a CSV/Parquet bill of materials")
+    batch.add_argument("source", help="BOM with shape, dim1..dimN, [quantity], [assembly], [unit] columns")
+    batch.add_argument("-o", "--output", required=True, help="per-row results (.csv or .parquet)")
+    batch.add_argument("-t", "--totals", help="write per-assembly totals CSV here instead of stdout")
+    batch.add_argument("--chunk-size", type=_int_at_least(1), help="rows per chunk (default 65536)")
+    batch.add_argument("--cache", nargs="?", const="default", metavar="PATH", help="use the persistent result cache")
+    _add_unit_options(batch)
+    batch.set_defaults(func=_cmd_batch)
+
+    watch = commands.add_parser("watch", help="keep results for a directory of CSV BOMs current as files change")
+    watch.add_argument("directory", help="directory the BOM exports land in")
+    watch.add_argument("-o", "--output-dir", help="where NAME.totals.csv (and NAME.results.csv) go (default DIRECTORY/results)")
+    watch.add_argument("--pattern", default="*.csv", help="BOM file glob within DIRECTORY (default *.csv)")
+    watch.add_argument("--interval", type=float, default=0.25, help="seconds between directory polls (default 0.25)")
+    watch.add_argument("--once", action="store_true", help="process the directory once and exit")
+    watch.add_argument("--results", action="store_true", help="also write per-row NAME.results.csv files")
+    watch.add_argument("--cache", nargs="?", const="default", metavar="PATH", help="use the persistent result cache")
+    _add_unit_options(watch)
+    watch.set_defaults(func=_cmd_watch)
+
+    assembly = commands.add_parser("assembly", help="total an assembly described in JSON/YAML")
+    assembly.add_argument("source", help="assembly .json, .yaml or .yml file")
+    assembly.add_argument("--depth", type=int, default=1, help="levels of the tree to print (default 1)")
+    assembly.set_defaults(func=_cmd_assembly)
+
+    tolerance = commands.add_parser("tolerance", help="Monte Carlo area/volume spread for toleranced dimensions")
+    tolerance.add_argument("shape", help="shape name, e.g. Tee")
+    tolerance.add_argument("dims", nargs="+", help='one per dimension: "2.54", "1in ± 0.01in", "uniform(1, 1.1)"')
+    tolerance.add_argument("-n", "--draws", type=int, default=1_000_000, help="number of draws (default 1,000,000)")
+    tolerance.add_argument("--seed", type=int, help="random seed for reproducible results")
+    tolerance.add_argument("--kind", choices=["normal", "uniform"], default="normal", help="meaning of ± bands")
+    _add_unit_options(tolerance)
+    tolerance.set_defaults(func=_cmd_tolerance)
+
+    sweep = commands.add_parser("sweep", help="evaluate a shape over a grid of dimensions")
+    sweep.add_argument("shape", help="shape name, e.g. Tube")
+    sweep.add_argument(
+        "-a",
+        "--axis",
+        action="append",
+        required=True,
+        help='"Dimension=value", "Dimension=v1,v2,..." or "Dimension=start:stop:count"; one per dimension',
+    )
+    sweep.add_argument("-o", "--output", required=True, help="results file (.npy memory map or .parquet)")
+    sweep.add_argument("--chunk-size", type=_int_at_least(1), default=1_000_000, help="grid points per task")
+    sweep.add_argument("-j", "--workers", type=_int_at_least(1), help="worker processes (default: CPU count)")
+    sweep.set_defaults(func=_cmd_sweep)
+
+    serve = commands.add_parser("serve", help="run the HTTP/JSON calculation service")
+    serve.add_argument("--host", default="127.0.0.1", help="interface to bind (default 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="port to listen on (default 8765)")
+    serve.add_argument("--cache", nargs="?", const="default", metavar="PATH", help="use the persistent result cache")
+    serve.set_defaults(func=_cmd_serve)
+
+    mesh = commands.add_parser("mesh", help="wetted area and volume of STL/OBJ fluid-path meshes")
+    mesh.add_argument("paths", nargs="+", help=".stl or .obj files")
+    mesh_units = mesh.add_mutually_exclusive_group()
+    mesh_units.add_argument("--units", help="mesh coordinate unit (mm, cm, m, in, ft)")
+    mesh_units.add_argument("--scale", type=float, help="multiply coordinates by this to get cm")
+    mesh.set_defaults(func=_cmd_mesh)
+
+    solve = commands.add_parser("solve", help="find the dimension(s) that give a target area, volume or SA/V")
+    solve.add_argument("shape", help="shape name, e.g. Tube")
+    solve.add_argument(
+        "-d", "--dim", dest="dims", action="append", default=[], help='"Name=value"; for several --vary, sets proportions'
+    )
+    goal = solve.add_mutually_exclusive_group(required=True)
+    goal.add_argument("--area", help="target area (comma-separated for several)")
+    goal.add_argument("--volume", help="target volume (comma-separated for several)")
+    goal.add_argument("--ratio", help="target area/volume in area-unit per volume-unit")
+    solve.add_argument("--vary", action="append", required=True, help="dimension to solve for; repeat to scale several")
+    _add_unit_options(solve)
+    solve.set_defaults(func=_cmd_solve)
+
+    report = commands.add_parser("report", help="SA/V extractables report for a BOM with optional fill volumes")
+    report.add_argument("source", help="BOM as for batch, plus an optional fill_volume column (in --volume-unit)")
+    report.add_argument(
+        "-o",
+        "--output",
+        action="append",
+        required=True,
+        help=".csv (plus NAME.summary.csv and NAME.top.csv), .html or .pdf; repeat for several",
+    )
+    report.add_argument("--top", type=_int_at_least(0), default=20, help="largest area contributors to rank (default 20)")
+    report.add_argument("--fill-volume", type=float, help="total fill volume for the overall SA/V (in --volume-unit)")
+    report.add_argument("--title", help="report title")
+    report.add_argument("--chunk-size", type=_int_at_least(1), help="rows per chunk (default 65536)")
+    report.add_argument("--cache", nargs="?", const="default", metavar="PATH", help="use the persistent result cache")
+    _add_unit_options(report)
+    report.set_defaults(func=_cmd_report)
+
+    store = commands.add_parser("store", help="convert a BOM to a memory-mappable columnar store (.wss)")
+    store.add_argument("source", help="BOM (.csv/.parquet) to convert, or an existing .wss store")
+    store.add_argument("-o", "--output", help="write the store here (.wss)")
+    store.add_argument("--float32", action="store_true", help="store dimensions as float32 to halve the size")
+    store.add_argument("--units", default="cm", help="unit of bare dimension values (default cm)")
+    store.add_argument("--evaluate", action="store_true", help="print per-shape area and volume totals")
+    store.set_defaults(func=_cmd_store)
+
+    find = commands.add_parser("find", help="search a .wss store by area, volume or SA/V range, or nearest match")
+    find.add_argument("store", help="component store (.wss)")
+    find.add_argument("--index", help="catalog index file (default: the store path with .wsi)")
+    find.add_argument("--rebuild", action="store_true", help="rebuild the index instead of updating it")
+    find.add_argument("--area", metavar="LO:HI", help="area range, or target with --near")
+    find.add_argument("--volume", metavar="LO:HI", help="volume range, or target with --near")
+    find.add_argument("--ratio", metavar="LO:HI", help="SA/V range in area-unit/volume-unit, or target with --near")
+    find.add_argument("--near", type=int, metavar="K", help="list the K entries nearest the given values instead")
+    find.add_argument("--limit", type=_int_at_least(1), default=20, help="rows to print for a range search (default 20)")
+    _add_unit_options(find)
+    find.set_defaults(func=_cmd_find)
+
+    verify = commands.add_parser("verify", help="check the formulas against tessellated meshes of each shape")
+    verify.add_argument("shape", nargs="?", help="shape name (default: every shape at sample dimensions)")
+    verify.add_argument("dims", nargs="*", help="one value or expression per dimension")
+    verify.add_argument("-r", "--resolutions", default="16,32,64,128,256", help="segments per circumference, comma separated")
+    verify.add_argument("--survey", type=int, metavar="N", help="also report errors over N random dimension sets")
+    verify.add_argument("--seed", type=int, help="random seed for --survey")
+    verify.add_argument("--stl", metavar="PATH", help="write the finest mesh as binary STL")
+    verify.set_defaults(func=_cmd_verify)
+
+    cache = commands.add_parser("cache", help="inspect or clear the persistent result cache")
+    cache.add_argument("--path", default="default", help="cache file (default: per-user cache)")
+    cache.add_argument("--part", help="show the cached result for a part number")
+    cache.add_argument("--clear", action="store_true", help="delete every cached result")
+    cache.set_defaults(func=_cmd_cache)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.profile_startup:
+        from .startup import report
+
+        return report(args.profile_startup, args.startup_budget)
+    if args.command is None:
+        parser.error("a command is required")
+    if args.metrics or args.trace or args.profile:
+        from . import instrument
+
+        instrument.enable(args.metrics, args.trace, args.profile)
+    try:
+        return args.func(args)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,155 @@
+"""Safe, cached evaluation of dimension expressions such as ``0.25*2.54``.
+
+Only arithmetic is accepted: numbers, ``+ - * / % **`` (``^`` is read as a
+power, as SymPy does), parentheses, ``pi``, a few ``math`` functions and the
+unit constants in ``UNITS``. A unit may also trail a number or a closing
+parenthesis, so ``0.25in``, ``(1/4) in`` and ``12mm`` all work. Results are
+in centimetres, the unit the shape formulas report in.
+
+The parsed tree is walked by a whitelist evaluator and never executed, so
+expressions from BOMs, assembly files or the GUIs cannot reach names,
+attributes or builtins. Anything outside the subset is a ``ValueError``.
+"""
+
+import ast
+import functools
+import math
+import operator
+import re
+
+from . import instrument
+
+# Longer or more deeply nested input is rejected before it can exhaust the
+# parser or the recursive evaluator; real dimension expressions are short.
+MAX_LENGTH = 1000
+MAX_DEPTH = 200
+
+UNITS = {
+    "in": 2.54,
+    "inch": 2.54,
+    "ft": 30.48,
+    "mm": 0.1,
+    "cm": 1.0,
+    "m": 100.0,
+}
+
+CONSTANTS = {"pi": math.pi, **{name: factor for name, factor in UNITS.items() if name != "in"}}
+
+FUNCTIONS = {
+    "abs": abs,
+    "sqrt": math.sqrt,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "radians": math.radians,
+    "log": math.log,
+    "exp": math.exp,
+}
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+_UNIT_WORD = re.compile(r"(?<![A-Za-z_])(" + "|".join(UNITS) + r")(?![A-Za-z_])")
+
+_UNIT_SUFFIX = re.compile(r"(?<=[\d.)])\s*(" + "|".join(sorted(UNITS, key=len, reverse=True)) + r")\b")
+
+
+def _rewrite(text: str, unit_scale: float = 1.0) -> str:
+    text = _UNIT_SUFFIX.sub(lambda m: f"*{UNITS[m.group(1)] * unit_scale!r}", text)
+    return text.replace("^", "**")
+
+
+def _eval(node, names=CONSTANTS) -> float:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return float(node.value)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+        return _BINARY[type(node.op)](_eval(node.left, names), _eval(node.right, names))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        return _UNARY[type(node.op)](_eval(node.operand, names))
+    if isinstance(node, ast.Name) and node.id in names:
+        return names[node.id]
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and not node.keywords
+    ):
+        return float(FUNCTIONS[node.func.id](*(_eval(arg, names) for arg in node.args)))
+    raise ValueError(f"{type(node).__name__} is not allowed")
+
+
+def _depth(node) -> int:
+    deepest, stack = 0, [(node, 1)]
+    while stack:
+        node, depth = stack.pop()
+        deepest = max(deepest, depth)
+        stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+    return deepest
+
+
+@functools.lru_cache(maxsize=4096)
+def evaluate(text: str) -> float:
+    """Return the value of a dimension expression.
+
+    Raises ``ValueError`` for anything that is not a finite arithmetic
+    expression. Repeated texts are served from an LRU cache.
+    """
+    with instrument.timed("parse"):
+        try:
+            value = float(text)
+        except ValueError:
+            value = _evaluate(text)
+        if not math.isfinite(value):
+            raise ValueError(f"Expression {text!r} is not a finite number")
+    return value
+
+
+def _evaluate(text: str, unit_scale: float = 1.0) -> float:
+    """Parse and evaluate ``text`` with every unit factor multiplied by ``unit_scale``."""
+    if len(text) > MAX_LENGTH:
+        raise ValueError(f"Expression is too long ({len(text):,} characters, at most {MAX_LENGTH})")
+    names = CONSTANTS
+    if unit_scale != 1.0:
+        names = {**CONSTANTS, **{name: factor * unit_scale for name, factor in UNITS.items() if name in CONSTANTS}}
+    try:
+        tree = ast.parse(_rewrite(text.strip(), unit_scale), mode="eval")
+        if _depth(tree) > MAX_DEPTH:
+            raise ValueError(f"nested more than {MAX_DEPTH} levels deep")
+        return _eval(tree.body, names)
+    except (RecursionError, MemoryError) as e:
+        raise ValueError(f"Expression {text!r} is too complex") from e
+    except (ArithmeticError, TypeError) as e:
+        raise ValueError(f"Cannot evaluate {text!r}: {e}") from e
+    except (SyntaxError, ValueError) as e:
+        raise ValueError(f"Invalid expression {text!r}: {e}") from e
+
+
+@functools.lru_cache(maxsize=4096)
+def has_unit(text: str) -> bool:
+    """Return True if ``text`` names a unit (``"25mm"``, ``"1/4 in"``, ``"2*ft"``)."""
+    return _UNIT_WORD.search(text) is not None
+
+
+@functools.lru_cache(maxsize=4096)
+def is_length(text: str) -> bool:
+    """Return True if ``text`` is a length: every term carries a unit.
+
+    ``"1in + 2mm"`` and ``"(1/4) in"`` are lengths. ``"1in + 2"`` is not, as
+    the bare ``2`` has no unit, and neither is ``"2in * 3in"`` (an area). The
+    test doubles every unit factor and checks that the value doubles too.
+    """
+    if not has_unit(text):
+        return False
+    value = evaluate(text)
+    return math.isclose(_evaluate(text, 2.0), 2 * value, rel_tol=1e-9, abs_tol=1e-12)
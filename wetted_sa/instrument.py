@@ -0,0 +1,317 @@
+"""Counters, timing histograms and opt-in profiling for the calculation paths.
+
+Instrumentation is off by default. ``timed`` then returns a shared no-op
+context manager and ``count`` returns at once, so the hooks left in the hot
+paths cost a function call and a flag check. It is switched on by
+``enable()``, by the CLI's ``--metrics``/``--trace``/``--profile`` options,
+or by these environment variables, which also work for the GUIs and the
+HTTP service without code changes:
+
+``WETTED_SA_METRICS=PATH``
+    counters and per-stage, per-shape timing histograms, written at exit as
+    JSON, or as Prometheus text when PATH ends in ``.prom`` or ``.txt``.
+``WETTED_SA_TRACE=PATH``
+    every timed span as a Chrome trace (open in Perfetto or
+    ``chrome://tracing``); the most recent ``TRACE_LIMIT`` spans are kept.
+``WETTED_SA_PROFILE=PATH``
+    a cProfile of the thread that switched instrumentation on (the main
+    thread, for the CLI and the environment variables): ``pstats`` data, or
+    a text listing sorted by cumulative time when PATH ends in ``.txt``.
+    Work in other threads, such as the HTTP service's executor or the GUI
+    workers, is not in the profile; the timings and counters cover every
+    thread.
+
+Stages recorded by the package: ``parse`` (dimension expressions),
+``evaluate`` (batched formulas),
+``compute`` (single GUI/cache evaluations), ``simulate`` (tolerance Monte
+Carlo), ``kernel.build``, ``bom.read``/``bom.evaluate``/``bom.write``,
+``watch.update`` (incremental BOM refresh), ``request`` (HTTP service) and
+``gui.redraw``.
+"""
+
+import atexit
+import bisect
+import os
+import threading
+import time
+from collections import deque
+
+# Histogram bucket upper bounds in seconds (1-2.5-5 steps from 1 µs to 10 s).
+BUCKETS = tuple(float(f"{m}e{e}") for e in range(-6, 1) for m in (1, 2.5, 5)) + (10.0,)
+TRACE_LIMIT = 200_000
+PROMETHEUS_PREFIX = "wetted_sa"
+
+_enabled = False
+
+
+class Histogram:
+    """Bucketed durations with their count, sum and maximum."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (``max`` for the last one)."""
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], self.buckets)),
+        }
+
+
+class Registry:
+    """Thread-safe store of counters and histograms keyed by ``(name, shape)``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: dict[tuple[str, str], float] = {}
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+        self.trace: deque | None = None
+        self._origin = time.perf_counter()
+
+    def count(self, name: str, value: float = 1, shape: str = "") -> None:
+        key = (name, shape)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, stage: str, seconds: float, shape: str = "", start: float | None = None) -> None:
+        key = (stage, shape)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+            if self.trace is not None and start is not None:
+                self.trace.append((stage, shape, start - self._origin, seconds, threading.get_ident()))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            if self.trace is not None:
+                self.trace.clear()
+
+    def snapshot(self) -> dict:
+        """Counters and histograms as plain JSON-ready data."""
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "shape": shape, "value": value}
+                    for (name, shape), value in sorted(self.counters.items())
+                ],
+                "stages": [
+                    {"stage": stage, "shape": shape, **histogram.as_dict()}
+                    for (stage, shape), histogram in sorted(self.histograms.items())
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+
+        def labels(**values) -> str:
+            parts = [f'{k}="{_escape(v)}"' for k, v in values.items() if v != ""]
+            return "{" + ",".join(parts) + "}" if parts else ""
+
+        seconds = f"{PROMETHEUS_PREFIX}_stage_seconds"
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.counters}):
+                metric = f"{PROMETHEUS_PREFIX}_{_metric_name(name)}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (key, shape), value in sorted(self.counters.items()):
+                    if key == name:
+                        lines.append(f"{metric}{labels(shape=shape)} {value:g}")
+            if self.histograms:
+                lines.append(f"# HELP {seconds} Time spent per calculation stage.")
+                lines.append(f"# TYPE {seconds} histogram")
+            for (stage, shape), histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, n in zip([*map(repr, BUCKETS), "+Inf"], histogram.buckets):
+                    cumulative += n
+                    lines.append(f"{seconds}_bucket{labels(stage=stage, shape=shape, le=bound)} {cumulative}")
+                lines.append(f"{seconds}_sum{labels(stage=stage, shape=shape)} {histogram.total!r}")
+                lines.append(f"{seconds}_count{labels(stage=stage, shape=shape)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def trace_events(self) -> dict:
+        """Recorded spans in the Chrome trace event format."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.trace or ())
+        events = [
+            {
+                "name": stage,
+                "cat": shape or "wetted_sa",
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": seconds * 1e6,
+                "pid": pid,
+                "tid": tid,
+                **({"args": {"shape": shape}} if shape else {}),
+            }
+            for stage, shape, start, seconds, tid in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _metric_name(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+REGISTRY = Registry()
+
+
+class _Timer:
+    __slots__ = ("stage", "shape", "start")
+
+    def __init__(self, stage: str, shape: str):
+        self.stage = stage
+        self.shape = shape
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter()
+        REGISTRY.observe(self.stage, end - self.start, self.shape, self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def timed(stage: str, shape: str = ""):
+    """Context manager recording the duration of ``stage`` (optionally per shape)."""
+    return _Timer(stage, shape) if _enabled else _NULL_TIMER
+
+
+def count(name: str, value: float = 1, shape: str = "") -> None:
+    """Add ``value`` to counter ``name`` (optionally per shape)."""
+    if _enabled:
+        REGISTRY.count(name, value, shape)
+
+
+def export(path) -> None:
+    """Write the metrics to ``path``: Prometheus text for ``.prom``/``.txt``, else JSON."""
+    import json
+
+    path = os.fspath(path)
+    if path.endswith((".prom", ".txt")):
+        text = REGISTRY.to_prometheus()
+    else:
+        text = json.dumps(REGISTRY.snapshot(), indent=2)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def export_trace(path) -> None:
+    """Write the recorded spans as a Chrome trace JSON file."""
+    import json
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(REGISTRY.trace_events(), f)
+
+
+def _write_profile(profiler, path) -> None:
+    profiler.disable()
+    path = os.fspath(path)
+    if path.endswith(".txt"):
+        import pstats
+
+        with open(path, "w", encoding="utf-8") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(60)
+    else:
+        profiler.dump_stats(path)
+
+
+def _at_exit(action, *args) -> None:
+    def run() -> None:
+        try:
+            action(*args)
+        except OSError as e:
+            import sys
+
+            print(f"wetted_sa.instrument: could not write {args[-1]}: {e}", file=sys.stderr)
+
+    atexit.register(run)
+
+
+def enable(metrics=None, trace=None, profile=None) -> None:
+    """Start recording; any given paths are written when the process exits.
+
+    ``trace`` keeps the last ``TRACE_LIMIT`` spans for ``export_trace`` and
+    ``profile`` runs cProfile in the calling thread until exit.
+    """
+    global _enabled
+    _enabled = True
+    if metrics:
+        _at_exit(export, metrics)
+    if trace:
+        if REGISTRY.trace is None:
+            REGISTRY.trace = deque(maxlen=TRACE_LIMIT)
+        _at_exit(export_trace, trace)
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        _at_exit(_write_profile, profiler, profile)
+
+
+def disable() -> None:
+    """Stop recording; collected metrics are kept until ``REGISTRY.reset()``."""
+    global _enabled
+    _enabled = False
+
+
+def _configure_from_env() -> None:
+    metrics = os.environ.get("WETTED_SA_METRICS")
+    trace = os.environ.get("WETTED_SA_TRACE")
+    profile = os.environ.get("WETTED_SA_PROFILE")
+    if metrics or trace or profile:
+        enable(metrics, trace, profile)
+
+
+_configure_from_env()
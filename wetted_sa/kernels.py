@@ -0,0 +1,178 @@
+"""Fused area-and-volume kernels generated from the shape formulas.
+
+Each shape's ``surface_area`` and ``volume`` are called once with SymPy
+symbols in place of the dimensions. The formulas only apply ``math`` to
+constants, so the calls return symbolic expressions and the existing
+formulas stay the single definition of each shape. The two expressions
+then go through one common-subexpression elimination pass, so intermediates
+such as the Wye ``tusk_length`` or the slant height of a frustum are
+computed once for both results. Constants are folded. The expressions are
+also tried factored and in Horner form, and the variant with the fewest
+operations is printed as straight-line NumPy code and compiled.
+
+The generated source is stored next to the result cache under a name that
+includes ``cache.formula_version``. SymPy is therefore imported only the
+first time a formula is seen, and an edited formula gets a new kernel.
+The cache directory is user-writable, so a stored file is treated as data:
+before it is compiled its syntax tree must be exactly the straight-line
+arithmetic this module prints (assignments, operators, numbers and the
+NumPy functions below); anything else is discarded and regenerated.
+Shapes whose formulas cannot be traced (for example a plugin calling
+``math.sqrt`` on a dimension) and environments without SymPy get ``None``,
+and callers fall back to the element-wise formulas; the reason is logged.
+"""
+
+import ast
+import logging
+import os
+from pathlib import Path
+
+from . import instrument
+from .cache import default_path, formula_version
+
+# Bump when the generated code changes shape, to ignore older files.
+KERNEL_FORMAT = 1
+
+_kernels: dict[type, object] = {}
+_log = logging.getLogger(__name__)
+
+# Names a kernel may call; ``_compile`` binds them.
+_FUNCTIONS = ("sqrt", "sin", "cos", "tan", "abs", "sind", "cosd")
+_NODES = (
+    ast.Module, ast.FunctionDef, ast.arguments, ast.arg, ast.Assign, ast.Return, ast.Tuple,
+    ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Constant, ast.Load, ast.Store,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd,
+)
+
+
+def kernel_dir() -> Path:
+    return default_path().parent / "kernels"
+
+
+def _horner(expr):
+    import sympy
+
+    try:
+        return sympy.horner(expr) if expr.free_symbols else expr
+    except sympy.PolynomialError:  # not a polynomial, e.g. a frustum slant height
+        return expr
+
+
+def _factor_terms(expr):
+    import sympy
+
+    return sympy.factor_terms(expr)
+
+
+# Candidate forms, in order of preference on ties; each pulls constants and
+# shared factors out differently, which changes the number of array passes.
+_REWRITES = (_factor_terms, _horner, lambda expr: expr)
+
+
+def _cost(reduced) -> int:
+    import sympy
+
+    replacements, outputs = reduced
+    return sum(sympy.count_ops(expr) for _, expr in replacements) + sum(sympy.count_ops(e) for e in outputs)
+
+
+def generate_source(shape) -> str:
+    """Return Python source defining ``kernel(*dims) -> (area, volume)``."""
+    import sympy
+    from sympy.printing.numpy import NumPyPrinter
+
+    class _Printer(NumPyPrinter):
+        def _print_Float(self, expr):
+            return repr(float(expr))
+
+        _print_Rational = _print_Float
+
+    symbols = sympy.symbols(f"d0:{len(shape.dimensions)}", positive=True)
+    traced = [sympy.sympify(shape.surface_area(*symbols)), sympy.sympify(shape.volume(*symbols))]
+    replacements, (area, volume) = min(
+        (sympy.cse([rewrite(e) for e in traced], symbols=sympy.numbered_symbols("t")) for rewrite in _REWRITES),
+        key=_cost,
+    )
+    printer = _Printer({"fully_qualified_modules": False, "inline": True, "allow_unknown_functions": True})
+    lines = [
+        f"# {shape.name}: generated by wetted_sa.kernels from {type(shape).__qualname__}",
+        f"def kernel({', '.join(map(str, symbols))}):",
+    ]
+    lines += [f"    {name} = {printer.doprint(expr)}" for name, expr in replacements]
+    lines.append(f"    return {printer.doprint(area)}, {printer.doprint(volume)}")
+    return "\n".join(lines) + "\n"
+
+
+def check_source(source: str, filename: str = "<kernel>") -> None:
+    """Raise ``ValueError`` unless ``source`` is a kernel as ``generate_source`` prints it."""
+    tree = ast.parse(source, filename)
+    if len(tree.body) != 1 or not isinstance(tree.body[0], ast.FunctionDef) or tree.body[0].name != "kernel":
+        raise ValueError(f"{filename}: not a single kernel function")
+    function = tree.body[0]
+    known = {"pi", *_FUNCTIONS, *(a.arg for a in function.args.args)}
+    if function.decorator_list or function.returns or not isinstance(function.body[-1], ast.Return):
+        raise ValueError(f"{filename}: unexpected kernel structure")
+    for statement in function.body[:-1]:
+        if not isinstance(statement, ast.Assign) or [type(t) for t in statement.targets] != [ast.Name]:
+            raise ValueError(f"{filename}: line {statement.lineno} is not a plain assignment")
+    for node in ast.walk(tree):
+        if not isinstance(node, _NODES):
+            raise ValueError(f"{filename}: line {getattr(node, 'lineno', '?')}: {type(node).__name__} not allowed")
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError(f"{filename}: line {node.lineno}: constant {node.value!r} not allowed")
+        if isinstance(node, ast.Call) and (
+            node.keywords or not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS
+        ):
+            raise ValueError(f"{filename}: line {node.lineno}: call not allowed")
+    for statement in function.body[:-1]:
+        known.add(statement.targets[0].id)
+    for node in ast.walk(function):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id not in known:
+            raise ValueError(f"{filename}: line {node.lineno}: unknown name {node.id!r}")
+
+
+def _compile(source: str, filename: str):
+    import numpy
+
+    from .shapes import cosd, sind
+
+    check_source(source, filename)
+    namespace = {name: getattr(numpy, name) for name in ("sqrt", "sin", "cos", "tan", "pi", "abs")}
+    # Degree-based trig from the angled fittings, served from cached tables.
+    namespace.update(sind=sind, cosd=cosd, __builtins__={})
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace["kernel"]
+
+
+def _load_or_generate(shape):
+    name = f"{type(shape).__name__}-{formula_version(shape)}-{KERNEL_FORMAT}.py"
+    path = kernel_dir() / name
+    try:
+        return _compile(path.read_text(), str(path))
+    except FileNotFoundError:
+        pass
+    except (OSError, SyntaxError, ValueError) as e:
+        _log.warning("ignoring cached kernel %s: %s", path, e)
+    with instrument.timed("kernel.build", shape.name):
+        source = generate_source(shape)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(source)
+        tmp.replace(path)
+    except OSError:
+        pass
+    return _compile(source, str(path))
+
+
+def kernel(shape):
+    """Return the fused kernel for ``shape``, or ``None`` if it cannot be built."""
+    cls = type(shape)
+    if cls not in _kernels:
+        try:
+            _kernels[cls] = _load_or_generate(shape)
+        # Missing SymPy, formulas that reject symbols, printer gaps.
+        except (ImportError, TypeError, ValueError, AttributeError, NotImplementedError, ArithmeticError) as e:
+            _log.info("no fused kernel for %s, using the element-wise formulas: %s", shape.name, e)
+            _kernels[cls] = None
+    return _kernels[cls]
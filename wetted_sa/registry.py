@@ -0,0 +1,83 @@
+"""Registry of shape classes, keyed by display name.
+
+Built-in shapes register themselves with the ``@register`` decorator in
+``wetted_sa.shapes``. Third-party packages can add shapes by declaring an
+entry point in the ``wetted_sa.shapes`` group that points at a ``Shape``
+subclass (or at a module whose classes use ``@register``)::
+
+    [project.entry-points."wetted_sa.shapes"]
+    bellows = "mypkg.shapes:Bellows"
+
+Shapes are stateless, so each class is instantiated once at registration and
+that instance is shared by every lookup.
+"""
+
+import warnings
+
+ENTRY_POINT_GROUP = "wetted_sa.shapes"
+
+SHAPE_CLASSES: dict[str, type] = {}
+_INSTANCES: dict[str, object] = {}
+_plugins_loaded = False
+
+
+def register(cls):
+    """Class decorator adding ``cls`` to the registry under its ``name``."""
+    instance = cls()
+    existing = SHAPE_CLASSES.get(instance.name)
+    if existing is not None and existing is not cls:
+        raise ValueError(f"Shape {instance.name!r} is already registered by {existing.__qualname__}")
+    SHAPE_CLASSES[instance.name] = cls
+    _INSTANCES[instance.name] = instance
+    return cls
+
+
+def load_plugins() -> None:
+    """Import the ``wetted_sa.shapes`` entry points once per process."""
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            obj = entry_point.load()
+            if isinstance(obj, type) and obj not in SHAPE_CLASSES.values():
+                register(obj)
+        except Exception as e:  # a broken plugin must not take the calculators down
+            warnings.warn(f"Could not load shape plugin {entry_point.name!r}: {e}", RuntimeWarning)
+
+
+def registered_shapes() -> list:
+    """Return the shared instances registered so far, without loading plugins."""
+    return list(_INSTANCES.values())
+
+
+def all_shapes() -> list:
+    """Return every shape instance, built-ins first, loading plugins on first use."""
+    load_plugins()
+    return list(_INSTANCES.values())
+
+
+def names() -> list[str]:
+    """Return the display names of every shape."""
+    return [shape.name for shape in all_shapes()]
+
+
+def get_shape(name: str):
+    """Return the shared instance registered under ``name``."""
+    try:
+        return _INSTANCES[name]
+    except KeyError:
+        pass
+    load_plugins()
+    try:
+        return _INSTANCES[name]
+    except KeyError:
+        raise ValueError(f"Unknown shape {name!r}") from None
+
+
+def shape_class(name: str) -> type:
+    """Return the class registered under ``name``."""
+    return type(get_shape(name))
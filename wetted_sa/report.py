@@ -0,0 +1,359 @@
+"""Surface-area-to-volume (SA/V) reports for extractables studies.
+
+The input is a BOM as read by ``wetted_sa.bom`` (``shape``, ``dim1`` …,
+optional ``quantity``, ``assembly``, ``part`` and ``unit``). It may also
+have a ``fill_volume`` column: the volume of product in contact with that
+line, in the report's volume unit unless the cell names one (``"250 mL"``).
+Lines without one use their own
+computed volume. For each line the report gives area, volume, fill and
+SA/V. Per assembly and overall, it gives total area, total fill and SA/V
+(area over fill), which is the ratio extractables studies scale by. It also
+ranks the lines contributing most wetted area.
+
+Rows are processed ``chunk_size`` at a time and only the running totals and
+a ``top``-sized heap of contributors are kept in memory. A CSV output is one
+rectangular table of line detail, written as it is computed; the summary and
+ranking go to ``NAME.summary.csv`` and ``NAME.top.csv`` next to it, so every
+file loads as a single table. HTML detail rows are spooled to a
+temporary file and appended after the summary. PDF output holds the summary and the
+ranking. It is produced by a small built-in writer, so no PDF library is
+needed.
+"""
+
+import csv
+import heapq
+import html
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .bom import DEFAULT_CHUNK_SIZE, evaluate_chunk, quantities, read_located_chunks
+from .units import (
+    DEFAULT_AREA,
+    DEFAULT_LENGTH,
+    DEFAULT_VOLUME,
+    VOLUME_UNITS,
+    area_unit as _area_unit,
+    parse_volume,
+    volume_unit as _volume_unit,
+)
+
+DEFAULT_TOP = 20
+DETAIL_COLUMNS = [
+    "line", "part", "assembly", "shape", "quantity", "surface_area", "volume", "fill_volume",
+    "total_surface_area", "total_fill_volume", "sa_v",
+]
+FORMATS = (".csv", ".html", ".htm", ".pdf")
+
+
+def _text_column(columns, name: str, n: int) -> list[str]:
+    values = columns.get(name)
+    return [""] * n if values is None else ["" if v is None else str(v).strip() for v in values]
+
+
+def _fill_volumes(values, unit: str) -> np.ndarray:
+    """``fill_volume`` cells in ``unit`` (NaN where blank)."""
+    factor = VOLUME_UNITS[unit]
+
+    def value(v) -> float:
+        if v is None or v == "":
+            return np.nan
+        return float(v) if isinstance(v, (int, float)) else parse_volume(str(v).strip(), unit) / factor
+
+    return np.array([value(v) for v in values], dtype=float)
+
+
+class ReportData:
+    """Running totals and worst contributors collected over the chunks."""
+
+    def __init__(self, top: int, area_unit: str, volume_unit: str):
+        if top < 0:
+            raise ValueError(f"top must be zero or more, got {top}")
+        self.top = top
+        self.area_unit = area_unit
+        self.volume_unit = volume_unit
+        self.lines = 0
+        self.totals: dict[str, np.ndarray] = {}
+        self._heap: list = []
+
+    def add(self, columns, results) -> list[list]:
+        """Fold one evaluated chunk in and return its detail rows."""
+        n = len(results["surface_area"])
+        quantity = quantities(columns, n)
+        area, volume = results["surface_area"], results["volume"]
+        fill = np.full(n, np.nan)
+        if "fill_volume" in columns:
+            fill = _fill_volumes(columns["fill_volume"], self.volume_unit)
+        fill = np.where(np.isnan(fill), volume, fill)
+        total_area, total_fill = area * quantity, fill * quantity
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(fill > 0, area / fill, np.nan)
+
+        assemblies = _text_column(columns, "assembly", n)
+        keys, inverse = np.unique(np.array(assemblies, dtype=object).astype(str), return_inverse=True)
+        for code, key in enumerate(keys.tolist()):
+            rows = inverse == code
+            sums = np.array([quantity[rows].sum(), total_area[rows].sum(), (volume * quantity)[rows].sum(), total_fill[rows].sum()])
+            if key in self.totals:
+                self.totals[key] += sums
+            else:
+                self.totals[key] = sums
+
+        parts, shapes = _text_column(columns, "part", n), _text_column(columns, "shape", n)
+        numbers = zip(*(a.tolist() for a in (quantity, area, volume, fill, total_area, total_fill, ratio)))
+        detail = [
+            [self.lines + i + 1, parts[i], assemblies[i], shapes[i], *values] for i, values in enumerate(numbers)
+        ]
+        # Only rows that beat the current cut-off are pushed, so the heap
+        # costs O(n) comparisons per chunk rather than O(n log top).
+        if len(self._heap) < self.top:
+            floor = -np.inf
+        else:
+            floor = self._heap[0][0] if self._heap else np.inf  # top == 0 ranks nothing
+        for i in np.flatnonzero(total_area > floor):
+            item = (float(total_area[i]), -(self.lines + i + 1), detail[i])
+            if len(self._heap) < self.top:
+                heapq.heappush(self._heap, item)
+            elif item > self._heap[0]:
+                heapq.heapreplace(self._heap, item)
+        self.lines += n
+        return detail
+
+    @property
+    def overall(self) -> np.ndarray:
+        return sum(self.totals.values(), np.zeros(4))
+
+    def worst(self) -> list[list]:
+        """Detail rows of the largest area contributors, largest first."""
+        return [item[2] for item in sorted(self._heap, reverse=True)]
+
+    def summary_rows(self, fill_volume=None) -> list[list]:
+        """``[assembly, quantity, area, volume, fill, sa_v]`` per assembly plus an overall row."""
+        rows = []
+        for name in sorted(self.totals):
+            quantity, area, volume, fill = self.totals[name].tolist()
+            rows.append([name or "(unassigned)", quantity, area, volume, fill, area / fill if fill else np.nan])
+        quantity, area, volume, fill = self.overall.tolist()
+        if fill_volume is not None:
+            fill = fill_volume
+        rows.append(["Total", quantity, area, volume, fill, area / fill if fill else np.nan])
+        return rows
+
+
+def _fmt(value) -> str:
+    if not isinstance(value, float):
+        return str(value)
+    if np.isnan(value):
+        return "–"
+    return f"{value:,.4g}" if abs(value) < 1000 else f"{value:,.0f}"
+
+
+def _headers(data: ReportData):
+    au, vu = data.area_unit, data.volume_unit
+    summary = ["Assembly", "Quantity", f"Area ({au})", f"Volume ({vu})", f"Fill ({vu})", f"SA/V ({au}/{vu})"]
+    worst = ["Line", "Part", "Assembly", "Shape", "Qty", f"Total area ({au})", "Share", f"SA/V ({au}/{vu})"]
+    return summary, worst
+
+
+def _worst_rows(data: ReportData) -> list[list]:
+    total_area = data.overall[1]
+    return [
+        [row[0], row[1], row[2], row[3], row[4], row[8], f"{row[8] / total_area:.1%}" if total_area else "–", row[10]]
+        for row in data.worst()
+    ]
+
+
+def companion_paths(path) -> tuple[Path, Path]:
+    """Return the summary and ranking CSV paths written beside CSV report ``path``."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.summary.csv"), path.with_name(f"{path.stem}.top.csv")
+
+
+class _CSVSink:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(DETAIL_COLUMNS)
+
+    def rows(self, rows) -> None:
+        self._writer.writerows(rows)
+
+    def finish(self, data: ReportData, fill_volume, title: str) -> None:
+        self._file.close()
+        summary_head, worst_head = _headers(data)
+        summary_path, worst_path = companion_paths(self.path)
+        for path, head, rows in (
+            (summary_path, summary_head, data.summary_rows(fill_volume)),
+            (worst_path, worst_head, _worst_rows(data)),
+        ):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerows([head, *rows])
+
+    def abort(self) -> None:
+        self._file.close()
+
+
+_STYLE = (
+    "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:2em}"
+    "td,th{border:1px solid #ccc;padding:2px 8px;text-align:right}td:nth-child(-n+4),th{text-align:left}"
+)
+
+
+class _HTMLSink:
+    def __init__(self, path):
+        self.path = path
+        self._spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    def rows(self, rows) -> None:
+        self._spool.writelines(
+            "<tr>" + "".join(f"<td>{html.escape(_fmt(v))}</td>" for v in row) + "</tr>\n" for row in rows
+        )
+
+    def finish(self, data: ReportData, fill_volume, title: str) -> None:
+        summary_head, worst_head = _headers(data)
+
+        def table(head, rows):
+            out = ["<table><tr>", *(f"<th>{html.escape(h)}</th>" for h in head), "</tr>\n"]
+            for row in rows:
+                out.append("<tr>" + "".join(f"<td>{html.escape(_fmt(v))}</td>" for v in row) + "</tr>\n")
+            out.append("</table>\n")
+            return "".join(out)
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>")
+            f.write(f"<style>{_STYLE}</style></head><body><h1>{html.escape(title)}</h1>\n")
+            f.write(f"<p>{data.lines:,} lines.</p><h2>SA/V by assembly</h2>\n")
+            f.write(table(summary_head, data.summary_rows(fill_volume)))
+            f.write(f"<h2>Largest area contributors (top {len(data.worst())})</h2>\n")
+            f.write(table(worst_head, _worst_rows(data)))
+            f.write("<h2>All lines</h2><table><tr>")
+            f.write("".join(f"<th>{html.escape(h)}</th>" for h in DETAIL_COLUMNS) + "</tr>\n")
+            self._spool.seek(0)
+            shutil.copyfileobj(self._spool, f)
+            f.write("</table></body></html>\n")
+        self._spool.close()
+
+    def abort(self) -> None:
+        self._spool.close()
+
+
+class _PDFSink:
+    def __init__(self, path):
+        self.path = path
+
+    def rows(self, rows) -> None:
+        pass
+
+    def finish(self, data: ReportData, fill_volume, title: str) -> None:
+        summary_head, worst_head = _headers(data)
+        lines = [title, "", f"{data.lines:,} lines", "", "SA/V by assembly"]
+        lines += _text_table(summary_head, data.summary_rows(fill_volume))
+        lines += ["", f"Largest area contributors (top {len(data.worst())})"]
+        lines += _text_table(worst_head, _worst_rows(data))
+        Path(self.path).write_bytes(text_pdf(lines))
+
+    def abort(self) -> None:
+        pass
+
+
+def _text_table(head, rows) -> list[str]:
+    cells = [list(head)] + [[_fmt(v) for v in row] for row in rows]
+    widths = [min(28, max(len(row[i]) for row in cells)) for i in range(len(head))]
+    return ["  ".join(cell[:28].ljust(width) for cell, width in zip(row, widths)) for row in cells]
+
+
+def _pdf_text(text: str) -> str:
+    # WinAnsiEncoding is cp1252, which covers ², ³ and the dash used for blanks.
+    text = text.encode("cp1252", "replace").decode("cp1252")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def text_pdf(lines, font_size: float = 8, lines_per_page: int = 70) -> bytes:
+    """Render monospaced text lines as a minimal multi-page PDF (landscape A4)."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, max(len(lines), 1), lines_per_page)] or [[]]
+    # Objects 1-3 are the catalog, the page tree (filled in last) and the font.
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for page in pages:
+        body = [f"BT /F1 {font_size} Tf {font_size * 1.3:.1f} TL 36 559 Td"]
+        body += [f"({_pdf_text(line)}) '" for line in page]
+        body.append("ET")
+        stream = "\n".join(body).encode("cp1252")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1") + stream + b"\nendstream")
+        content = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 842 595] /Resources << /Font << /F1 3 0 R >> >>"
+            f" /Contents {content} 0 R >>"
+        )
+        kids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode("latin-1")
+        out += obj if isinstance(obj, bytes) else obj.encode("latin-1")
+        out += b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += b"".join(f"{offset:010d} 00000 n \n".encode("latin-1") for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+def _sink(path):
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return _CSVSink(path)
+    if suffix in (".html", ".htm"):
+        return _HTMLSink(path)
+    if suffix == ".pdf":
+        return _PDFSink(path)
+    raise ValueError(f"Unsupported report format {suffix!r}; use one of {FORMATS}")
+
+
+def generate(
+    source,
+    outputs,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    top: int = DEFAULT_TOP,
+    fill_volume: float | None = None,
+    cache=None,
+    unit: str = DEFAULT_LENGTH,
+    area_unit: str = DEFAULT_AREA,
+    volume_unit: str = DEFAULT_VOLUME,
+    title: str | None = None,
+) -> ReportData:
+    """Stream ``source`` into each report in ``outputs`` (.csv, .html, .pdf).
+
+    ``fill_volume`` (in ``volume_unit``) replaces the summed fill volumes in
+    the overall SA/V, e.g. the batch volume of a single-use system.
+    """
+    area_unit, volume_unit = _area_unit(area_unit), _volume_unit(volume_unit)
+    data = ReportData(top, area_unit, volume_unit)
+    sinks = [_sink(path) for path in ([outputs] if isinstance(outputs, (str, Path)) else outputs)]
+    title = title or f"SA/V report: {Path(source).name}"
+    try:
+        for location, columns in read_located_chunks(source, chunk_size):
+            try:
+                results = evaluate_chunk(columns, cache, unit, area_unit, volume_unit)
+                detail = data.add(columns, results)
+            except ValueError as e:
+                raise ValueError(f"{location}: {e}") from e
+            for sink in sinks:
+                sink.rows(detail)
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+    for sink in sinks:
+        sink.finish(data, fill_volume, title)
+    return data
@@ -0,0 +1,305 @@
+"""Local HTTP/JSON calculation service built on ``asyncio``.
+
+Endpoints::
+
+    GET  /shapes    -> [{"name": "Tube", "dimensions": ["Diameter", "Length"]}, ...]
+    POST /compute   {"shape": "Tube", "dims": [0.635, 30]}
+                    -> {"shape": "Tube", "surface_area": ..., "volume": ...}
+    POST /batch     [{"shape": ..., "dims": ..., "part": "PN-1"}, ...]
+                    -> [{"part": "PN-1", "surface_area": ..., "volume": ...} | {"error": ...}, ...]
+    GET  /metrics   -> Prometheus text from ``wetted_sa.instrument`` (empty unless enabled)
+
+``dims`` is a list in ``Shape.dimensions`` order or a ``{dimension: value}``
+object; values may be numbers or expressions (``"1/4in"``). Any ``part``
+field is echoed back; dimensions must be finite. Every request is routed
+through a ``Coalescer``: items that arrive during the same event-loop
+iteration, from any connection, are grouped by shape and evaluated with one
+``evaluate_batch`` call on a worker thread, and results are kept in an LRU
+cache keyed by shape and dimensions so repeated part numbers cost a
+dictionary lookup. If a group's call fails, its items are retried one by one
+so only the bad ones get an error. With a ``ResultCache`` attached, misses
+are also looked up in (and written to) the persistent cache.
+"""
+
+import asyncio
+import itertools
+import json
+import math
+from collections import OrderedDict
+
+from . import instrument
+from .expr import evaluate
+from .registry import all_shapes, get_shape
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 65536
+# Groups smaller than this are cheaper to evaluate with the scalar formulas.
+BATCH_THRESHOLD = 16
+MAX_BODY = 64 * 1024 * 1024
+# Lines longer than the stream limit (64 KiB) are refused as well.
+MAX_HEADERS = 100
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+def _dims_for(shape, dims) -> tuple[float, ...]:
+    if isinstance(dims, dict):
+        try:
+            dims = [dims[d] for d in shape.dimensions]
+        except KeyError as e:
+            raise ValueError(f"{shape.name} is missing dimension {e.args[0]!r}") from None
+    if not isinstance(dims, (list, tuple)) or len(dims) != len(shape.dimensions):
+        raise ValueError(f"{shape.name} expects {len(shape.dimensions)} dimensions")
+    values = tuple(float(v) if isinstance(v, (int, float)) else evaluate(str(v)) for v in dims)
+    for name, value in zip(shape.dimensions, values):
+        if not math.isfinite(value):
+            raise ValueError(f"{shape.name} {name} must be finite, got {value}")
+    return values
+
+
+class Coalescer:
+    """Collect concurrent computations and evaluate them together."""
+
+    def __init__(self, cache_size: int = CACHE_SIZE, persistent=None):
+        self.cache: OrderedDict = OrderedDict()
+        self.persistent = persistent
+        self.cache_size = cache_size
+        self._pending: list = []
+        self._scheduled = False
+        self.hits = 0
+        self.misses = 0
+
+    async def compute(self, shape, dims: tuple[float, ...]) -> tuple[float, float]:
+        key = (shape.name, dims)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((shape, dims, future))
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        self._scheduled = False
+        groups: dict[str, list] = {}
+        for item in pending:
+            groups.setdefault(item[0].name, []).append(item)
+        loop = asyncio.get_running_loop()
+        for group in groups.values():
+            # Persistent-cache lookups and large groups take a while, so
+            # groups are computed off the event loop.
+            shape = group[0][0]
+            rows = [dims for _, dims, _ in group]
+            done = loop.run_in_executor(None, self._compute_group, shape, rows)
+            done.add_done_callback(lambda done, group=group: self._resolve(group, done))
+
+    def _compute_group(self, shape, rows) -> list:
+        """Results for ``rows``; a row that fails gets its exception instead."""
+        try:
+            return self._compute(shape, rows)
+        except (ValueError, ArithmeticError) as e:
+            if len(rows) == 1:
+                return [ValueError(str(e))]
+        # One bad row fails the vectorized call; retry each so only it fails.
+        results = []
+        for row in rows:
+            try:
+                results.append(self._compute(shape, [row])[0])
+            except (ValueError, ArithmeticError) as e:
+                results.append(ValueError(str(e)))
+        return results
+
+    def _compute(self, shape, rows) -> list[tuple[float, float]]:
+        if self.persistent is not None:
+            return self.persistent.compute_many(shape, rows)
+        return self._evaluate(shape, rows)
+
+    def _resolve(self, group, done) -> None:
+        try:
+            results = done.result()
+        except Exception as e:
+            # Anything else (a sqlite3.Error, say) must still answer every request.
+            for _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (shape, dims, future), result in zip(group, results):
+            if isinstance(result, Exception):
+                if not future.done():
+                    future.set_exception(result)
+                continue
+            self._store((shape.name, dims), result)
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _evaluate(shape, rows) -> list[tuple[float, float]]:
+        if len(rows) < BATCH_THRESHOLD:
+            with instrument.timed("compute", shape.name):
+                return [(float(shape.surface_area(*r)), float(shape.volume(*r))) for r in rows]
+        import numpy as np
+
+        areas, volumes = shape.evaluate_batch(np.array(rows, dtype=float))
+        return list(zip(areas.tolist(), volumes.tolist()))
+
+    def _store(self, key, result) -> None:
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+
+class Service:
+    """Request routing for the HTTP server; usable without sockets."""
+
+    def __init__(self, coalescer: Coalescer | None = None):
+        self.coalescer = coalescer or Coalescer()
+
+    async def _compute_item(self, item) -> dict:
+        if not isinstance(item, dict) or "shape" not in item or "dims" not in item:
+            raise ValueError("each item needs 'shape' and 'dims'")
+        shape = get_shape(str(item["shape"]))
+        area, volume = await self.coalescer.compute(shape, _dims_for(shape, item["dims"]))
+        result = {"shape": shape.name, "surface_area": area, "volume": volume}
+        if "part" in item:
+            result["part"] = item["part"]
+        return result
+
+    async def _batch_item(self, item) -> dict:
+        try:
+            return await self._compute_item(item)
+        except (ValueError, ArithmeticError, TypeError) as e:
+            error = {"error": str(e)}
+            if isinstance(item, dict) and "part" in item:
+                error["part"] = item["part"]
+            return error
+
+    async def handle(self, method: str, path: str, body: bytes) -> tuple[int, object]:
+        """Return ``(status, json_payload)`` for one request."""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        try:
+            if path == "/shapes":
+                if method != "GET":
+                    return 405, {"error": "use GET"}
+                return 200, [{"name": s.name, "dimensions": list(s.dimensions)} for s in all_shapes()]
+            if path == "/metrics":
+                if method != "GET":
+                    return 405, {"error": "use GET"}
+                return 200, instrument.REGISTRY.to_prometheus()
+            if path not in ("/compute", "/batch"):
+                return 404, {"error": f"no route {path}"}
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            payload = json.loads(body or b"null")
+            if path == "/compute":
+                return 200, await self._compute_item(payload)
+            if not isinstance(payload, list):
+                return 400, {"error": "/batch expects a JSON array"}
+            return 200, await asyncio.gather(*(self._batch_item(item) for item in payload))
+        except (ValueError, ArithmeticError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one keep-alive connection."""
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except ValueError:  # over the stream limit
+                    await self._respond(writer, 400, {"error": "request line too long"}, close=True)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, close=True)
+                    break
+                headers = {}
+                try:
+                    for count in itertools.count():
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        if count == MAX_HEADERS:
+                            raise ValueError("too many header fields")
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except ValueError:
+                    await self._respond(writer, 431, {"error": "request header fields too large"}, close=True)
+                    break
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, close=True)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "request body too large"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                close = headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                with instrument.timed("request"):
+                    status, payload = await self.handle(method.upper(), target, body)
+                instrument.count("requests")
+                await self._respond(writer, status, payload, close)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status: int, payload, close: bool) -> None:
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def start_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT, service: Service | None = None):
+    """Start listening and return the ``asyncio.Server``; ``port=0`` picks a free port."""
+    service = service or Service()
+    return await asyncio.start_server(service.serve_connection, host, port)
+
+
+def run(host: str = "127.0.0.1", port: int = DEFAULT_PORT, persistent=None) -> None:
+    """Serve until interrupted, optionally backed by a ``ResultCache``."""
+
+    async def main() -> None:
+        server = await start_server(host, port, Service(Coalescer(persistent=persistent)))
+        address = server.sockets[0].getsockname()
+        print(f"Serving wetted area on http://{address[0]}:{address[1]}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
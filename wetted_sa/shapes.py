@@ -0,0 +1,469 @@
+"""Closed-form wetted surface area and volume formulas for each component."""
+
+import functools
+import math
+
+from . import instrument
+from .registry import register, registered_shapes
+
+
+@functools.lru_cache(maxsize=1024)
+def angle_constants(degrees: float) -> tuple[float, float, float]:
+    """``(radians, sin, cos)`` of an angle in degrees, computed once per angle."""
+    radians = math.radians(degrees)
+    return radians, math.sin(radians), math.cos(radians)
+
+
+@functools.lru_cache(maxsize=None)
+def _degree_table():
+    import numpy as np
+
+    return np.array([angle_constants(float(d)) for d in range(361)]).T
+
+
+def _trig_term(degrees, term: int):
+    """Term ``term`` (0 radians, 1 sin, 2 cos) of ``degrees``; see ``trig``."""
+    if isinstance(degrees, (int, float)):
+        return angle_constants(float(degrees))[term]
+    if hasattr(degrees, "free_symbols"):
+        import sympy
+
+        if term == 0:
+            return sympy.pi * degrees / 180
+        return sympy.Function(("sind", "cosd")[term - 1])(degrees)
+    import numpy as np
+
+    degrees = np.asarray(degrees, dtype=float)
+    if term == 0:
+        return np.radians(degrees)
+    if degrees.size:
+        low, high = degrees.min(), degrees.max()
+        if low == high and low == int(low) and 0 <= low <= 360:
+            return _degree_table()[term][int(low)]
+        if 0 <= low and high <= 360:
+            index = degrees.astype(np.intp)
+            if (index == degrees).all():
+                return _degree_table()[term].take(index)
+    return (np.sin, np.cos)[term - 1](np.radians(degrees))
+
+
+def trig(degrees):
+    """``(radians, sin, cos)`` of ``degrees`` as a float, NumPy array or SymPy expression.
+
+    Floats hit the ``angle_constants`` cache. Arrays of whole degrees (the
+    usual 30°, 45°, 60°, 90° catalog fittings) are looked up in a per-degree
+    table, and a uniform array becomes a single constant. Both cost less than
+    a trig call per row and give the same constants as the scalar path.
+    Other arrays fall back to NumPy. SymPy expressions get ``sind``/``cosd``
+    functions, which generated kernels resolve back to this table.
+    """
+    if isinstance(degrees, (int, float)):
+        return angle_constants(degrees)
+    return _trig_term(degrees, 0), _trig_term(degrees, 1), _trig_term(degrees, 2)
+
+
+def sind(degrees):
+    return _trig_term(degrees, 1)
+
+
+def cosd(degrees):
+    return _trig_term(degrees, 2)
+
+
+def _full(results, arrays):
+    """Return kernel ``results`` as float64 arrays shaped like ``arrays``.
+
+    Fresh arrays of the right shape are returned as they are; only constants
+    (a Cap holds no volume) and dimension columns passed straight through are
+    broadcast and copied.
+    """
+    import numpy as np
+
+    shape = arrays[0].shape
+    return tuple(
+        result
+        if isinstance(result, np.ndarray)
+        and result.shape == shape
+        and result.dtype == np.float64
+        and not any(result is array for array in arrays)
+        else np.broadcast_to(result, shape).astype(float)
+        for result in results
+    )
+
+
+# Fixed angles of the Elbow and Wye, computed once at import.
+_ELBOW_ARC = math.radians(90)
+_WYE_RADIANS, _WYE_SIN, _WYE_COS = angle_constants(30.0)
+
+
+class Shape:
+
+    # Dimensions measured in degrees rather than lengths; unit conversion skips them.
+    angles: tuple[str, ...] = ()
+    # Open interval of degrees the ``angles`` dimensions accept.
+    angle_range: tuple[float, float] = (0.0, 360.0)
+    # False where the fused kernel measures no faster than the two batch
+    # formulas (``python -m benchmarks.bench -k formulas`` against ``batch``).
+    fused: bool = True
+
+    def __init__(self, name, dimensions):
+        self.name = name
+        self.dimensions = dimensions
+
+    def length_mask(self) -> list[bool]:
+        """True for each dimension that is a length (and so takes length units)."""
+        return [d not in self.angles for d in self.dimensions]
+
+    def check_angle(self, degrees):
+        """Return ``degrees`` (float or array) if inside ``angle_range``, else raise ``ValueError``.
+
+        SymPy symbols pass through, so formulas calling this still trace.
+        """
+        if hasattr(degrees, "free_symbols"):
+            return degrees
+        low, high = self.angle_range
+        if isinstance(degrees, (int, float)):
+            bad = None if low < degrees < high else degrees
+        else:
+            import numpy as np
+
+            values = np.asarray(degrees, dtype=float)
+            outside = ~((values > low) & (values < high))
+            bad = values[outside].flat[0] if outside.any() else None
+        if bad is not None:
+            raise ValueError(f"{self.name} angle must be between {low:g}° and {high:g}° exclusive, got {bad:g}°")
+        return degrees
+
+    def surface_area(self, *args):  # pragma: no cover
+        raise NotImplementedError
+
+    def volume(self, *args):  # pragma: no cover
+        raise NotImplementedError
+
+    def surface_area_batch(self, *columns):
+        """Evaluate ``surface_area`` over one array per dimension."""
+        return self._batch(self.surface_area, columns)
+
+    def volume_batch(self, *columns):
+        """Evaluate ``volume`` over one array per dimension."""
+        return self._batch(self.volume, columns)
+
+    def evaluate_batch(self, *columns):
+        """Return ``(areas, volumes)`` arrays for the given dimension columns.
+
+        Uses the fused kernel from ``wetted_sa.kernels`` when one can be
+        built and ``fused`` is set, so intermediates shared by both formulas
+        are computed once.
+        """
+        from .kernels import kernel
+
+        with instrument.timed("evaluate", self.name):
+            fused = kernel(self) if self.fused else None
+            if fused is None:
+                area, volume = self.surface_area_batch(*columns), self.volume_batch(*columns)
+            else:
+                arrays = self._columns(columns)
+                # The traced kernel has no angle checks, so apply them here.
+                for dimension, array in zip(self.dimensions, arrays):
+                    if dimension in self.angles:
+                        self.check_angle(array)
+                area, volume = _full(fused(*arrays), arrays)
+        instrument.count("rows", area.size, self.name)
+        return area, volume
+
+    def tessellate(self, *dims, resolution=64):
+        """Return a ``Tessellation`` of the fluid path; see ``wetted_sa.tessellate``."""
+        from .tessellate import tessellate
+
+        return tessellate(self, dims, resolution)
+
+    def _batch(self, formula, columns):
+        # The scalar formulas only apply ``math`` functions to constants, so
+        # they evaluate element-wise when handed float64 arrays. NumPy is
+        # imported here so that loading the formulas stays cheap.
+        import numpy as np
+
+        arrays = self._columns(columns)
+        result = formula(*arrays)
+        return np.broadcast_to(result, arrays[0].shape).astype(float)
+
+    def _columns(self, columns):
+        """Broadcast float64 arrays, one per dimension (or one 2-D array)."""
+        import numpy as np
+
+        if len(columns) == 1 and np.ndim(columns[0]) == 2:
+            columns = tuple(np.asarray(columns[0], dtype=float).T)
+        if len(columns) != len(self.dimensions):
+            raise ValueError(
+                f"{self.name} expects {len(self.dimensions)} dimension columns, got {len(columns)}"
+            )
+        return np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in columns))
+
+
+@register
+class Tube(Shape):
+    def __init__(self):
+        super().__init__("Tube", ["Diameter", "Length"])
+
+    def surface_area(self, diameter, length):
+        return math.pi * diameter * length
+
+    def volume(self, diameter, length):
+        return math.pi * (diameter / 2) ** 2 * length
+
+
+@register
+class TwoDBag(Shape):
+    def __init__(self):
+        super().__init__("2D Bag", ["Length", "Height"])
+
+    def surface_area(self, length, width):
+        return 2 * length * width
+
+    def volume(self, length, width):
+        return math.pi * (width / 2) ** 2 * length
+
+
+@register
+class ThreeDBiocontainer(Shape):
+    # Products of the dimensions share nothing worth fusing.
+    fused = False
+
+    def __init__(self):
+        super().__init__("3D Rectangular Biocontainer", ["Length", "Width", "Height"])
+
+    def surface_area(self, length, width, height):
+        return 2 * (length * width + width * height + length * height)
+
+    def volume(self, length, width, height):
+        return length * width * height
+
+
+@register
+class ThreeDRdBiocontainer(Shape):
+    def __init__(self):
+        super().__init__("3D Round Biocontainer", ["Fold Length", "Width", "Height"])
+
+    def surface_area(self, flength, width, height):
+        flatgap = width - (2 * flength)
+        id_1 = ((flength + (flatgap / 2)) / math.cos(math.radians(45))) * 2
+        return (2 * math.pi * ((id_1 / 2) ** 2)) + (math.pi * id_1 * height)
+
+    def volume(self, flength, width, height):
+        flatgap = width - (2 * flength)
+        id_1 = ((flength + (flatgap / 2)) / math.cos(math.radians(45))) * 2
+        return math.pi * height * (id_1 / 2) ** 2
+
+
+@register
+class ThreeDRdBottle(Shape):
+    def __init__(self):
+        super().__init__("3D Round Bottle", ["ID", "Height"])
+
+    def surface_area(self, id_1, height):
+        return (math.pi * ((id_1 / 2) ** 2)) + (math.pi * id_1 * height)
+
+    def volume(self, id_1, height):
+        return math.pi * height * (id_1 / 2) ** 2
+
+
+@register
+class Flask(Shape):
+    def __init__(self):
+        super().__init__("Flask", ["Small Diameter", "Large Diameter", "Height"])
+
+    def surface_area(self, sdiameter, ldiameter, height):
+        r1 = sdiameter / 2
+        r2 = ldiameter / 2
+        return math.pi * ((r1 + r2) * (((r1 - r2) ** 2 + height**2) ** 0.5)) + (r2**2)
+
+    def volume(self, sdiameter, ldiameter, height):
+        r1 = sdiameter / 2
+        r2 = ldiameter / 2
+        return ((r1**2 + r2**2 + (r1 * r2)) * math.pi * height) / 3
+
+
+@register
+class ConicalFrustrum(Shape):
+    def __init__(self):
+        super().__init__("Conical Frustrum", ["Small Diameter", "Large Diameter", "Length"])
+
+    def surface_area(self, sdiameter, ldiameter, length):
+        r1 = sdiameter / 2
+        r2 = ldiameter / 2
+        sa = math.pi * ((r1 + r2) * (((r1 - r2) ** 2 + length**2) ** 0.5))
+        return sa
+
+    def volume(self, sdiameter, ldiameter, length):
+        r1 = sdiameter / 2
+        r2 = ldiameter / 2
+        vol = ((r1**2 + r2**2 + (r1 * r2)) * math.pi * length) / 3
+        return vol
+
+
+@register
+class Tee(Shape):
+    def __init__(self):
+        super().__init__("Tee", ["Horizontal ID", "Vertical ID", "Length", "Height", "Flange OD"])
+
+    def surface_area(self, id_1, id_2, length, height, flange):
+        trunk_height = height - ((flange - id_1) / 2) - id_1
+        area_tube_1 = math.pi * id_1 * length
+        area_tube_2 = math.pi * id_2 * trunk_height
+        return area_tube_1 + area_tube_2
+
+    def volume(self, id_1, id_2, length, height, flange):
+        r1 = id_1 / 2
+        r2 = id_2 / 2
+        trunk_height = height - ((flange - id_1) / 2) - id_1
+        vol = (math.pi * length * r1**2) + (math.pi * trunk_height * r2**2)
+        return vol
+
+
+@register
+class Elbow(Shape):
+    def __init__(self):
+        super().__init__("Elbow", ["Horizontal ID", "Vertical ID", "Length", "Height"])
+
+    def surface_area(self, id_1, id_2, length, height):
+        arc_length = _ELBOW_ARC
+        area_tube_1 = math.pi * id_1 * length
+        area_tube_2 = math.pi * id_2 * height
+        area_curve = math.pi * id_2 * arc_length
+        return area_tube_1 + area_tube_2 + area_curve
+
+    def volume(self, id_1, id_2, length, height):
+        r1 = id_1 / 2
+        r2 = id_2 / 2
+        arc_length = _ELBOW_ARC
+        vol = (math.pi * length * r1**2) + (math.pi * height * r2**2) + (math.pi * arc_length * r2**2)
+        return vol
+
+
+@register
+class Bend(Shape):
+    """Elbow with any bend angle (degrees) and centreline bend radius; Elbow is 90° at radius 1."""
+
+    angles = ("Bend Angle",)
+
+    def __init__(self):
+        super().__init__("Bend", ["Horizontal ID", "Vertical ID", "Length", "Height", "Bend Angle", "Bend Radius"])
+
+    def surface_area(self, id_1, id_2, length, height, angle, radius):
+        arc_length = trig(self.check_angle(angle))[0] * radius
+        area_tube_1 = math.pi * id_1 * length
+        area_tube_2 = math.pi * id_2 * height
+        area_curve = math.pi * id_2 * arc_length
+        return area_tube_1 + area_tube_2 + area_curve
+
+    def volume(self, id_1, id_2, length, height, angle, radius):
+        r1 = id_1 / 2
+        r2 = id_2 / 2
+        arc_length = trig(self.check_angle(angle))[0] * radius
+        vol = (math.pi * length * r1**2) + (math.pi * height * r2**2) + (math.pi * arc_length * r2**2)
+        return vol
+
+
+@register
+class Cross(Shape):
+    def __init__(self):
+        super().__init__("Cross", ["Horizontal ID", "Vertical ID", "Length", "Height"])
+
+    def surface_area(self, id_1, id_2, length, height):
+        area_tube_1 = math.pi * id_1 * length
+        area_tube_2 = math.pi * id_2 * height
+        intersection_area = math.pi * (id_2 / 2) ** 2
+        return area_tube_1 + area_tube_2 - intersection_area
+
+    def volume(self, id_1, id_2, length, height):
+        r1 = id_1 / 2
+        r2 = id_2 / 2
+        return (math.pi * length * r1**2) + (math.pi * height * r2**2) - (math.pi * r2**2)
+
+
+@register
+class Wye(Shape):
+    def __init__(self):
+        super().__init__("Wye", ["Tusk ID", "Trunk ID", "Length", "Height"])
+
+    def surface_area(self, id_1, id_2, length, height):
+        tusk_height = (height - (2 * _WYE_COS * (id_1 / 2))) / 2
+        tusk_length = tusk_height / _WYE_SIN
+        tusk_area = 2 * math.pi * id_1 * tusk_length
+        trunk_length = (length - (_WYE_COS * tusk_length)) - ((id_1 / 2) * _WYE_SIN)
+        trunk_area = math.pi * id_2 * trunk_length
+        sa_curve = _WYE_RADIANS * id_2
+        intersection_area = math.pi * (id_2 / 2) ** 2
+        return tusk_area + trunk_area + sa_curve - intersection_area
+
+    def volume(self, id_1, id_2, length, height):
+        tusk_height = (height - (2 * _WYE_COS * (id_1 / 2))) / 2
+        tusk_length = tusk_height / _WYE_SIN
+        trunk_length = (length - (_WYE_COS * tusk_length)) - ((id_1 / 2) * _WYE_SIN)
+        vol_tusk = 2 * (math.pi * tusk_length * (id_1 / 2) ** 2)
+        vol_trunk = (math.pi * trunk_length * (id_2 / 2) ** 2)
+        arc_length = _WYE_RADIANS * id_2
+        vol_curve = (arc_length * (id_2 / 2) ** 2 * math.pi) / 3
+        return vol_tusk + vol_trunk + vol_curve
+
+
+@register
+class AngledWye(Shape):
+    """Wye whose tusks leave the trunk axis at any branch angle (degrees); Wye is 30°."""
+
+    angles = ("Branch Angle",)
+    # The tusk length divides by sin(angle), which is zero at 0° and 180°.
+    angle_range = (0.0, 180.0)
+
+    def __init__(self):
+        super().__init__("Angled Wye", ["Tusk ID", "Trunk ID", "Length", "Height", "Branch Angle"])
+
+    def surface_area(self, id_1, id_2, length, height, angle):
+        radians, sin, cos = trig(self.check_angle(angle))
+        tusk_height = (height - (2 * cos * (id_1 / 2))) / 2
+        tusk_length = tusk_height / sin
+        tusk_area = 2 * math.pi * id_1 * tusk_length
+        trunk_length = (length - (cos * tusk_length)) - ((id_1 / 2) * sin)
+        trunk_area = math.pi * id_2 * trunk_length
+        sa_curve = radians * id_2
+        intersection_area = math.pi * (id_2 / 2) ** 2
+        return tusk_area + trunk_area + sa_curve - intersection_area
+
+    def volume(self, id_1, id_2, length, height, angle):
+        radians, sin, cos = trig(self.check_angle(angle))
+        tusk_height = (height - (2 * cos * (id_1 / 2))) / 2
+        tusk_length = tusk_height / sin
+        trunk_length = (length - (cos * tusk_length)) - ((id_1 / 2) * sin)
+        vol_tusk = 2 * (math.pi * tusk_length * (id_1 / 2) ** 2)
+        vol_trunk = (math.pi * trunk_length * (id_2 / 2) ** 2)
+        arc_length = radians * id_2
+        vol_curve = (arc_length * (id_2 / 2) ** 2 * math.pi) / 3
+        return vol_tusk + vol_trunk + vol_curve
+
+
+@register
+class Cap(Shape):
+    def __init__(self):
+        super().__init__("Cap", ["ID"])
+
+    def surface_area(self, id_1):
+        return math.pi * ((id_1 / 2) ** 2)
+
+    def volume(self, id_1):
+        return 0.0
+
+
+@register
+class Plug(Shape):
+    def __init__(self):
+        super().__init__("Plug", ["Diameter", "Length"])
+
+    def surface_area(self, diameter, length):
+        return (math.pi * (diameter / 2) ** 2) + (math.pi * diameter * length)
+
+    def volume(self, diameter, length):
+        return 0.0
+
+
+# Built-in shape instances in menu order; plugins are appended by registry.all_shapes()
+SHAPES = registered_shapes()
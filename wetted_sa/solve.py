@@ -0,0 +1,220 @@
+"""Inverse sizing: find dimensions that give a target area, volume or SA/V.
+
+``solve`` fixes every dimension except those in ``vary`` and finds the value
+that makes the chosen quantity (``"area"``, ``"volume"`` or ``"ratio"``,
+area over volume) equal the target. Several varied dimensions are scaled
+together. Their given values set the proportions, and one common factor is
+solved for, so "scale this bag until it holds 50 L" keeps its shape.
+
+All rows are solved together, with one fused ``evaluate_batch`` call per
+step for the whole batch. Most formulas are linear or quadratic in a single
+dimension. Each row is checked for that from four evaluations, and a row
+that passes is answered with the closed-form root. The remaining rows
+(slant heights, cubic volume scaling, SA/V) use a bracketed, vectorized
+Illinois (regula falsi) iteration. Rows without a positive solution come
+back as NaN.
+
+An angle dimension is solved for on its own, never scaled with lengths. It
+skips the closed form (the formulas are trigonometric in it), and is
+bracketed on a grid inside the shape's ``angle_range``, so no trial angle is
+one the shape rejects. The smallest angle that meets the target is returned.
+"""
+
+import numpy as np
+
+TARGETS = ("area", "volume", "ratio")
+MAX_ITERATIONS = 200
+# Brackets grow by doubling up to this factor of the starting scale.
+MAX_EXPANSIONS = 64
+# Grid intervals across ``angle_range`` when bracketing an angle.
+ANGLE_STEPS = 90
+
+
+def _indices(shape, vary) -> list[int]:
+    names = [vary] if isinstance(vary, (str, int)) else list(vary)
+    if not names:
+        raise ValueError("nothing to vary")
+    indices = []
+    for name in names:
+        if isinstance(name, int):
+            indices.append(name)
+        elif name in shape.dimensions:
+            indices.append(shape.dimensions.index(name))
+        else:
+            raise ValueError(f"{shape.name} has no dimension {name!r}; use one of {shape.dimensions}")
+    return indices
+
+
+def _base(shape, dims, n: int):
+    if isinstance(dims, dict):
+        missing = [d for d in shape.dimensions if d not in dims]
+        if missing:
+            raise ValueError(f"{shape.name} is missing dimensions {missing}")
+        dims = [dims[d] for d in shape.dimensions]
+        columns = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in dims))
+        dims = np.stack([np.ravel(c) for c in columns], axis=1)
+    dims = np.array(dims, dtype=float, ndmin=2)
+    if dims.shape[1] != len(shape.dimensions):
+        raise ValueError(f"{shape.name} expects {len(shape.dimensions)} dimensions, got {dims.shape[1]}")
+    return np.broadcast_to(dims, (max(n, len(dims)), dims.shape[1])).copy()
+
+
+def _quantity(shape, target: str, dims):
+    area, volume = shape.evaluate_batch(dims)
+    if target == "area":
+        return area
+    if target == "volume":
+        return volume
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return area / volume
+
+
+def _smallest_positive(*roots):
+    candidates = np.stack(roots)
+    candidates = np.where(np.isfinite(candidates) & (candidates > 0), candidates, np.inf)
+    best = candidates.min(axis=0)
+    return np.where(np.isfinite(best), best, np.nan)
+
+
+def _closed_form(g, n: int):
+    """Return roots for rows where ``g`` is at most quadratic in the scale, else NaN."""
+    g0, g1, g2, g3 = (g(np.full(n, k)) for k in (0.0, 1.0, 2.0, 3.0))
+    a = (g2 - 2 * g1 + g0) / 2
+    b = g1 - g0 - a
+    c = g0
+    scale = np.abs(g0) + np.abs(g1) + np.abs(g2) + np.abs(g3)
+    exact = np.abs(9 * a + 3 * b + c - g3) <= 1e-9 * scale
+    linear = np.abs(a) <= 1e-12 * scale
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = -c / b
+        disc = np.sqrt(b * b - 4 * a * c)
+        # Numerically stable pair of quadratic roots.
+        q = -0.5 * (b + np.copysign(disc, b))
+        quadratic = _smallest_positive(q / a, c / q)
+    roots = np.where(linear, _smallest_positive(root), quadratic)
+    return np.where(exact, roots, np.nan)
+
+
+def _illinois(g, lo, hi, tol: float):
+    flo, fhi = g(lo), g(hi)
+    side = np.zeros(len(lo), dtype=np.int8)
+    root = np.full(len(lo), np.nan)
+    active = np.flatnonzero(np.isfinite(flo) & np.isfinite(fhi) & (np.sign(flo) != np.sign(fhi)))
+    root[(flo == 0)] = lo[flo == 0]
+    for _ in range(MAX_ITERATIONS):
+        if not len(active):
+            break
+        a, b, fa, fb = lo[active], hi[active], flo[active], fhi[active]
+        c = b - fb * (b - a) / (fb - fa)
+        fc = g(c, active)
+        done = (fc == 0) | (np.abs(b - a) <= tol * np.abs(c))
+        root[active[done]] = c[done]
+        keep_b = np.sign(fc) == np.sign(fb)
+        # The endpoint with the same sign as f(c) moves to c; halving the
+        # stale end's value when one side repeats keeps convergence superlinear.
+        hi[active] = np.where(keep_b, c, b)
+        fhi[active] = np.where(keep_b, fc, np.where(side[active] == 1, fb / 2, fb))
+        lo[active] = np.where(keep_b, a, c)
+        flo[active] = np.where(keep_b, np.where(side[active] == -1, fa / 2, fa), fc)
+        side[active] = np.where(keep_b, -1, 1)
+        active = active[~done]
+    root[active] = (lo[active] + hi[active]) / 2
+    return root
+
+
+def _restrict(g, rows):
+    """``g`` over a subset of rows, still accepting an optional sub-selection."""
+
+    def restricted(k, subset=None):
+        return g(k, rows if subset is None else rows[subset])
+
+    return restricted
+
+
+def _bracket(g, n: int):
+    """Find ``[lo, hi]`` with a sign change by doubling ``hi`` from 1."""
+    lo = np.full(n, 1e-9)
+    hi = np.ones(n)
+    flo = g(lo)
+    pending = np.arange(n)
+    for _ in range(MAX_EXPANSIONS):
+        fhi = g(hi[pending], pending)
+        found = np.isfinite(fhi) & (np.sign(fhi) != np.sign(flo[pending]))
+        pending = pending[~found]
+        if not len(pending):
+            break
+        lo[pending] = hi[pending]
+        flo[pending] = fhi[~found]
+        hi[pending] *= 2
+    hi[pending] = np.nan
+    return lo, hi
+
+
+def _angle_bracket(low: float, high: float):
+    """Return a bracketing function that scans ``(low, high)`` for the first sign change."""
+    points = np.linspace(low, high, ANGLE_STEPS + 1)
+    # The range is open; step just inside the ends.
+    points[[0, -1]] += np.array([1, -1]) * 1e-9 * (high - low)
+
+    def bracket(g, n: int):
+        values = np.stack([g(np.full(n, point)) for point in points])
+        change = np.isfinite(values[:-1]) & np.isfinite(values[1:]) & (np.sign(values[:-1]) != np.sign(values[1:]))
+        first = change.argmax(axis=0)
+        found = change.any(axis=0)
+        lo, hi = points[first], points[first + 1]
+        return lo, np.where(found, hi, np.nan)
+
+    return bracket
+
+
+def solve(shape, target: str, value, dims, vary, tol: float = 1e-13):
+    """Return an ``(n, len(dimensions))`` array of dimensions that meet ``value``.
+
+    ``dims`` is a ``{name: value}`` mapping or an ``(n, k)`` array (values or
+    arrays broadcast against ``value``). For one varied dimension its given
+    value is ignored; for several, their given values fix their proportions.
+    Rows with no positive solution are NaN in the varied columns.
+    """
+    if target not in TARGETS:
+        raise ValueError(f"target must be one of {TARGETS}, not {target!r}")
+    value = np.atleast_1d(np.asarray(value, dtype=float))
+    indices = _indices(shape, vary)
+    angle = any(shape.dimensions[i] in shape.angles for i in indices)
+    if angle and len(indices) > 1:
+        raise ValueError("an angle can only be solved for on its own, not scaled with other dimensions")
+    if len(indices) == 1 and isinstance(dims, dict):
+        dims = {shape.dimensions[indices[0]]: 1.0, **dims}
+    base = _base(shape, dims, len(value))
+    n = len(base)
+    value = np.broadcast_to(value, n)
+    if len(indices) == 1:
+        base[:, indices] = 1.0
+
+    def g(k, rows=None):
+        rows = slice(None) if rows is None else rows
+        trial = base[rows].copy()
+        trial[:, indices] *= np.asarray(k)[:, None]
+        with np.errstate(all="ignore"):
+            return _quantity(shape, target, trial) - value[rows]
+
+    with np.errstate(all="ignore"):
+        closed = target != "ratio" and not angle
+        scale = _closed_form(g, n) if closed else np.full(n, np.nan)
+        bracket = _angle_bracket(*shape.angle_range) if angle else _bracket
+        rest = np.flatnonzero(np.isnan(scale))
+        if len(rest):
+            lo, hi = bracket(_restrict(g, rest), len(rest))
+            ok = np.flatnonzero(np.isfinite(hi))
+            if len(ok):
+                scale[rest[ok]] = _illinois(_restrict(g, rest[ok]), lo[ok], hi[ok], tol)
+    result = base.copy()
+    result[:, indices] *= scale[:, None]
+    return result
+
+
+def solve_one(shape, target: str, value: float, dims: dict, vary) -> dict:
+    """Scalar convenience wrapper; returns ``{dimension: value}`` or raises ValueError."""
+    row = solve(shape, target, value, dims, vary)[0]
+    if np.isnan(row).any():
+        raise ValueError(f"No positive {', '.join(map(str, np.atleast_1d(vary)))} gives {target} {value:g}")
+    return dict(zip(shape.dimensions, row.tolist()))
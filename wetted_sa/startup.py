@@ -0,0 +1,58 @@
+"""Import-time breakdown for the ``--profile-startup`` switch.
+
+The target module is imported in a fresh interpreter run with
+``-X importtime`` and each module's self time is charged to its top-level
+package, so the report shows what a cold start actually pays for.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+
+def profile_imports(module: str) -> list[tuple[str, float]]:
+    """Return ``(package, milliseconds)`` pairs for importing ``module``, slowest first."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(_ROOT), env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        raise ImportError(f"importing {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    packages: dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1000
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+
+def format_report(module: str, timings: list[tuple[str, float]], limit: int = 15) -> str:
+    """Render ``profile_imports`` output as a small text table."""
+    total = sum(ms for _, ms in timings)
+    lines = [f"Import time for {module}: {total:.1f} ms"]
+    for package, ms in timings[:limit]:
+        lines.append(f"  {package:<28} {ms:8.1f} ms  {ms / total:6.1%}")
+    if len(timings) > limit:
+        rest = sum(ms for _, ms in timings[limit:])
+        lines.append(f"  {f'({len(timings) - limit} more)':<28} {rest:8.1f} ms  {rest / total:6.1%}")
+    return "\n".join(lines)
+
+
+def report(module: str, budget_ms: float | None = None) -> int:
+    """Print the breakdown for ``module``; return 1 if it exceeds ``budget_ms``."""
+    timings = profile_imports(module)
+    print(format_report(module, timings))
+    total = sum(ms for _, ms in timings)
+    if budget_ms is not None and total > budget_ms:
+        print(f"Startup budget of {budget_ms:g} ms exceeded by {total - budget_ms:.1f} ms", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,156 @@
+"""Parametric sweeps over the Cartesian grid of a shape's dimensions.
+
+Every dimension gets an axis: a single value, a list of values or a
+``start:stop:count`` linear range. The grid is never materialized; each
+chunk of flat grid indices is unravelled into dimension columns on the fly,
+evaluated with ``evaluate_batch`` and written straight to the output, so
+grids far larger than RAM can be swept.
+
+Outputs:
+
+* ``.npy`` – a structured array (one field per dimension plus
+  ``surface_area`` and ``volume``) created with ``numpy.lib.format.open_memmap``;
+  worker processes write their chunks into the memory map directly.
+* ``.parquet`` – the same columns, streamed through ``pyarrow`` in grid order.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .expr import evaluate
+from .registry import get_shape
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def parse_axis(text: str):
+    """Parse ``"2"``, ``"1,2,3"`` or ``"1/8in:2in:16"`` into a float64 array."""
+    import numpy as np
+
+    text = text.strip()
+    if ":" in text:
+        parts = text.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"Range {text!r} must be start:stop:count")
+        start, stop = evaluate(parts[0]), evaluate(parts[1])
+        count = int(evaluate(parts[2]))
+        if count < 1:
+            raise ValueError(f"Range {text!r} needs a positive count")
+        return np.linspace(start, stop, count)
+    return np.array([evaluate(part) for part in text.split(",")], dtype=float)
+
+
+def _axes_for(shape, axes: dict) -> list:
+    import numpy as np
+
+    missing = [d for d in shape.dimensions if d not in axes]
+    if missing:
+        raise ValueError(f"{shape.name} sweep is missing axes for {missing}")
+    unknown = set(axes) - set(shape.dimensions)
+    if unknown:
+        raise ValueError(f"{shape.name} has no dimensions {sorted(unknown)}")
+    return [np.atleast_1d(np.asarray(axes[d], dtype=float)) for d in shape.dimensions]
+
+
+def grid_size(axes) -> int:
+    size = 1
+    for axis in axes:
+        size *= len(axis)
+    return size
+
+
+def result_dtype(shape):
+    import numpy as np
+
+    return np.dtype([(d, "f8") for d in shape.dimensions] + [("surface_area", "f8"), ("volume", "f8")])
+
+
+def evaluate_range(shape, axes, start: int, stop: int):
+    """Return the structured results for flat grid indices ``[start, stop)``."""
+    import numpy as np
+
+    index = np.unravel_index(np.arange(start, stop), tuple(len(a) for a in axes))
+    columns = [axis[i] for axis, i in zip(axes, index)]
+    out = np.empty(stop - start, dtype=result_dtype(shape))
+    for name, column in zip(shape.dimensions, columns):
+        out[name] = column
+    out["surface_area"], out["volume"] = shape.evaluate_batch(*columns)
+    return out
+
+
+def _write_npy_chunk(shape_name: str, axes, start: int, stop: int, path: str) -> int:
+    from numpy.lib.format import open_memmap
+
+    out = open_memmap(path, mode="r+")
+    out[start:stop] = evaluate_range(get_shape(shape_name), axes, start, stop)
+    out.flush()
+    del out
+    return stop - start
+
+
+def _evaluate_chunk(shape_name: str, axes, start: int, stop: int):
+    return evaluate_range(get_shape(shape_name), axes, start, stop)
+
+
+def _ranges(total: int, chunk_size: int):
+    for start in range(0, total, chunk_size):
+        yield start, min(start + chunk_size, total)
+
+
+def _run(fn, tasks, workers: int):
+    """Yield ``fn(*task)`` in order, keeping at most ``2 * workers`` tasks in flight."""
+    if workers <= 1:
+        for task in tasks:
+            yield fn(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for task in tasks:
+            pending.append(pool.submit(fn, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def sweep(shape, axes: dict, output, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int | None = None) -> int:
+    """Evaluate ``shape`` over the grid of ``axes`` into ``output``; return the point count.
+
+    ``axes`` maps every name in ``shape.dimensions`` to a value or sequence.
+    ``workers`` defaults to the CPU count; ``1`` runs in-process.
+    """
+    from .bom import _is_parquet, _require_pyarrow
+
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+
+    shape = get_shape(shape) if isinstance(shape, str) else shape
+    grid = _axes_for(shape, axes)
+    total = grid_size(grid)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, -(-total // chunk_size))
+    output = str(output)
+
+    if _is_parquet(output):
+        pa = _require_pyarrow()
+        writer = None
+        tasks = ((shape.name, grid, start, stop) for start, stop in _ranges(total, chunk_size))
+        try:
+            for chunk in _run(_evaluate_chunk, tasks, workers):
+                table = pa.Table.from_pydict({name: chunk[name] for name in chunk.dtype.names})
+                if writer is None:
+                    writer = pa.parquet.ParquetWriter(output, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return total
+
+    from numpy.lib.format import open_memmap
+
+    out = open_memmap(output, mode="w+", dtype=result_dtype(shape), shape=(total,))
+    del out
+    tasks = ((shape.name, grid, start, stop, output) for start, stop in _ranges(total, chunk_size))
+    for _ in _run(_write_npy_chunk, tasks, workers):
+        pass
+    return total
@@ -0,0 +1,466 @@
+"""Procedural fluid-path meshes of the built-in shapes, for checking the formulas.
+
+``Shape.tessellate(*dims, resolution=n)`` builds the geometry a shape's
+dimensions describe out of primitives (cylinders, frustums, a torus bend,
+a sphere for the Wye crotch), each with ``n`` segments around its
+circumference. Where primitives overlap, as at a Tee, Cross or Wye junction,
+triangles whose centroid lies inside another primitive are dropped. Open
+ends of the fluid path are closed with non-wetted "port" triangles so the
+enclosed volume is well defined. Area and volume then come from the
+vectorized kernel in ``wetted_sa.mesh``.
+
+Geometric readings of the dimensions (the formulas leave these implicit):
+
+* 2D Bag – the two panels inflate into a tube whose circumference is twice
+  the panel height.
+* Elbow – the 90° bend has centreline radius 1 cm (as ``radians(90)`` in the
+  formula implies), or the bend-tube radius if that is larger. A Bend uses
+  its own angle and radius.
+* Wye – tusks leave the trunk end at ±30° (±branch angle for an Angled
+  Wye); a sphere the size of the larger bore fills the crotch.
+* Cap, Plug – wetted surfaces that hold no volume.
+
+Culled junctions converge at first order in the resolution. Every other
+shape converges at second order.
+"""
+
+import math
+
+from .mesh import TriangleMesh
+from .shapes import angle_constants
+
+DEFAULT_RESOLUTIONS = (16, 32, 64, 128, 256)
+
+DEFAULT_DIMS = {
+    "Tube": (1.0, 10.0),
+    "2D Bag": (30.0, 20.0),
+    "3D Rectangular Biocontainer": (30.0, 20.0, 40.0),
+    "3D Round Biocontainer": (2.0, 30.0, 40.0),
+    "3D Round Bottle": (8.0, 15.0),
+    "Flask": (4.0, 12.0, 15.0),
+    "Conical Frustrum": (1.0, 2.0, 3.0),
+    "Tee": (1.0, 0.8, 5.0, 5.0, 2.0),
+    "Elbow": (1.0, 1.0, 4.0, 4.0),
+    "Bend": (1.0, 1.0, 4.0, 4.0, 45.0, 3.0),
+    "Cross": (1.0, 0.8, 5.0, 5.0),
+    "Wye": (1.0, 1.0, 8.0, 6.0),
+    "Angled Wye": (1.0, 1.0, 8.0, 6.0, 45.0),
+    "Cap": (2.0,),
+    "Plug": (1.0, 2.0),
+}
+
+_BUILDERS = {}
+_EPS = 1e-9
+
+
+class Tessellation:
+    """Wetted triangles plus the port triangles that close the fluid volume."""
+
+    def __init__(self, wetted, ports, holds_volume: bool = True):
+        self.wetted = wetted
+        self.ports = ports
+        self.holds_volume = holds_volume
+
+    def __len__(self) -> int:
+        return len(self.wetted) + len(self.ports)
+
+    @property
+    def triangles(self):
+        import numpy as np
+
+        return np.concatenate([self.wetted, self.ports])
+
+    def area_and_volume(self) -> tuple[float, float]:
+        area = TriangleMesh(triangles=self.wetted).surface_area()
+        volume = TriangleMesh(triangles=self.triangles).volume() if self.holds_volume else 0.0
+        return area, volume
+
+
+class _Part:
+    def __init__(self, triangles, ports, inside=None):
+        self.triangles = triangles
+        self.ports = ports
+        self.inside = inside
+
+
+def _builder(name):
+    def decorate(fn):
+        _BUILDERS[name] = fn
+        return fn
+
+    return decorate
+
+
+def tessellate(shape, dims, resolution: int = 64) -> Tessellation:
+    """Mesh ``shape`` at ``dims`` with ``resolution`` segments per circumference."""
+    builder = _BUILDERS.get(shape.name)
+    if builder is None:
+        raise ValueError(f"No tessellation for {shape.name!r}")
+    if len(dims) != len(shape.dimensions):
+        raise ValueError(f"{shape.name} expects {len(shape.dimensions)} dimensions, got {len(dims)}")
+    if resolution < 3:
+        raise ValueError("resolution must be at least 3")
+    return builder(*(float(d) for d in dims), n=int(resolution))
+
+
+# -- primitives ---------------------------------------------------------------
+
+
+def _vec(*values):
+    import numpy as np
+
+    return np.array(values, dtype=float)
+
+
+def _frame(axis):
+    """Return unit ``(n, b)`` with ``n × b == axis``."""
+    import numpy as np
+
+    axis = axis / np.linalg.norm(axis)
+    helper = _vec(1, 0, 0) if abs(axis[0]) < 0.9 else _vec(0, 1, 0)
+    n = np.cross(helper, axis)
+    n /= np.linalg.norm(n)
+    return n, np.cross(axis, n)
+
+
+def _grid_triangles(points):
+    """Triangulate an ``(I, J, 3)`` grid; normals follow ``∂i × ∂j``."""
+    import numpy as np
+
+    a = points[:-1, :-1]
+    b = points[1:, :-1]
+    c = points[1:, 1:]
+    d = points[:-1, 1:]
+    first = np.stack([a, b, c], axis=-2).reshape(-1, 3, 3)
+    second = np.stack([a, c, d], axis=-2).reshape(-1, 3, 3)
+    return np.concatenate([first, second])
+
+
+def _rings(centers, normals, binormals, radii, n):
+    """Return an ``(n + 1, m, 3)`` grid of circles; index 0 runs around each circle."""
+    import numpy as np
+
+    phi = np.linspace(0.0, 2 * math.pi, n + 1)
+    cos, sin = np.cos(phi)[:, None, None], np.sin(phi)[:, None, None]
+    grid = centers[None] + radii[None, :, None] * (cos * normals[None] + sin * binormals[None])
+    grid[-1] = grid[0]
+    return grid
+
+
+def _fan(center, ring, flip: bool):
+    """Disc from ``center`` to a closed ring; normal is ``+axis`` unless ``flip``."""
+    import numpy as np
+
+    a = np.broadcast_to(center, ring[:-1].shape)
+    tris = np.stack([a, ring[:-1], ring[1:]], axis=1)
+    return tris[:, [0, 2, 1]] if flip else tris
+
+
+def _annulus(inner, outer, flip: bool):
+    """Ring between two closed circles; normal is ``-axis`` unless ``flip``."""
+    import numpy as np
+
+    tris = _grid_triangles(np.stack([inner, outer], axis=1))
+    return tris[:, [0, 2, 1]] if flip else tris
+
+
+def _swept(start, axis, length, r0, r1, n, caps, axial=1, frame=None):
+    """Cylinder or frustum from ``start`` along ``axis``.
+
+    ``caps`` is ``(start_cap, end_cap)`` with each ``"port"``, ``"wall"`` or
+    ``None`` (left open for a matching neighbour).
+    """
+    import numpy as np
+
+    axis = axis / np.linalg.norm(axis)
+    nvec, bvec = frame if frame is not None else _frame(axis)
+    s = np.linspace(0.0, length, axial + 1)
+    radii = r0 + (r1 - r0) * s / length
+    centers = start[None] + s[:, None] * axis[None]
+    grid = _rings(centers, np.broadcast_to(nvec, centers.shape), np.broadcast_to(bvec, centers.shape), radii, n)
+    pieces = [(_grid_triangles(grid), False)]
+    for cap, center, ring, flip in ((caps[0], centers[0], grid[:, 0], True), (caps[1], centers[-1], grid[:, -1], False)):
+        if cap is not None:
+            pieces.append((_fan(center, ring, flip), cap == "port"))
+
+    def inside(points):
+        rel = points - start
+        along = rel @ axis
+        radial = np.linalg.norm(rel - along[:, None] * axis, axis=1)
+        limit = r0 + (r1 - r0) * np.clip(along, 0, length) / length
+        return (along > _EPS) & (along < length - _EPS) & (radial < limit * (1 - _EPS))
+
+    return _part(pieces, inside)
+
+
+def _sphere(center, radius, n):
+    import numpy as np
+
+    theta = np.linspace(0.0, math.pi, max(2, n // 2) + 1)
+    phi = np.linspace(0.0, 2 * math.pi, n + 1)
+    theta, phi = np.meshgrid(theta, phi, indexing="ij")
+    unit = np.stack([np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)], axis=-1)
+    grid = center + radius * unit
+    grid[:, -1] = grid[:, 0]
+
+    def inside(points):
+        return np.linalg.norm(points - center, axis=1) < radius * (1 - _EPS)
+
+    return _part([(_grid_triangles(grid), False)], inside)
+
+
+def _part(pieces, inside=None) -> _Part:
+    import numpy as np
+
+    triangles = np.concatenate([tris for tris, _ in pieces])
+    ports = np.concatenate([np.full(len(tris), is_port) for tris, is_port in pieces])
+    return _Part(triangles, ports, inside)
+
+
+def _union(parts, holds_volume: bool = True) -> Tessellation:
+    """Combine parts, dropping triangles whose centroid is inside another part."""
+    import numpy as np
+
+    wetted, ports = [], []
+    for i, part in enumerate(parts):
+        keep = np.ones(len(part.triangles), dtype=bool)
+        centroids = part.triangles.mean(axis=1)
+        for j, other in enumerate(parts):
+            if j != i and other.inside is not None:
+                keep &= ~other.inside(centroids)
+        wetted.append(part.triangles[keep & ~part.ports])
+        ports.append(part.triangles[keep & part.ports])
+    empty = np.empty((0, 3, 3))
+    return Tessellation(np.concatenate(wetted + [empty]), np.concatenate(ports + [empty]), holds_volume)
+
+
+def _axial_steps(length, radius, n) -> int:
+    """Axial divisions giving roughly square facets."""
+    return max(1, math.ceil(length / (2 * math.pi * radius / n)))
+
+
+def _require(condition, message) -> None:
+    if not condition:
+        raise ValueError(message)
+
+
+# -- shapes -------------------------------------------------------------------
+
+
+@_builder("Tube")
+def _tube(diameter, length, n):
+    return _union([_swept(_vec(0, 0, 0), _vec(0, 0, 1), length, diameter / 2, diameter / 2, n, ("port", "port"))])
+
+
+@_builder("2D Bag")
+def _two_d_bag(length, height, n):
+    r = height / math.pi
+    return _union([_swept(_vec(0, 0, 0), _vec(0, 0, 1), length, r, r, n, ("port", "port"))])
+
+
+@_builder("3D Rectangular Biocontainer")
+def _box(length, width, height, n):
+    import numpy as np
+
+    x, y, z = length, width, height
+    corners = np.array([[0, 0, 0], [x, 0, 0], [x, y, 0], [0, y, 0], [0, 0, z], [x, 0, z], [x, y, z], [0, y, z]], float)
+    quads = [(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)]
+    tris = [corners[[a, b, c]] for a, b, c, d in quads] + [corners[[a, c, d]] for a, b, c, d in quads]
+    return Tessellation(np.array(tris), np.empty((0, 3, 3)))
+
+
+@_builder("3D Round Biocontainer")
+def _round_biocontainer(flength, width, height, n):
+    flatgap = width - (2 * flength)
+    r = (flength + (flatgap / 2)) / math.cos(math.radians(45))
+    return _union([_swept(_vec(0, 0, 0), _vec(0, 0, 1), height, r, r, n, ("wall", "wall"))])
+
+
+@_builder("3D Round Bottle")
+def _bottle(id_1, height, n):
+    return _union([_swept(_vec(0, 0, 0), _vec(0, 0, 1), height, id_1 / 2, id_1 / 2, n, ("wall", "port"))])
+
+
+@_builder("Flask")
+def _flask(sdiameter, ldiameter, height, n):
+    return _union([_swept(_vec(0, 0, 0), _vec(0, 0, 1), height, ldiameter / 2, sdiameter / 2, n, ("wall", "port"))])
+
+
+@_builder("Conical Frustrum")
+def _frustum(sdiameter, ldiameter, length, n):
+    return _union([_swept(_vec(0, 0, 0), _vec(0, 0, 1), length, sdiameter / 2, ldiameter / 2, n, ("port", "port"))])
+
+
+def _run_and_branch(id_1, id_2, length, branch_start, branch_length, branch_caps, n):
+    r1, r2 = id_1 / 2, id_2 / 2
+    _require(r2 <= r1, "tessellation needs the vertical ID to be no larger than the horizontal ID")
+    run = _swept(_vec(-length / 2, 0, 0), _vec(1, 0, 0), length, r1, r1, n, ("port", "port"), _axial_steps(length, r1, n))
+    branch = _swept(
+        _vec(0, branch_start, 0), _vec(0, 1, 0), branch_length, r2, r2, n, branch_caps, _axial_steps(branch_length, r2, n)
+    )
+    return _union([run, branch])
+
+
+@_builder("Tee")
+def _tee(id_1, id_2, length, height, flange, n):
+    trunk_height = height - ((flange - id_1) / 2) - id_1
+    _require(trunk_height > 0, "Tee height leaves no branch above the run")
+    return _run_and_branch(id_1, id_2, length, 0.0, id_1 / 2 + trunk_height, ("wall", "port"), n)
+
+
+@_builder("Cross")
+def _cross(id_1, id_2, length, height, n):
+    _require(height > id_1, "Cross height must exceed the horizontal ID")
+    return _run_and_branch(id_1, id_2, length, -height / 2, height, ("port", "port"), n)
+
+
+@_builder("Elbow")
+def _elbow(id_1, id_2, length, height, n):
+    return _bend(id_1, id_2, length, height, 90.0, max(1.0, id_2 / 2), n)
+
+
+@_builder("Bend")
+def _bend(id_1, id_2, length, height, angle, radius, n):
+    import numpy as np
+
+    r1, r2 = id_1 / 2, id_2 / 2
+    _require(0 < angle <= 180, "Bend angle must be in (0, 180] degrees")
+    _require(radius >= r2, "Bend radius must be at least the bend-tube radius")
+    sweep = math.radians(angle)
+    steps = max(2, math.ceil(n * radius * sweep / (2 * math.pi * max(r2, 1e-12))))
+    beta = np.linspace(0.0, sweep, steps + 1)
+    centers = np.stack([radius * np.sin(beta), radius - radius * np.cos(beta), np.zeros_like(beta)], axis=1)
+    normals = np.stack([np.sin(beta), -np.cos(beta), np.zeros_like(beta)], axis=1)
+    binormals = np.broadcast_to(_vec(0, 0, -1), centers.shape)
+    bend_grid = _rings(centers, normals, binormals, np.full(len(beta), r2), n)
+    pieces = [(_grid_triangles(bend_grid), False)]
+
+    leg_1 = _swept(_vec(-length, 0, 0), _vec(1, 0, 0), length, r1, r1, n, ("port", None), frame=(normals[0], binormals[0]))
+    tangent = _vec(math.cos(sweep), math.sin(sweep), 0)
+    leg_2 = _swept(centers[-1], tangent, height, r2, r2, n, (None, "port"), frame=(normals[-1], binormals[-1]))
+    if r1 != r2:
+        inner = _rings(centers[:1], normals[:1], binormals[:1], np.array([min(r1, r2)]), n)[:, 0]
+        outer = _rings(centers[:1], normals[:1], binormals[:1], np.array([max(r1, r2)]), n)[:, 0]
+        # Fluid lies behind the step (x < 0) when the bend is narrower, ahead of it otherwise.
+        pieces.append((_annulus(inner, outer, flip=r1 > r2), False))
+    return _union([leg_1, _part(pieces), leg_2])
+
+
+@_builder("Wye")
+def _wye(id_1, id_2, length, height, n):
+    return _angled_wye(id_1, id_2, length, height, 30.0, n)
+
+
+@_builder("Angled Wye")
+def _angled_wye(id_1, id_2, length, height, angle, n):
+    r1, r2 = id_1 / 2, id_2 / 2
+    _require(0 < angle < 90, "Wye branch angle must be in (0, 90) degrees")
+    _, sin, cos = angle_constants(angle)
+    tusk_height = (height - (2 * cos * r1)) / 2
+    tusk_length = tusk_height / sin
+    trunk_length = (length - (cos * tusk_length)) - (r1 * sin)
+    _require(tusk_length > r1 and trunk_length > 0, "Wye length/height leave no room for the tusks and trunk")
+    origin = _vec(0, 0, 0)
+    parts = [
+        _swept(_vec(-trunk_length, 0, 0), _vec(1, 0, 0), trunk_length, r2, r2, n, ("port", "wall"), _axial_steps(trunk_length, r2, n)),
+        _sphere(origin, max(r1, r2), n),
+    ]
+    for sign in (1, -1):
+        axis = _vec(cos, sign * sin, 0)
+        parts.append(_swept(origin, axis, tusk_length, r1, r1, n, ("wall", "port"), _axial_steps(tusk_length, r1, n)))
+    return _union(parts)
+
+
+@_builder("Cap")
+def _cap(id_1, n):
+    import numpy as np
+
+    ring = _rings(_vec(0, 0, 0)[None], _vec(1, 0, 0)[None], _vec(0, 1, 0)[None], np.array([id_1 / 2]), n)[:, 0]
+    return Tessellation(_fan(_vec(0, 0, 0), ring, False), np.empty((0, 3, 3)), holds_volume=False)
+
+
+@_builder("Plug")
+def _plug(diameter, length, n):
+    part = _swept(_vec(0, 0, 0), _vec(0, 0, 1), length, diameter / 2, diameter / 2, n, ("wall", "port"))
+    tess = _union([part])
+    tess.holds_volume = False
+    return tess
+
+
+# -- verification -------------------------------------------------------------
+
+
+def verify(shape, dims=None, resolutions=DEFAULT_RESOLUTIONS) -> list[dict]:
+    """Compare mesh and formula results at each resolution."""
+    dims = tuple(DEFAULT_DIMS[shape.name] if dims is None else dims)
+    formula_area, formula_volume = shape.surface_area(*dims), shape.volume(*dims)
+    rows = []
+    for resolution in resolutions:
+        tess = shape.tessellate(*dims, resolution=resolution)
+        area, volume = tess.area_and_volume()
+        rows.append(
+            {
+                "resolution": resolution,
+                "triangles": len(tess),
+                "mesh_area": area,
+                "formula_area": formula_area,
+                "area_error": _relative(formula_area, area),
+                "mesh_volume": volume,
+                "formula_volume": formula_volume,
+                "volume_error": _relative(formula_volume, volume),
+            }
+        )
+    return rows
+
+
+def _relative(formula: float, mesh: float) -> float:
+    if mesh == 0:
+        return 0.0 if formula == 0 else math.inf
+    return (formula - mesh) / mesh
+
+
+def survey(shape, samples: int = 50, resolution: int = 128, spread: float = 0.5, seed=None) -> dict:
+    """Formula error statistics over random dimensions around the defaults.
+
+    Each default length is scaled by an independent factor in
+    ``[1 - spread, 1 + spread]``; angles keep their defaults, as scaling them
+    would leave ``angle_range``. Geometrically impossible draws are skipped.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    base = np.array(DEFAULT_DIMS[shape.name])
+    lengths = np.array(shape.length_mask())
+    area_errors, volume_errors = [], []
+    attempts = 0
+    while len(area_errors) < samples and attempts < samples * 20:
+        attempts += 1
+        dims = np.where(lengths, base * rng.uniform(1 - spread, 1 + spread, len(base)), base)
+        try:
+            row = verify(shape, dims, (resolution,))[0]
+        except ValueError:
+            continue
+        area_errors.append(row["area_error"])
+        volume_errors.append(row["volume_error"])
+    area_errors, volume_errors = np.array(area_errors), np.array(volume_errors)
+    return {
+        "samples": len(area_errors),
+        "area_error_mean": float(area_errors.mean()) if len(area_errors) else math.nan,
+        "area_error_max": float(area_errors[np.abs(area_errors).argmax()]) if len(area_errors) else math.nan,
+        "volume_error_mean": float(volume_errors.mean()) if len(volume_errors) else math.nan,
+        "volume_error_max": float(volume_errors[np.abs(volume_errors).argmax()]) if len(volume_errors) else math.nan,
+    }
+
+
+def format_report(shape, dims, rows) -> str:
+    """Render ``verify`` rows as a convergence table."""
+    lines = [
+        f"{shape.name} {list(dims)}",
+        f"  {'n':>5} {'triangles':>10} {'mesh area':>12} {'formula err':>12} {'mesh volume':>12} {'formula err':>12}",
+    ]
+    for row in rows:
+        lines.append(
+            f"  {row['resolution']:>5} {row['triangles']:>10,} {row['mesh_area']:>12.4f} {row['area_error']:>+12.3%}"
+            f" {row['mesh_volume']:>12.4f} {row['volume_error']:>+12.3%}"
+        )
+    return "\n".join(lines)
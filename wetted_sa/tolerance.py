@@ -0,0 +1,225 @@
+"""Monte Carlo propagation of dimensional tolerances to area and volume.
+
+Each dimension is given as a plain value or a distribution:
+
+* ``"2.54"`` or ``"1in"`` – fixed
+* ``"1in ± 0.01in"`` (also ``+-`` or ``+/-``) – normal with the tolerance
+  taken as 3σ, or uniform over the band with ``kind="uniform"``
+* ``"normal(mean, sigma)"``, ``"uniform(low, high)"``,
+  ``"triangular(low, mode, high)"`` – explicit
+
+Dimensions cannot be negative: normals are truncated at zero (negative
+draws are redrawn) and uniform or triangular bands reaching below zero are
+rejected. Draws are generated and evaluated in vectorized chunks from a
+seeded ``numpy.random.Generator``, so results are reproducible. The worst
+case is taken over the corners of every dimension's band (±3σ for normals,
+cut at zero) as well as over the draws themselves.
+"""
+
+import itertools
+import re
+from typing import NamedTuple
+
+from . import instrument, units
+
+DEFAULT_DRAWS = 1_000_000
+CHUNK = 1_000_000
+PERCENTILES = (1, 5, 50, 95, 99)
+
+_BAND = re.compile(r"^(?P<nominal>.+?)\s*(?:±|\+/-|\+-)\s*(?P<tolerance>.+)$")
+_CALL = re.compile(r"^(?P<kind>normal|uniform|triangular)\s*\((?P<args>.*)\)$", re.IGNORECASE)
+
+
+class Fixed:
+    def __init__(self, value: float):
+        self.nominal = self.low = self.high = float(value)
+
+    def sample(self, rng, n: int):
+        import numpy as np
+
+        return np.full(n, self.nominal)
+
+    def __repr__(self) -> str:
+        return f"Fixed({self.nominal:g})"
+
+
+class Normal:
+    def __init__(self, mean: float, sigma: float):
+        if sigma < 0:
+            raise ValueError("sigma must be non-negative")
+        if mean <= 0 < sigma:
+            raise ValueError(f"normal mean must be positive, got {mean:g}")
+        self.nominal = float(mean)
+        self.sigma = float(sigma)
+        self.low = max(self.nominal - 3 * self.sigma, 0.0)
+        self.high = self.nominal + 3 * self.sigma
+
+    def sample(self, rng, n: int):
+        values = rng.normal(self.nominal, self.sigma, n)
+        # Truncate at zero by redrawing; the mean is positive, so each pass
+        # redraws less than half of what is left.
+        while (negative := (values < 0).nonzero()[0]).size:
+            values[negative] = rng.normal(self.nominal, self.sigma, negative.size)
+        return values
+
+    def __repr__(self) -> str:
+        return f"Normal({self.nominal:g}, {self.sigma:g})"
+
+
+class Uniform:
+    def __init__(self, low: float, high: float):
+        if high < low:
+            raise ValueError("uniform high must not be below low")
+        if low < 0:
+            raise ValueError(f"uniform low must not be negative, got {low:g}")
+        self.low = float(low)
+        self.high = float(high)
+        self.nominal = (self.low + self.high) / 2
+
+    def sample(self, rng, n: int):
+        return rng.uniform(self.low, self.high, n)
+
+    def __repr__(self) -> str:
+        return f"Uniform({self.low:g}, {self.high:g})"
+
+
+class Triangular:
+    def __init__(self, low: float, mode: float, high: float):
+        if not low <= mode <= high:
+            raise ValueError("triangular needs low <= mode <= high")
+        if low < 0:
+            raise ValueError(f"triangular low must not be negative, got {low:g}")
+        self.low = float(low)
+        self.nominal = float(mode)
+        self.high = float(high)
+
+    def sample(self, rng, n: int):
+        if self.low == self.high:
+            return Fixed(self.low).sample(rng, n)
+        return rng.triangular(self.low, self.nominal, self.high, n)
+
+    def __repr__(self) -> str:
+        return f"Triangular({self.low:g}, {self.nominal:g}, {self.high:g})"
+
+
+_KINDS = {"normal": Normal, "uniform": Uniform, "triangular": Triangular}
+
+
+def parse_spec(text, kind: str = "normal", unit: str = "cm"):
+    """Turn a dimension entry into a distribution; see the module docstring.
+
+    Bare numbers are read in ``unit``; values with their own unit keep it.
+    """
+    if isinstance(text, (int, float)):
+        return Fixed(text * units.LENGTH_UNITS[units.length_unit(unit)])
+    text = str(text).strip()
+    if match := _CALL.match(text):
+        args = [units.parse_length(arg, unit) for arg in match.group("args").split(",")]
+        try:
+            return _KINDS[match.group("kind").lower()](*args)
+        except TypeError as e:
+            raise ValueError(f"Invalid distribution {text!r}: {e}") from e
+    if match := _BAND.match(text):
+        nominal = units.parse_length(match.group("nominal"), unit)
+        tolerance = abs(units.parse_length(match.group("tolerance"), unit))
+        if kind == "uniform":
+            return Uniform(nominal - tolerance, nominal + tolerance)
+        return Normal(nominal, tolerance / 3)
+    return Fixed(units.parse_length(text, unit))
+
+
+def is_toleranced(text: str) -> bool:
+    """Return True if ``text`` describes a distribution rather than a value."""
+    text = text.strip()
+    return bool(_CALL.match(text) or _BAND.match(text))
+
+
+class Summary(NamedTuple):
+    nominal: float
+    mean: float
+    std: float
+    percentiles: dict
+    worst_min: float
+    worst_max: float
+
+
+class ToleranceResult(NamedTuple):
+    draws: int
+    area: Summary
+    volume: Summary
+
+
+def _summarize(values, nominal: float, corners) -> Summary:
+    import numpy as np
+
+    quantiles = np.percentile(values, PERCENTILES)
+    return Summary(
+        nominal=float(nominal),
+        mean=float(values.mean()),
+        std=float(values.std()),
+        percentiles={p: float(q) for p, q in zip(PERCENTILES, quantiles)},
+        worst_min=float(min(values.min(), corners.min())),
+        worst_max=float(max(values.max(), corners.max())),
+    )
+
+
+def simulate(
+    shape, specs, draws: int = DEFAULT_DRAWS, seed=None, kind: str = "normal", unit: str = "cm"
+) -> ToleranceResult:
+    """Propagate ``specs`` (one per ``shape.dimensions``) through ``shape``.
+
+    Results are in cm² and cm³; ``unit`` applies to bare numbers in text specs.
+    """
+    import numpy as np
+
+    if len(specs) != len(shape.dimensions):
+        raise ValueError(f"{shape.name} expects {len(shape.dimensions)} dimensions, got {len(specs)}")
+    # Angles are read in degrees whatever ``unit`` is.
+    spec_units = [unit if is_length else "cm" for is_length in shape.length_mask()]
+    dists = [
+        spec if hasattr(spec, "sample") else parse_spec(spec, kind, spec_unit) for spec, spec_unit in zip(specs, spec_units)
+    ]
+    rng = np.random.default_rng(seed)
+    areas = np.empty(draws)
+    volumes = np.empty(draws)
+    with instrument.timed("simulate", shape.name):
+        for start in range(0, draws, CHUNK):
+            n = min(CHUNK, draws - start)
+            columns = [dist.sample(rng, n) for dist in dists]
+            areas[start:start + n], volumes[start:start + n] = shape.evaluate_batch(*columns)
+
+    corners = np.array(list(itertools.product(*[(d.low, d.high) for d in dists])))
+    corner_areas, corner_volumes = shape.evaluate_batch(corners)
+    nominal = [d.nominal for d in dists]
+    return ToleranceResult(
+        draws=draws,
+        area=_summarize(areas, shape.surface_area(*nominal), corner_areas),
+        volume=_summarize(volumes, shape.volume(*nominal), corner_volumes),
+    )
+
+
+def _scaled(summary: Summary, factor: float) -> Summary:
+    return Summary(
+        nominal=summary.nominal * factor,
+        mean=summary.mean * factor,
+        std=summary.std * factor,
+        percentiles={p: q * factor for p, q in summary.percentiles.items()},
+        worst_min=summary.worst_min * factor,
+        worst_max=summary.worst_max * factor,
+    )
+
+
+def format_result(result: ToleranceResult, area_unit: str = "cm²", volume_unit: str = "cm³") -> str:
+    """Render a ``ToleranceResult`` as a short text report in the given units."""
+    area_unit, volume_unit = units.area_unit(area_unit), units.volume_unit(volume_unit)
+    lines = [f"{result.draws:,} draws"]
+    for label, unit, summary in (
+        ("Surface Area", area_unit, _scaled(result.area, 1 / units.AREA_UNITS[area_unit])),
+        ("Volume", volume_unit, _scaled(result.volume, 1 / units.VOLUME_UNITS[volume_unit])),
+    ):
+        p = summary.percentiles
+        lines.append(
+            f"{label}: nominal {summary.nominal:,.2f} {unit}, mean {summary.mean:,.2f} ± {summary.std:,.2f}, "
+            f"P5–P95 {p[5]:,.2f}–{p[95]:,.2f}, worst case {summary.worst_min:,.2f}–{summary.worst_max:,.2f}"
+        )
+    return "\n".join(lines)
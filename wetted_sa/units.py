@@ -0,0 +1,145 @@
+"""Units for dimensions and results.
+
+The shape formulas work in centimetres and report cm² and cm³. ``compiled``
+returns an evaluator for one shape with the unit conversions baked in as
+constant factors: one per dimension and one each for area and volume. A
+batch over a BOM then costs one multiplication per column, with no
+per-row parsing of conversion expressions. Evaluators are cached per
+(shape, units) combination.
+
+Dimension text that carries its own unit (``"25mm"``) keeps it. Only bare
+numbers take the selected dimension unit; see ``parse_length``. Text that
+mixes the two, such as ``"1in + 2"``, is rejected rather than guessed at.
+"""
+
+import functools
+import re
+
+from .expr import evaluate, has_unit, is_length
+
+LENGTH_UNITS = {"in": 2.54, "ft": 30.48, "mm": 0.1, "cm": 1.0, "m": 100.0}
+AREA_UNITS = {"cm²": 1.0, "mm²": 0.01, "in²": 6.4516, "ft²": 929.0304, "m²": 10000.0}
+VOLUME_UNITS = {"cm³": 1.0, "mL": 1.0, "L": 1000.0, "in³": 16.387064, "m³": 1_000_000.0}
+
+DEFAULT_LENGTH = "cm"
+DEFAULT_AREA = "cm²"
+DEFAULT_VOLUME = "cm³"
+
+_VOLUME_SUFFIX = re.compile(r"\s*(cm³|cm3|cc|mL|ml|L|l|in³|in3|m³|m3)\s*$")
+
+_ALIASES = {"inch": "in", "cm2": "cm²", "mm2": "mm²", "in2": "in²", "ft2": "ft²", "m2": "m²",
+            "cm3": "cm³", "cc": "cm³", "ml": "mL", "l": "L", "in3": "in³", "m3": "m³"}
+
+
+def _lookup(table: dict, kind: str, unit, default: str) -> str:
+    if unit is None or unit == "":
+        return default
+    unit = str(unit).strip()
+    unit = _ALIASES.get(unit, _ALIASES.get(unit.lower(), unit))
+    if unit not in table:
+        raise ValueError(f"Unknown {kind} unit {unit!r}; use one of {list(table)}")
+    return unit
+
+
+def length_unit(unit) -> str:
+    """Normalize a length unit name; ``None`` means cm."""
+    return _lookup(LENGTH_UNITS, "length", unit, DEFAULT_LENGTH)
+
+
+def area_unit(unit) -> str:
+    """Normalize an area unit name; ``"in2"`` and ``"in²"`` are the same."""
+    return _lookup(AREA_UNITS, "area", unit, DEFAULT_AREA)
+
+
+def volume_unit(unit) -> str:
+    """Normalize a volume unit name; ``"ml"``, ``"mL"`` and ``"cc"`` are accepted."""
+    return _lookup(VOLUME_UNITS, "volume", unit, DEFAULT_VOLUME)
+
+
+def evaluate_length(text: str) -> float:
+    """Evaluate ``text`` like ``expr.evaluate``, rejecting bare terms next to units."""
+    if has_unit(text) and not is_length(text):
+        raise ValueError(f"{text!r} mixes numbers with and without units; give every term a unit or none")
+    return evaluate(text)
+
+
+def parse_length(text: str, unit: str = DEFAULT_LENGTH) -> float:
+    """Evaluate ``text`` to centimetres, reading bare numbers in ``unit``."""
+    value = evaluate_length(text)
+    if unit != DEFAULT_LENGTH and not has_unit(text):
+        value *= LENGTH_UNITS[length_unit(unit)]
+    return value
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_volume(text: str, unit: str = DEFAULT_VOLUME) -> float:
+    """Evaluate volume ``text`` to cm³, reading bare numbers in ``unit``.
+
+    A trailing volume unit (``"250 mL"``, ``"1.5L"``, ``"10 in³"``) overrides
+    ``unit``; length units are rejected rather than read as a volume.
+    """
+    match = _VOLUME_SUFFIX.search(text)
+    number = text[: match.start()] if match else text
+    if has_unit(number):
+        raise ValueError(f"{text!r} is not a volume; use a volume unit such as mL or L")
+    return evaluate(number) * VOLUME_UNITS[volume_unit(match.group(1) if match else unit)]
+
+
+class UnitEvaluator:
+    """``shape`` evaluated with fixed dimension and result units."""
+
+    __slots__ = ("shape", "dim_units", "area_unit", "volume_unit", "_scales", "_area_factor", "_volume_factor")
+
+    def __init__(self, shape, dim_units, area_unit: str, volume_unit: str):
+        self.shape = shape
+        self.dim_units = dim_units
+        self.area_unit = area_unit
+        self.volume_unit = volume_unit
+        # Angle dimensions are in degrees whatever the length unit.
+        self._scales = tuple(
+            LENGTH_UNITS[u] if is_length else 1.0 for u, is_length in zip(dim_units, shape.length_mask())
+        )
+        self._area_factor = 1.0 / AREA_UNITS[area_unit]
+        self._volume_factor = 1.0 / VOLUME_UNITS[volume_unit]
+
+    def to_cm(self, dims) -> tuple[float, ...]:
+        return tuple(d * s for d, s in zip(dims, self._scales))
+
+    def __call__(self, *dims) -> tuple[float, float]:
+        dims = self.to_cm(dims)
+        return (
+            self.shape.surface_area(*dims) * self._area_factor,
+            self.shape.volume(*dims) * self._volume_factor,
+        )
+
+    def batch(self, dims):
+        """Return ``(areas, volumes)`` for an ``(n, len(dimensions))`` array."""
+        import numpy as np
+
+        dims = np.asarray(dims, dtype=float) * np.array(self._scales)
+        areas, volumes = self.shape.evaluate_batch(dims)
+        return areas * self._area_factor, volumes * self._volume_factor
+
+    def convert_results(self, areas, volumes):
+        """Convert cm²/cm³ results (e.g. from the cache) to this evaluator's units."""
+        return areas * self._area_factor, volumes * self._volume_factor
+
+
+@functools.lru_cache(maxsize=1024)
+def _compiled(shape, dim_units: tuple, area: str, volume: str) -> UnitEvaluator:
+    return UnitEvaluator(shape, dim_units, area, volume)
+
+
+def compiled(shape, dim_units=DEFAULT_LENGTH, area=DEFAULT_AREA, volume=DEFAULT_VOLUME) -> UnitEvaluator:
+    """Return the cached evaluator for ``shape`` in the given units.
+
+    ``dim_units`` is one length unit for every dimension or a sequence with
+    one unit per dimension.
+    """
+    if isinstance(dim_units, str) or dim_units is None:
+        dim_units = (length_unit(dim_units),) * len(shape.dimensions)
+    else:
+        dim_units = tuple(length_unit(u) for u in dim_units)
+        if len(dim_units) != len(shape.dimensions):
+            raise ValueError(f"{shape.name} expects {len(shape.dimensions)} dimension units, got {len(dim_units)}")
+    return _compiled(shape, dim_units, area_unit(area), volume_unit(volume))